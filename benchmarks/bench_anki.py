@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Anki export (`define --export-anki FILE`).
+
+Builds a synthetic deck in the SQLite vocabulary store, then times the
+original exporter (load the whole deck, one f-string per line, semicolons
+in the text replaced by commas) against the streaming CSV and .apkg
+exporters. The CSV must read back, through the csv module, to the same
+cards the store holds, and the package must hold one note and card per
+entry with the store's intervals.
+
+Usage:
+    python benchmarks/bench_anki.py
+    python benchmarks/bench_anki.py --cards 100000 --fields language,phonetic,sm2
+"""
+
+import argparse
+import csv
+import io
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.anki import parse_fields, row
+from core.vocabulary import Vocabulary
+
+
+def deck(cards: int, rng: random.Random) -> list:
+    """Entries with semicolons and quotes in a tenth of the definitions, half of them reviewed."""
+    now = datetime.now()
+    entries = []
+    for i in range(cards):
+        interval = rng.choice((0, 1, 6, 15, 40))
+        definition = f"definition of word {i}"
+        if rng.random() < 0.1:
+            definition += '; also "used" figuratively'
+        entries.append({
+            "word": f"word{i}",
+            "definition": definition,
+            "partOfSpeech": "noun",
+            "language": rng.choice(("en", "ru")),
+            "phonetic": f"/wɜːd{i}/",
+            "timesReviewed": interval and rng.randint(1, 8),
+            "correctCount": 0,
+            "sm2_easiness": round(rng.uniform(1.3, 2.8), 2),
+            "sm2_interval": interval,
+            "sm2_repetitions": interval and rng.randint(1, 6),
+            "nextReview": (now + timedelta(days=rng.uniform(-5, 60))).isoformat(),
+        })
+    return entries
+
+
+def original(vocabulary: Vocabulary, filename: Path) -> int:
+    """The exporter before streaming: the whole deck in memory, semicolons lost."""
+    vocab = vocabulary._load()
+    with open(filename, "w", encoding="utf-8") as f:
+        for entry in vocab:
+            front, back = (v.replace(";", ",") for v in row(entry, ()))
+            f.write(f"{front};{back}\n")
+    return len(vocab)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=100000, help="Deck size")
+    parser.add_argument("--fields", default="", help="Extra export fields")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+    fields = parse_fields(args.fields)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        vocabulary = Vocabulary(vocab_file=tmp / "vocabulary.json")
+        vocabulary.store.add_many(deck(args.cards, random.Random(args.seed)))
+        expected = [[str(v) for v in row(entry, fields)] for entry in vocabulary.store.entries()]
+        intervals = sorted(entry["sm2_interval"] for entry in vocabulary.store.entries())
+        
+        results = {}
+        for name, filename, export in (
+            ("original CSV", tmp / "original.csv", lambda f: original(vocabulary, f)),
+            ("streaming CSV", tmp / "deck.csv", lambda f: vocabulary.export_anki(str(f), fields)),
+            (".apkg", tmp / "deck.apkg", lambda f: vocabulary.export_anki(str(f), fields)),
+        ):
+            start = time.perf_counter()
+            count = export(filename)
+            results[name] = (count, time.perf_counter() - start, filename.stat().st_size)
+        
+        text = (tmp / "deck.csv").read_text(encoding="utf-8")
+        rows = list(csv.reader(io.StringIO(text.split("\n", 3)[3]), delimiter=";"))
+        lossy = sum(";" in entry[1] for entry in expected)
+        with zipfile.ZipFile(tmp / "deck.apkg") as package:
+            (tmp / "collection.anki2").write_bytes(package.read("collection.anki2"))
+        conn = sqlite3.connect(str(tmp / "collection.anki2"))
+        notes = conn.execute("SELECT count(*) FROM notes").fetchone()[0]
+        package_intervals = [ivl for ivl, in conn.execute("SELECT ivl FROM cards ORDER BY ivl")]
+        conn.close()
+        vocabulary.store.close()
+    
+    print(f"Deck: {args.cards} cards, extra fields: {', '.join(fields) or 'none'}\n")
+    print(f"{'Exporter':<15} {'ms':>8} {'MB':>8}")
+    for name, (_, seconds, size) in results.items():
+        print(f"{name:<15} {seconds * 1000:>8.0f} {size / 1e6:>8.1f}")
+    print(f"\nThe original format changes {lossy} definitions (semicolons become commas)")
+    
+    if (rows != expected or notes != len(expected) or package_intervals != intervals
+            or any(count != len(expected) for count, _, _ in results.values())):
+        print("The exports differ from the store")
+        return 1
+    print("The CSV and the package match the store")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
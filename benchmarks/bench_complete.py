@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark `define --complete`.
+
+Times one completion on a loaded index (checked against a linear scan
+of every term), then the wall time
+of a shell calling `define --complete` with the snapshot warm: in a fresh
+interpreter, through a running `define --daemon`, and a bare
+interpreter start for reference.
+
+Usage:
+    python benchmarks/bench_complete.py
+    python benchmarks/bench_complete.py --runs 30
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from languages.complete import complete, load_index
+
+QUERIES = ["pri", "privet", "how ar", "how are ", "кто", "kak d", "defin", "s", ""]
+
+
+def linear(terms: list, text: str) -> list:
+    """Reference: scan every term, as complete() should answer."""
+    words = text.lower().split()
+    if not words or text[-1:].isspace():
+        words.append("")
+    prefix, position = " ".join(words), len(words) - 1
+    found = {term.split(" ")[position] for term in terms
+             if term.startswith(prefix) and len(term.split(" ")) > position}
+    return sorted(found)[:100]
+
+
+def wall(cmd: list, runs: int, env: dict) -> float:
+    """Median wall time of a command in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, capture_output=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15, help="Process starts per mode")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, XDG_CACHE_HOME=f"{tmp}/cache",
+                   XDG_DATA_HOME=f"{tmp}/data", XDG_RUNTIME_DIR=f"{tmp}/run")
+        os.makedirs(f"{tmp}/run", mode=0o700)
+        os.environ["XDG_CACHE_HOME"] = env["XDG_CACHE_HOME"]
+        
+        start = time.perf_counter()
+        index = load_index()
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index = load_index()
+        load_ms = (time.perf_counter() - start) * 1000
+        
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for query in QUERIES:
+                complete(query, index=index)
+        query_us = (time.perf_counter() - start) / (rounds * len(QUERIES)) * 1e6
+        mismatches = [q for q in QUERIES if complete(q, index=index) != linear(index._terms, q)]
+        
+        define = [sys.executable, str(ROOT / "define"), "--complete", "kak d"]
+        results = {
+            "bare interpreter": wall([sys.executable, "-c", "pass"], args.runs, env),
+            "in-process": wall(define, args.runs, env),
+        }
+        daemon = subprocess.Popen([sys.executable, str(ROOT / "define"), "--daemon"],
+                                  env=env, stderr=subprocess.PIPE)
+        try:
+            daemon.stderr.readline()  # "define daemon listening on ..."
+            results["via daemon"] = wall(define, args.runs, env)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    
+    print(f"Index: {len(index)} terms, built in {build_ms:.1f} ms, "
+          f"loaded from snapshot in {load_ms:.2f} ms")
+    print(f"One completion on a loaded index: {query_us:.1f} µs\n")
+    print(f"`define --complete`, {args.runs} runs each")
+    print(f"{'Mode':<18} {'median ms':>10}")
+    for mode, ms in results.items():
+        print(f"{mode:<18} {ms:>10.1f}")
+    
+    if mismatches:
+        print(f"\nCompletions differ from the linear scan for {mismatches}")
+        return 1
+    print("\nAll completions match the linear scan")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the review forecast (`define --forecast DAYS`).
+
+Builds a synthetic deck, then times the batch SM-2 simulation with the
+array backend and, if NumPy is installed, the numpy backend, against
+rating the same cards one at a time with SM2.calculate. It also times
+reading the deck from a SQLite vocabulary store (Deck.from_schedule).
+The array backend draws the same qualities as the reference and must
+match it exactly; the numpy backend draws from its own generator and
+must project the same total load within 2%.
+
+Usage:
+    python benchmarks/bench_forecast.py
+    python benchmarks/bench_forecast.py --cards 100000 --days 30
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.forecast import DEFAULT_QUALITIES, Deck, _numpy, forecast
+from core.vocabulary import SM2, Vocabulary
+
+
+def reference(deck: Deck, days: int, seed: int) -> list:
+    """Rate each due card with SM2.calculate, in the array backend's order and draws."""
+    grades, weights = list(DEFAULT_QUALITIES), list(DEFAULT_QUALITIES.values())
+    rng = random.Random(seed)
+    state = list(zip(deck.repetitions, deck.easiness, deck.interval))
+    calendar = [[] for _ in range(days)]
+    for card, day in enumerate(deck.due):
+        if day < days:
+            calendar[day].append(card)
+    
+    counts = []
+    for day in range(days):
+        cards = calendar[day]
+        counts.append(len(cards))
+        for card, quality in zip(cards, rng.choices(grades, weights, k=len(cards))):
+            state[card] = SM2.calculate(quality, *state[card])
+            if day + state[card][2] < days:
+                calendar[day + state[card][2]].append(card)
+    return counts
+
+
+def entries(cards: int, rng: random.Random) -> list:
+    """vocabulary.json entries: a fifth new, the rest due over the next 60 days."""
+    now = datetime.now()
+    result = []
+    for i in range(cards):
+        new = rng.random() < 0.2
+        result.append({
+            "word": f"word{i}",
+            "language": rng.choice(("en", "ru")),
+            "sm2_easiness": 2.5 if new else round(rng.uniform(1.3, 2.8), 2),
+            "sm2_interval": 0 if new else rng.choice((1, 6, 15, 40, 100)),
+            "sm2_repetitions": 0 if new else rng.randint(1, 6),
+            "nextReview": (now + timedelta(days=0 if new else rng.uniform(-5, 60))).isoformat(),
+        })
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=100000, help="Deck size")
+    parser.add_argument("--days", type=int, default=365, help="Days to forecast")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        vocab_file = Path(tmp) / "vocabulary.json"
+        vocab_file.write_text(json.dumps(entries(args.cards, random.Random(args.seed))))
+        vocabulary = Vocabulary(vocab_file=vocab_file)
+        start = time.perf_counter()
+        deck = Deck.from_schedule(vocabulary.store.schedule())
+        load_s = time.perf_counter() - start
+        vocabulary.store.close()
+    
+    def timed(fn):
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+    
+    expected, reference_s = timed(lambda: reference(deck, args.days, args.seed))
+    results = {"SM2.calculate per card": (expected, reference_s)}
+    backends = ["array"] + (["numpy"] if _numpy() is not None else [])
+    for backend in backends:
+        results[f"batch ({backend})"] = timed(
+            lambda: forecast(deck, args.days, seed=args.seed, backend=backend))
+    
+    print(f"Deck: {len(deck)} cards, {args.days} days, {sum(expected)} simulated reviews")
+    print(f"Reading the deck from the SQLite store: {load_s * 1000:.0f} ms\n")
+    print(f"{'Simulation':<24} {'ms':>8} {'speedup':>8}")
+    for name, (_, seconds) in results.items():
+        print(f"{name:<24} {seconds * 1000:>8.0f} {reference_s / seconds:>7.1f}x")
+    if len(backends) == 1:
+        print("(NumPy not installed: numpy backend skipped)")
+    
+    failed = results["batch (array)"][0] != expected
+    if "batch (numpy)" in results:
+        failed |= abs(sum(results["batch (numpy)"][0]) / sum(expected) - 1) > 0.02
+    if failed:
+        print("\nForecasts differ from the reference")
+        return 1
+    print("\nForecasts match the reference")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark memoized paradigm generation.
+
+Scales the shipped lexicon (ru_grammar.json, 32 verbs and 22 nouns) with
+synthetic entries (each word behind a distinct two-letter prefix), then
+times GrammarEngine with the memo disabled against precompute_all() and
+against memoized lookups once it ran. Memoized paradigms must equal the
+uncached ones.
+
+The cold pass is slower than not memoizing at all (~0.6x at the default
+scale): besides building every paradigm it stores them, and the cycle
+collector then traverses every retained dict on each full collection.
+Memoizing only pays off once paradigms are looked up again (~2x).
+
+Usage:
+    python benchmarks/bench_grammar.py
+    python benchmarks/bench_grammar.py --scale 100 --rounds 5
+"""
+
+import argparse
+import gc
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.grammar import GrammarEngine
+from languages import snapshot
+
+LETTERS = "бвгдзклмнпрстфх"
+
+
+def prefixed(value, prefix: str):
+    """Copy of a paradigm with every form behind prefix."""
+    if isinstance(value, dict):
+        return {key: prefixed(item, prefix) for key, item in value.items()}
+    if isinstance(value, str):
+        return prefix + value
+    return value
+
+
+def scaled(grammar: dict, scale: int) -> dict:
+    """The lexicon plus scale - 1 synthetic copies of every entry."""
+    prefixes = [""] + ["".join(p) for p in itertools.product(LETTERS, "аоеиу", LETTERS)]
+    if scale > len(prefixes):
+        raise SystemExit(f"--scale must be at most {len(prefixes)}")
+    
+    result = {"verbs": {}, "nouns": {}}
+    for prefix in prefixes[:scale]:
+        for section in ("verbs", "nouns"):
+            for word, data in grammar[section].items():
+                entry = prefixed(data, prefix)
+                entry.update({k: v for k, v in data.items() if k in ("aspect", "gender", "animate")})
+                result[section][prefix + word] = entry
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=1000, help="Copies of the lexicon")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed passes per mode (best kept)")
+    args = parser.parse_args()
+    
+    grammar = snapshot.read_sources(["ru_grammar"])["ru_grammar"]
+    grammar.pop("_meta", None)
+    lexicon = scaled(grammar, args.scale)
+    entries = len(lexicon["verbs"]) + len(lexicon["nouns"])
+    
+    def best(fn, setup=lambda: None) -> float:
+        times = []
+        for _ in range(args.rounds):
+            setup()
+            gc.collect()  # Start each pass with the same collector debt
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    
+    uncached = GrammarEngine(cache_size=0)
+    expected = uncached.precompute_all(lexicon)
+    uncached_s = best(lambda: uncached.precompute_all(lexicon))
+    
+    memoized = GrammarEngine(cache_size=entries)
+    cold_s = best(lambda: memoized.precompute_all(lexicon), setup=memoized.cache_clear)
+    result = memoized.precompute_all(lexicon)
+    warm_s = best(lambda: memoized.precompute_all(lexicon))
+    info = memoized.cache_info()
+    
+    print(f"Lexicon: {len(lexicon['verbs'])} verbs, {len(lexicon['nouns'])} nouns "
+          f"({args.scale}x the shipped {len(grammar['verbs'])} + {len(grammar['nouns'])})")
+    print(f"\n{'Mode':<28} {'total ms':>9} {'µs/entry':>9} {'speedup':>8}")
+    for name, seconds in (("uncached", uncached_s),
+                          ("precompute_all (cold memo)", cold_s),
+                          ("memoized lookups", warm_s)):
+        print(f"{name:<28} {seconds * 1000:>9.1f} {seconds / entries * 1e6:>9.2f} "
+              f"{uncached_s / seconds:>7.1f}x")
+    print(f"\nMemo: {info['verbs'].currsize} verbs, {info['nouns'].currsize} nouns cached")
+    
+    if result != expected:
+        print("Memoized paradigms differ from the uncached ones")
+        return 1
+    print("Memoized paradigms match the uncached ones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
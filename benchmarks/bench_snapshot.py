@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start loading of the language data.
+
+Starts a fresh interpreter per run and times constructing Russian and
+English (with English data loaded), once parsing the JSON sources as
+before and once from the precompiled snapshot.
+
+Usage:
+    python benchmarks/bench_snapshot.py
+    python benchmarks/bench_snapshot.py --runs 30
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Child process: prints the time spent loading data, in milliseconds
+CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+from languages import snapshot
+snapshot.ENABLED = {enabled}
+from languages.english import English
+from languages.russian import Russian
+start = time.perf_counter()
+Russian()
+English().phrases
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def run(enabled: bool, runs: int, cache_home: str) -> list:
+    """Time data loading in `runs` fresh interpreters."""
+    code = CHILD.format(root=str(ROOT), enabled=enabled)
+    env = {"XDG_CACHE_HOME": cache_home, "PATH": ""}
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], env=env,
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip()))
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15, help="Interpreter starts per mode")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as cache_home:
+        # First run with snapshots enabled builds them
+        run(True, 1, cache_home)
+        
+        results = {
+            "json (before)": run(False, args.runs, cache_home),
+            "snapshot (after)": run(True, args.runs, cache_home),
+        }
+    
+    print(f"Data load in a fresh interpreter, {args.runs} runs each")
+    print(f"{'Mode':<18} {'median ms':>10} {'min ms':>10}")
+    for mode, times in results.items():
+        print(f"{mode:<18} {statistics.median(times):>10.2f} {min(times):>10.2f}")
+    
+    before = statistics.median(results["json (before)"])
+    after = statistics.median(results["snapshot (after)"])
+    print(f"\nSpeedup: {before / after:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup per command.
+
+Runs each command in a fresh interpreter and reports wall time, modules
+imported, language data files opened (JSON sources or snapshots) and
+subprocesses spawned, the last two counted with an audit hook. "eager"
+creates every component up front, as cli.main() used to; "lazy" is the
+current behaviour. Exits with status 1 if a lazy --stats run opens any
+language data.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Child process: runs one command and prints what it touched as JSON
+CHILD = """
+import io, json, os, sys
+from contextlib import redirect_stdout
+
+data_files, spawned = set(), []
+
+def audit(event, args):
+    if event == "open" and isinstance(args[0], (str, os.PathLike)):
+        path = os.fspath(args[0])
+        if "languages" + os.sep + "data" in path or os.sep + "snapshots" + os.sep in path:
+            data_files.add(os.path.basename(path))
+    elif event == "subprocess.Popen":
+        spawned.append(os.path.basename(os.fspath(args[0])))
+
+sys.addaudithook(audit)
+sys.path.insert(0, {root!r})
+import cli
+
+components = cli.Components()
+if {eager}:
+    components.warm()
+with redirect_stdout(io.StringIO()):
+    cli.run(cli.parse_args({argv!r}), components)
+print(json.dumps({{"modules": len(sys.modules), "data": sorted(data_files),
+                  "spawned": spawned}}))
+"""
+
+COMMANDS = {
+    "--stats": ["--stats"],
+    "--cache-stats": ["--cache-stats"],
+    "--export-anki": ["--export-anki", "{tmp}/deck.csv"],
+    "lookup -o": ["-o", "hello"],
+}
+
+
+def run(argv: list, eager: bool, runs: int, env: dict) -> tuple:
+    """Time `runs` fresh interpreters; returns (times in ms, last report)."""
+    code = CHILD.format(root=str(ROOT), eager=eager, argv=argv)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], env=env,
+                             capture_output=True, text=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times, json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Interpreter starts per command")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, XDG_CACHE_HOME=f"{tmp}/cache", XDG_DATA_HOME=f"{tmp}/data")
+        # Build the snapshots once so every run measures a warm install
+        run(["-o", "hello"], True, 1, env)
+        
+        print(f"CLI startup in a fresh interpreter, {args.runs} runs each")
+        print(f"{'Command':<15} {'Mode':<6} {'median ms':>10} {'modules':>8} "
+              f"{'data files':>11} {'spawned':>8}")
+        stats_data = None
+        for name, argv in COMMANDS.items():
+            argv = [a.format(tmp=tmp) for a in argv]
+            for eager in (True, False):
+                times, report = run(argv, eager, args.runs, env)
+                mode = "eager" if eager else "lazy"
+                print(f"{name:<15} {mode:<6} {statistics.median(times):>10.1f} "
+                      f"{report['modules']:>8} {len(report['data']):>11} "
+                      f"{len(report['spawned']):>8}")
+                if name == "--stats" and not eager:
+                    stats_data = report["data"]
+    
+    if stats_data:
+        print(f"\n--stats opened language data: {', '.join(stats_data)}")
+        return 1
+    print("\n--stats opened no language data")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
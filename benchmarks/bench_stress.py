@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark StressMarker.
+
+Compares remove_stress, remove_stress_many, has_stress, mark_stress and
+get_stress_position with the original character-by-character
+implementations over every form in the Russian data files (plus their
+stress-free spellings), and checks that the outputs are identical.
+
+Usage:
+    python benchmarks/bench_stress.py
+    python benchmarks/bench_stress.py --number 50
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.grammar import StressMarker
+from languages import snapshot
+
+VOWELS = StressMarker.VOWELS
+STRESSED_MAP = StressMarker.STRESSED_MAP
+UNSTRESSED_MAP = StressMarker.UNSTRESSED_MAP
+
+
+# The original implementations, kept as the reference
+
+def mark_stress_original(word: str, stress_position: int) -> str:
+    if stress_position < 1:
+        return word
+    vowel_count = 0
+    result = []
+    for char in word:
+        if char in VOWELS:
+            vowel_count += 1
+            if vowel_count == stress_position and char in STRESSED_MAP:
+                result.append(STRESSED_MAP[char])
+            else:
+                result.append(char)
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def remove_stress_original(word: str) -> str:
+    result = []
+    for char in word:
+        if char == '\u0301':
+            continue
+        result.append(UNSTRESSED_MAP.get(char, char))
+    return ''.join(result)
+
+
+def has_stress_original(word: str) -> bool:
+    return '\u0301' in word or any(c in word for c in UNSTRESSED_MAP)
+
+
+def get_stress_position_original(word: str):
+    vowel_count = 0
+    i = 0
+    while i < len(word):
+        char = word[i]
+        if char in VOWELS:
+            vowel_count += 1
+            if i + 1 < len(word) and word[i + 1] == '\u0301':
+                return vowel_count
+            if char in UNSTRESSED_MAP:
+                return vowel_count
+        i += 1
+    return None
+
+
+def strings(value):
+    """Every string nested in a parsed JSON value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from strings(item)
+
+
+def corpus() -> list:
+    """Words of the grammar and definition files, stressed and not."""
+    data = snapshot.read_sources(["ru_grammar", "ru_definitions"])
+    words = {word for text in strings(data) for word in text.split()
+             if any(c in VOWELS for c in word)}
+    words |= {remove_stress_original(word) for word in words}
+    return sorted(words)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20, help="Timing repetitions")
+    args = parser.parse_args()
+    
+    words = corpus()
+    marks = [(word, position) for word in words[::10] for position in range(0, 5)]
+    sm = StressMarker
+    
+    cases = {
+        "remove_stress": (
+            lambda: [remove_stress_original(w) for w in words],
+            lambda: [sm.remove_stress(w) for w in words],
+        ),
+        "remove_stress_many": (
+            lambda: [remove_stress_original(w) for w in words],
+            lambda: sm.remove_stress_many(words),
+        ),
+        "has_stress": (
+            lambda: [has_stress_original(w) for w in words],
+            lambda: [sm.has_stress(w) for w in words],
+        ),
+        "get_stress_position": (
+            lambda: [get_stress_position_original(w) for w in words],
+            lambda: [sm.get_stress_position(w) for w in words],
+        ),
+        "mark_stress": (
+            lambda: [mark_stress_original(w, p) for w, p in marks],
+            lambda: [sm.mark_stress(w, p) for w, p in marks],
+        ),
+    }
+    
+    print(f"Corpus: {len(words)} words, {len(marks)} mark_stress calls")
+    print(f"\n{'Method':<20} {'original µs':>12} {'new µs':>8} {'speedup':>8}  output")
+    failures = 0
+    for name, (original, new) in cases.items():
+        same = original() == new()
+        failures += not same
+        calls = len(marks) if name == "mark_stress" else len(words)
+        before = min(timeit.repeat(original, number=1, repeat=args.number)) / calls * 1e6
+        after = min(timeit.repeat(new, number=1, repeat=args.number)) / calls * 1e6
+        print(f"{name:<20} {before:>12.3f} {after:>8.3f} {before / after:>7.1f}x  "
+              f"{'identical' if same else 'MISMATCH'}")
+    
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
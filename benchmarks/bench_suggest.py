@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark "did you mean" suggestions.
+
+Builds each language's suggestion index, generates misspellings of its
+headwords (one or two random edits) and times SuggestionIndex.lookup()
+against a linear scan computing edit_distance() to every headword. The
+two must return the same suggestions.
+
+Usage:
+    python benchmarks/bench_suggest.py
+    python benchmarks/bench_suggest.py --queries 2000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from languages import snapshot
+from languages.english import English
+from languages.russian import Russian
+from languages.suggest import SuggestionIndex, edit_distance
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Apply one or two random edits."""
+    letters = sorted(set(word.replace(" ", ""))) or ["a"]
+    for _ in range(rng.choice((1, 2))):
+        i = rng.randrange(len(word) + 1)
+        edit = rng.choice(("insert", "delete", "replace", "swap"))
+        if edit == "insert" or len(word) < 2:
+            word = word[:i] + rng.choice(letters) + word[i:]
+        elif edit == "delete":
+            word = word[:i] + word[i + 1:]
+        elif edit == "replace":
+            word = word[:i] + rng.choice(letters) + word[i + 1:]
+        elif i < len(word) - 1:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def linear(terms: list, word: str, max_distance: int) -> list:
+    """Reference: the distance to every term, ranked like lookup()."""
+    word = word.lower().strip()
+    if not word:
+        return []
+    max_distance = min(max_distance, max(1, len(word) // 3))
+    results = []
+    for term in terms:
+        distance = edit_distance(word, term, max_distance)
+        if distance <= max_distance:
+            results.append((term, distance))
+    results.sort(key=lambda item: (item[1], abs(len(item[0]) - len(word)), item[0]))
+    return results[:5]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=500, help="Misspellings per language")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    
+    print(f"{'Language':<9} {'terms':>6} {'build ms':>9} {'index µs':>9} "
+          f"{'linear µs':>10} {'speedup':>8}")
+    mismatches = 0
+    for lang in (English, Russian):
+        data = snapshot.read_sources(lang.SUGGEST_SOURCES)
+        start = time.perf_counter()
+        index = SuggestionIndex(lang.headwords(data))
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        terms = sorted(index._terms)
+        queries = [misspell(rng.choice(terms), rng) for _ in range(args.queries)]
+        
+        start = time.perf_counter()
+        fast = [index.lookup(q) for q in queries]
+        fast_us = (time.perf_counter() - start) / len(queries) * 1e6
+        
+        start = time.perf_counter()
+        slow = [linear(terms, q, index.max_distance) for q in queries]
+        slow_us = (time.perf_counter() - start) / len(queries) * 1e6
+        
+        for query, a, b in zip(queries, fast, slow):
+            if a != b:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  mismatch for {query!r}: {a} != {b}")
+        
+        print(f"{lang.name:<9} {len(index):>6} {build_ms:>9.1f} {fast_us:>9.1f} "
+              f"{slow_us:>10.1f} {slow_us / fast_us:>7.0f}x")
+    
+    if mismatches:
+        print(f"\n{mismatches} queries differ from the linear scan")
+        return 1
+    print("\nAll suggestions match the linear scan")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
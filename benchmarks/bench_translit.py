@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark Russian transliteration.
+
+Compares the compiled Transliterator (per word and batched) with the
+original implementation, which re-sorted the rules and ran one
+str.replace per rule on every call, and checks that the outputs agree.
+
+Usage:
+    python benchmarks/bench_translit.py
+    python benchmarks/bench_translit.py --number 50
+"""
+
+import argparse
+import itertools
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from languages.russian import Russian, Transliterator
+
+
+def transliterate_original(rules: dict, word: str) -> str:
+    """The pre-compilation algorithm, kept as the reference."""
+    sorted_rules = sorted(rules.items(), key=lambda x: -len(x[0]))
+    result = word
+    for latin, cyrillic in sorted_rules:
+        result = result.replace(latin, cyrillic)
+    return result
+
+
+def corpus(russian: Russian) -> list:
+    """Real inputs plus every short string over the letters that interact."""
+    words = list(russian.word_lookup)
+    for data in russian.phrases.values():
+        if isinstance(data, dict):
+            words.extend(data.get("transliteration", "").lower().split())
+    
+    alphabet = "ayoueijshctzk"
+    for n in range(1, 5):
+        words.extend("".join(p) for p in itertools.product(alphabet, repeat=n))
+    return words
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20, help="Timing repetitions")
+    args = parser.parse_args()
+    
+    russian = Russian()
+    rules = russian.translit_rules["rules"]
+    compiled = Transliterator(rules)
+    words = corpus(russian)
+    
+    expected = [transliterate_original(rules, w) for w in words]
+    mismatches = [w for w, e in zip(words, expected) if compiled(w) != e]
+    batch_ok = compiled.transliterate_many(words) == expected
+    
+    print(f"Corpus: {len(words)} words")
+    print(f"Equivalence: {len(words) - len(mismatches)}/{len(words)} per word, "
+          f"batch {'ok' if batch_ok else 'MISMATCH'}")
+    for word in mismatches[:10]:
+        print(f"  {word!r}: {transliterate_original(rules, word)!r} != {compiled(word)!r}")
+    
+    timings = {
+        "original": lambda: [transliterate_original(rules, w) for w in words],
+        "compiled": lambda: [compiled(w) for w in words],
+        "transliterate_many": lambda: compiled.transliterate_many(words),
+    }
+    baseline = None
+    print(f"\n{'Method':<20} {'us/word':>10} {'speedup':>10}")
+    for name, fn in timings.items():
+        seconds = min(timeit.repeat(fn, number=1, repeat=args.number))
+        per_word = seconds / len(words) * 1e6
+        baseline = baseline or per_word
+        print(f"{name:<20} {per_word:>10.2f} {baseline / per_word:>9.1f}x")
+    
+    return 0 if not mismatches and batch_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
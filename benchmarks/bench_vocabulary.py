@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vocabulary stores.
+
+Builds a synthetic deck in the JSON store (vocabulary.json), the
+journaled JSON store and the SQLite store (alone, and as "sqlite+json",
+writing saved cards back to vocabulary.json), then times the operations a
+study session repeats: saving a word, rating a card (update_sm2),
+get_stats() and get_due_words(), plus a --study session of --ops cards
+on a StudyQueue (per card, including loading the queue and the final
+flush). Every store must end up with the same cards.
+
+Usage:
+    python benchmarks/bench_vocabulary.py
+    python benchmarks/bench_vocabulary.py --cards 10000 --ops 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.vocabulary import StudyQueue, Vocabulary
+
+BACKENDS = ("json", "journal", "sqlite", "sqlite+json")
+
+
+def deck(cards: int, rng: random.Random) -> list:
+    """Cards spread over the past and next 60 days, a third of them new."""
+    now = datetime.now()
+    entries = []
+    for i in range(cards):
+        interval = rng.choice((0, 0, 1, 6, 15, 40))
+        entries.append({
+            "word": f"word{i}",
+            "original": f"word{i}",
+            "definition": f"definition of word {i}",
+            "partOfSpeech": "noun",
+            "language": rng.choice(("en", "ru")),
+            "phonetic": "",
+            "dateAdded": now.isoformat(),
+            "timesReviewed": 0,
+            "correctCount": 0,
+            "sm2_easiness": 2.5,
+            "sm2_interval": interval,
+            "sm2_repetitions": 0,
+            "nextReview": (now + timedelta(days=rng.uniform(-60, 60))).isoformat(),
+        })
+    return entries
+
+
+def timed(fn, ops: int) -> float:
+    """Mean milliseconds per call over ops calls."""
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - start) / ops * 1000
+
+
+def session(store, cards: int) -> None:
+    """A study session: rate the first cards due, then write them back."""
+    queue = StudyQueue(store)
+    for _ in range(cards):
+        queue.rate(queue.pop(), 4)
+    queue.flush()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=50000, help="Deck size")
+    parser.add_argument("--ops", type=int, default=10, help="Calls per operation")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    entries = deck(args.cards, rng)
+    reviewed = [rng.choice(entries)["word"] for _ in range(args.ops)]
+    
+    results = {}
+    decks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in BACKENDS:
+            vocab_file = Path(tmp) / backend / "vocabulary.json"
+            vocab_file.parent.mkdir()
+            vocab_file.write_text(json.dumps(entries), encoding="utf-8")
+            
+            start = time.perf_counter()
+            vocabulary = Vocabulary(vocab_file=vocab_file, backend=backend)
+            open_ms = (time.perf_counter() - start) * 1000
+            
+            results[backend] = {
+                "open / import": open_ms,
+                "save": timed(lambda i: vocabulary.save({"word": f"new{i}"}), args.ops),
+                "update_sm2": timed(lambda i: vocabulary.update_sm2(reviewed[i], 4), args.ops),
+                "get_stats": timed(lambda i: vocabulary.get_stats(), args.ops),
+                "get_due_words": timed(lambda i: vocabulary.get_due_words(), args.ops),
+                "study session": timed(lambda i: session(vocabulary.store, args.ops), 1) / args.ops,
+            }
+            decks[backend] = [
+                (e["word"], e["language"], e["sm2_interval"], e["timesReviewed"])
+                for e in vocabulary._load()
+            ]
+            vocabulary.store.close()
+    
+    print(f"Deck: {args.cards} cards, {args.ops} calls per operation\n")
+    print(f"{'Operation':<15}" + "".join(f"{backend + ' ms':>16}" for backend in BACKENDS))
+    for op in results["json"]:
+        print(f"{op:<15}" + "".join(f"{results[backend][op]:>16.2f}" for backend in BACKENDS))
+    
+    if any(decks[backend] != decks["json"] for backend in BACKENDS):
+        print("\nThe stores hold different cards")
+        return 1
+    print("\nAll stores hold the same cards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,20 +4,25 @@ Command-line interface for define.
 """
 
 import argparse
-import subprocess
+import io
+import os
 import sys
+import threading
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 
-from core.dictionary import Dictionary
-from core.vocabulary import Vocabulary
-from core.cache import Cache
-from core.audio import AudioPlayer
-from languages import English, Russian
 from ui.formatter import Formatter
 
+if TYPE_CHECKING:
+    from core.cache import Cache
+
 
 def get_clipboard() -> str:
     """Get text from clipboard (cross-platform)."""
+    import subprocess
+    
     commands = [
         ["xclip", "-o", "-selection", "primary"],
         ["xclip", "-o", "-selection", "clipboard"],
@@ -39,8 +44,8 @@ def get_clipboard() -> str:
     return ""
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command-line arguments."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         prog="define",
         description="Terminal dictionary for English and Russian / "
@@ -108,9 +113,21 @@ Examples / Примеры:
                       help="Spaced repetition study session / Интервальное повторение")
     learn.add_argument("--stats", action="store_true",
                       help="Show vocabulary statistics / Статистика словаря")
+    learn.add_argument("--verify", action="store_true",
+                      help="With --stats: recount from scratch / Пересчитать статистику")
+    learn.add_argument("--forecast", type=int, metavar="DAYS",
+                      help="Project daily review load (at most 90 days without NumPy) "
+                           "/ Прогноз нагрузки по дням")
+    learn.add_argument("--quality-dist", metavar="SPEC",
+                      help="With --forecast: assumed recall qualities, e.g. "
+                           "5:25,4:35,3:20,2:10,1:7,0:3 / Распределение оценок")
     learn.add_argument("--export-anki", nargs="?", const="vocabulary.csv",
                       metavar="FILE",
-                      help="Export to Anki CSV / Экспорт в Anki")
+                      help="Export to Anki CSV, or a package if FILE ends in .apkg "
+                           "/ Экспорт в Anki")
+    learn.add_argument("--export-fields", metavar="SPEC",
+                      help="With --export-anki: extra fields, e.g. language,phonetic,sm2 "
+                           "/ Дополнительные поля")
     
     # Cache options
     cache = parser.add_argument_group("Cache options / Опции кэша")
@@ -118,50 +135,389 @@ Examples / Примеры:
                       help="Use cached results only / Только кэш")
     cache.add_argument("--clear-cache", action="store_true",
                       help="Clear the cache / Очистить кэш")
+    cache.add_argument("--cache-stats", action="store_true",
+                      help="Show cache size and compression stats / Статистика кэша")
+    cache.add_argument("--cache-gc", action="store_true",
+                      help="Remove expired entries and enforce size limits / Очистка кэша")
+    # Internal: background refresh of a stale cache entry (see Dictionary)
+    cache.add_argument("--refresh", metavar="LANG", help=argparse.SUPPRESS)
     
     # Other
     parser.add_argument("--no-color", action="store_true",
                        help="Disable colors / Отключить цвета")
+    parser.add_argument("--daemon", action="store_true",
+                       help="Serve lookups from a warm background process / Фоновый сервер")
+    parser.add_argument("--complete", metavar="TEXT",
+                       help="Print completions for the last word of TEXT / Автодополнение")
+    parser.add_argument("--completion", choices=("bash", "zsh"),
+                       help="Print a shell completion script / Скрипт автодополнения")
     parser.add_argument("-v", "--version", action="version",
                        version="define 2.2.0")
     
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments (default: sys.argv)."""
+    return build_parser().parse_args(argv)
+
+
+# Command names the completion scripts register (see install.sh)
+COMMAND_NAMES = ("define", "определить", "словарь", "слово")
+
+BASH_COMPLETION = """\
+# bash completion for define; enable with:
+#   source <(define --completion bash)
+_define() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}"
+    if [[ "$cur" == -* ]]; then
+        COMPREPLY=($(compgen -W "{options}" -- "$cur"))
+        return
+    fi
+    local words=() i
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        [[ "${{COMP_WORDS[i]}}" == -* ]] || words+=("${{COMP_WORDS[i]}}")
+    done
+    local text="${{words[*]}}"
+    text="${{text:+$text }}$cur"
+    local IFS=$'\\n'
+    COMPREPLY=($("${{COMP_WORDS[0]}}" --complete "$text" 2>/dev/null))
+}}
+complete -F _define {commands}
+"""
+
+ZSH_COMPLETION = """\
+#compdef {commands}
+# zsh completion for define; enable with:
+#   source <(define --completion zsh)
+# or save as _define in a directory on $fpath
+_define() {{
+    if [[ $PREFIX == -* ]]; then
+        compadd -- {options}
+        return
+    fi
+    local -a typed completions
+    typed=(${{words[2,CURRENT-1]:#-*}})
+    completions=(${{(f)"$($words[1] --complete "${{typed[*]}}${{typed:+ }}$PREFIX" 2>/dev/null)"}})
+    compadd -- $completions
+}}
+if [[ $zsh_eval_context[-1] == loadautofunc ]]; then
+    _define "$@"
+else
+    compdef _define {commands}
+fi
+"""
+
+
+def completion_script(shell: str) -> str:
+    """Shell completion script for bash or zsh, listing the current options."""
+    options = sorted(
+        option
+        for action in build_parser()._actions
+        if action.help is not argparse.SUPPRESS
+        for option in action.option_strings
+        if option.startswith("--")
+    )
+    template = BASH_COMPLETION if shell == "bash" else ZSH_COMPLETION
+    return template.format(options=" ".join(options), commands=" ".join(COMMAND_NAMES))
+
+
+def show_cache_stats(cache: "Cache", formatter: Formatter) -> None:
+    """Print cache storage, compression and decode-time statistics."""
+    stats = cache.stats()
+    entries = stats["entries"]
+    stored_kb = stats["stored_bytes"] / 1024
+    raw_kb = stats["raw_bytes"] / 1024
+    saved = 100 * (1 - stats["stored_bytes"] / stats["raw_bytes"]) if stats["raw_bytes"] else 0.0
+    codecs = ", ".join(f"{name}: {n}" for name, n in sorted(stats["codecs"].items())) or "-"
+    
+    formatter.header("Cache Statistics / Статистика кэша")
+    print(f"  Backend:        {stats['backend']} ({cache.cache_dir})")
+    print(f"  Codec:          {stats['codec']}")
+    print(f"  Entries:        {entries} ({codecs})")
+    print(f"  On disk:        {stored_kb:.1f} KB")
+    print(f"  Uncompressed:   {raw_kb:.1f} KB")
+    print(f"  Saved:          {saved:.1f}%")
+    if entries:
+        unpack_us = 1e6 * stats["unpack_seconds"] / entries
+        parse_us = 1e6 * stats["parse_seconds"] / entries
+        print(f"  Decode time:    {unpack_us + parse_us:.1f} µs/entry "
+              f"(decompress {unpack_us:.1f} µs + parse {parse_us:.1f} µs)")
+
+
+# TLS failures on macOS are usually python.org builds without root certificates
+CERTIFICATE_HINT = "Hint: If on macOS, try: /Applications/Python\\ 3.*/Install\\ Certificates.command"
+
+
+def report_lookup_failure(error: Exception, formatter: Formatter) -> None:
+    """Print an upstream failure once, with the certificate hint for TLS errors."""
+    formatter.error(f"Network error: {error}")
+    reason = str(error).upper()
+    if "CERTIFICATE" in reason or "SSL" in reason:
+        print(CERTIFICATE_HINT, file=sys.stderr)
+
+
+def show_forecast(vocabulary, days: int, spec: Optional[str], formatter: Formatter) -> int:
+    """Print the projected number of reviews for each of the next days."""
+    from datetime import date, timedelta
+    from core.forecast import DEFAULT_QUALITIES, max_days, parse_qualities
+    
+    if days < 1:
+        formatter.error("--forecast needs at least 1 day / Нужен хотя бы 1 день")
+        return 1
+    limit = max_days()
+    if limit is not None and days > limit:
+        formatter.info(f"NumPy is not installed: forecasting the first {limit} days only "
+                       f"/ Без NumPy прогноз не длиннее {limit} дней")
+        days = limit
+    try:
+        qualities = parse_qualities(spec) if spec else DEFAULT_QUALITIES
+    except ValueError as e:
+        formatter.error(f"--quality-dist: {e}")
+        return 1
+    
+    counts = vocabulary.forecast(days, qualities)
+    total = sum(qualities.values())
+    shares = ", ".join(f"{q}: {100 * w / total:.0f}%" for q, w in sorted(qualities.items(), reverse=True))
+    formatter.header(f"Review Forecast / Прогноз повторений ({days} days)")
+    formatter.info(f"Assumed recall quality / Оценки: {shares}\n")
+    
+    widest = max(counts) or 1
+    today = date.today()
+    for offset, count in enumerate(counts):
+        bar = "█" * round(30 * count / widest)
+        print(f"  {(today + timedelta(days=offset)).strftime('%a %Y-%m-%d')}  {count:>6}  {bar}")
+    print(f"\n  Total reviews:  {sum(counts)} (average {sum(counts) / days:.1f}/day)")
+    return 0
+
+
+class Components:
+    """
+    The long-lived objects behind the commands; the daemon keeps one set.
+    
+    Each is created (and its module imported) on first access, so a
+    command only pays for what it uses: --stats never loads the language
+    data, the cache database or the HTTP stack.
+    """
+    
+    def __init__(self, refresh_command: Optional[list] = None):
+        """
+        Args:
+            refresh_command: Passed to Dictionary; None refreshes stale
+                entries in a thread, which suits the long-lived daemon
+        """
+        self.refresh_command = refresh_command
+    
+    @cached_property
+    def cache(self):
+        from core.cache import Cache
+        return Cache()
+    
+    @cached_property
+    def vocabulary(self):
+        from core.vocabulary import Vocabulary
+        return Vocabulary()
+    
+    @cached_property
+    def audio(self):
+        from core.audio import AudioPlayer
+        return AudioPlayer()
+    
+    @cached_property
+    def languages(self) -> list:
+        from languages import English, Russian
+        return [English(), Russian()]
+    
+    @cached_property
+    def completion_index(self):
+        from languages.complete import load_index
+        return load_index()
+    
+    @cached_property
+    def dictionary(self):
+        from core.dictionary import Dictionary
+        return Dictionary(self.languages, self.cache,
+                          refresh_command=self.refresh_command)
+    
+    def warm(self) -> None:
+        """Create everything up front so the daemon's first request is fast."""
+        self.vocabulary
+        self.audio.player
+        self.dictionary
+        self.completion_index
+
+
+# Commands that talk to the user's terminal; the daemon hands them back
+INTERACTIVE_COMMANDS = ("review", "quiz", "study")
+
+
+class _Capture(io.StringIO):
+    """Output buffer that reports the client's terminal state to Formatter."""
+    
+    def __init__(self, tty: bool):
+        super().__init__()
+        self._tty = tty
+    
+    def isatty(self) -> bool:
+        return self._tty
+
 
+class _ThreadOutput:
+    """
+    Stand-in for sys.stdout / sys.stderr that writes to a per-thread
+    stream, so the daemon can capture concurrent requests separately.
+    Threads without a stream of their own write to the original one.
+    """
+    
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+    
+    @property
+    def target(self):
+        stream = getattr(self._local, "stream", None)
+        return self._default if stream is None else stream
+    
+    def write(self, text: str) -> int:
+        return self.target.write(text)
+    
+    def flush(self) -> None:
+        self.target.flush()
+    
+    def isatty(self) -> bool:
+        return self.target.isatty()
+    
+    def __getattr__(self, name):
+        return getattr(self.target, name)
 
-def main() -> int:
+
+@contextmanager
+def _captured(stdout, stderr):
+    """Send this thread's output to stdout/stderr for the duration."""
+    if isinstance(sys.stdout, _ThreadOutput) and isinstance(sys.stderr, _ThreadOutput):
+        sys.stdout._local.stream, sys.stderr._local.stream = stdout, stderr
+        try:
+            yield
+        finally:
+            sys.stdout._local.stream = sys.stderr._local.stream = None
+    else:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            yield
+
+
+def serve_request(request: dict, components: Components) -> Optional[dict]:
+    """
+    Run one forwarded command line inside the daemon.
+    
+    Returns:
+        Reply with exit code and captured output, or None when the client
+        should run the command itself (interactive commands, --help,
+        argument errors)
+    """
+    try:
+        with _captured(io.StringIO(), io.StringIO()):
+            args = parse_args(request.get("argv", []))
+    except SystemExit:
+        return None
+    
+    if args.daemon or args.refresh or any(getattr(args, name) for name in INTERACTIVE_COMMANDS):
+        return None
+    
+    # Requests run concurrently, so paths are resolved against the
+    # client's directory instead of changing the daemon's
+    if args.export_anki and request.get("cwd"):
+        args.export_anki = os.path.join(request["cwd"], args.export_anki)
+    
+    # The daemon's Vocabulary outlives changes the Bash version makes
+    if args.save or args.stats or args.export_anki or args.forecast is not None:
+        components.vocabulary.refresh()
+    
+    stdout, stderr = _Capture(request.get("tty", False)), _Capture(False)
+    try:
+        with _captured(stdout, stderr):
+            code = run(args, components)
+    except Exception:
+        import traceback
+        traceback.print_exc(file=stderr)
+        code = 1
+    
+    return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Main entry point."""
-    args = parse_args()
+    args = parse_args(argv)
     
-    # Initialize components
-    cache = Cache()
+    if args.daemon:
+        from core.daemon import serve
+        components = Components()
+        components.warm()
+        sys.stdout, sys.stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+        return serve(lambda request: serve_request(request, components))
+    
+    components = Components(
+        refresh_command=[sys.executable, str(Path(__file__).resolve())]
+    )
+    return run(args, components)
+
+
+def run(args: argparse.Namespace, components: Components) -> int:
+    """Run a parsed command line, creating only the components it uses."""
     formatter = Formatter(no_color=args.no_color)
-    vocabulary = Vocabulary()
-    audio = AudioPlayer()
     
-    # Initialize languages
-    languages = [English(), Russian()]
-    dictionary = Dictionary(languages, cache)
+    if args.complete is not None:
+        from languages.complete import complete
+        for word in complete(args.complete, index=components.completion_index):
+            print(word)
+        return 0
+    
+    if args.completion:
+        print(completion_script(args.completion), end="")
+        return 0
+    
+    if args.refresh:
+        components.dictionary.refresh(" ".join(args.word), force_lang=args.refresh,
+                                      translate=args.translate)
+        return 0
     
     # Handle special commands
     if args.clear_cache:
-        count = cache.clear()
+        count = components.cache.clear()
         formatter.info(f"Cleared {count} cached definitions / Очищено {count} определений")
         return 0
     
+    if args.cache_stats:
+        show_cache_stats(components.cache, formatter)
+        return 0
+    
+    if args.cache_gc:
+        expired, evicted = components.cache.sweep(full=True)
+        entries, size = components.cache.backend.totals()
+        formatter.info(f"Removed {expired} expired, evicted {evicted} / "
+                       f"Удалено {expired} устаревших, вытеснено {evicted} "
+                       f"({entries} entries, {size / 1024:.1f} KB left)")
+        return 0
+    
     if args.review:
-        vocabulary.review(formatter)
+        components.vocabulary.review(formatter)
         return 0
     
     if args.quiz:
-        vocabulary.quiz(formatter)
+        components.vocabulary.quiz(formatter)
         return 0
     
     if args.study:
-        vocabulary.study(formatter)
+        components.vocabulary.study(formatter)
         return 0
     
     if args.stats:
-        stats = vocabulary.get_stats()
+        if args.verify:
+            if components.vocabulary.verify_stats():
+                formatter.info("Stored counters verified / Счётчики проверены")
+            else:
+                formatter.info("Stored counters were out of date and have been rebuilt / "
+                               "Счётчики устарели и пересчитаны")
+        stats = components.vocabulary.get_stats()
         formatter.header("Vocabulary Statistics / Статистика словаря")
         print(f"  Total words:    {stats['total']}")
         print(f"  Due for review: {stats['due']}")
@@ -170,14 +526,23 @@ def main() -> int:
         print(f"  New:            {stats['new']} (never reviewed)")
         return 0
     
+    if args.forecast is not None:
+        return show_forecast(components.vocabulary, args.forecast, args.quality_dist, formatter)
+    
     if args.export_anki:
-        count = vocabulary.export_anki(args.export_anki)
+        from core.anki import parse_fields
+        try:
+            fields = parse_fields(args.export_fields) if args.export_fields else ()
+        except ValueError as e:
+            formatter.error(f"--export-fields: {e}")
+            return 1
+        count = components.vocabulary.export_anki(args.export_anki, fields)
         formatter.info(f"Exported {count} words to {args.export_anki}")
         return 0
     
     # Get word to look up
     if args.random:
-        word = dictionary.random_word()
+        word = components.dictionary.random_word()
         formatter.random_word(word)
     elif args.word:
         word = " ".join(args.word)
@@ -197,15 +562,21 @@ def main() -> int:
         force_lang = "en"
     
     # Look up word
-    result = dictionary.lookup(
-        word,
-        force_lang=force_lang,
-        offline=args.offline,
-        translate=args.translate
-    )
+    from languages.base import LookupFailed
+    try:
+        result = components.dictionary.lookup(
+            word,
+            force_lang=force_lang,
+            offline=args.offline,
+            translate=args.translate,
+            raise_errors=True
+        )
+    except LookupFailed as e:
+        report_lookup_failure(e, formatter)
+        result = None
     
     if not result:
-        formatter.not_found(word)
+        formatter.not_found(word, components.dictionary.suggest(word, force_lang))
         return 1
     
     # Display result
@@ -235,11 +606,11 @@ def main() -> int:
     
     # Play audio if requested
     if args.pronounce and result.get("audio"):
-        audio.play(result["audio"])
+        components.audio.play(result["audio"])
     
     # Save to vocabulary if requested
     if args.save:
-        vocabulary.save(result)
+        components.vocabulary.save(result)
         formatter.saved(result["word"])
     
     return 0
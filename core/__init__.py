@@ -1,10 +1,25 @@
 """
 Core functionality for define.
+
+Exports are imported on first use, so light modules such as core.daemon
+can be loaded without pulling in the rest of the package.
 """
 
-from .dictionary import Dictionary
-from .cache import Cache
-from .vocabulary import Vocabulary
-from .audio import AudioPlayer
+import importlib
+
+_EXPORTS = {
+    "Dictionary": "dictionary",
+    "AsyncDictionary": "dictionary",
+    "Cache": "cache",
+    "Vocabulary": "vocabulary",
+    "AudioPlayer": "audio",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["Dictionary", "Cache", "Vocabulary", "AudioPlayer"]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
@@ -0,0 +1,311 @@
+"""
+Anki export: streaming CSV and .apkg packages.
+
+Entries are consumed one at a time from any iterable (VocabularyStore
+streams them), so the deck is never held in memory. The CSV export uses
+the csv module, so definitions keep their semicolons and quotes, and
+starts with Anki's file headers so the importer picks the separator and
+columns itself. The .apkg export writes an Anki collection (schema 11)
+with sqlite3 and zips it with zipfile. Notes get stable GUIDs, so a
+re-import updates the existing cards, and cards carry their SM-2 state
+into Anki's scheduler.
+"""
+
+import csv
+import hashlib
+import html
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zipfile
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+# Optional columns after Front and Back: name -> (headers, values of an entry)
+EXTRA_FIELDS: Dict[str, Tuple[Tuple[str, ...], Callable[[dict], tuple]]] = {
+    "language": (("Language",), lambda e: (e.get("language", "en"),)),
+    "phonetic": (("Phonetic",), lambda e: (e.get("phonetic", ""),)),
+    "sm2": (("Easiness", "Interval", "Repetitions", "Next review"),
+            lambda e: (e.get("sm2_easiness", 2.5), e.get("sm2_interval", 0),
+                       e.get("sm2_repetitions", 0), e.get("nextReview", ""))),
+}
+
+CHUNK_SIZE = 1000
+DECK_NAME = "define vocabulary"
+
+
+def parse_fields(spec: str) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated list of extra fields ("language,phonetic,sm2").
+    
+    Raises:
+        ValueError: For an unknown field
+    """
+    fields = tuple(f.strip().lower() for f in spec.split(",") if f.strip())
+    unknown = [f for f in fields if f not in EXTRA_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown export field(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(EXTRA_FIELDS)})")
+    return fields
+
+
+def columns(fields: Iterable[str]) -> List[str]:
+    """Column names of an export: Front, Back and the extra fields."""
+    return ["Front", "Back"] + [name for f in fields for name in EXTRA_FIELDS[f][0]]
+
+
+def row(entry: dict, fields: Iterable[str]) -> list:
+    """
+    Export values of an entry.
+    
+    Front is the word (with its phonetic spelling), Back the definition
+    (behind its part of speech), as in the original CSV export.
+    """
+    front = entry.get("word", "")
+    if entry.get("phonetic"):
+        front += f" ({entry['phonetic']})"
+    back = entry.get("definition", "")
+    if entry.get("partOfSpeech"):
+        back = f"[{entry['partOfSpeech']}] {back}"
+    values = [front, back]
+    for f in fields:
+        values.extend(EXTRA_FIELDS[f][1](entry))
+    return values
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _file_mode(path: Path) -> int:
+    """Permissions of the file being replaced, or 0666 less the umask for a new one."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _replace_with(path: Path, write: Callable[[Path], int]) -> int:
+    """Run write on a temporary file next to path, then rename it over path."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent or ".")
+    os.close(fd)
+    try:
+        count = write(Path(tmp))
+        # mkstemp files are 0600: give the export the mode open() would
+        os.chmod(tmp, _file_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def export_csv(entries: Iterable[dict], path: Path, fields: Iterable[str] = (),
+               chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Write entries as a semicolon-separated CSV for Anki's importer.
+    
+    Returns:
+        Number of entries written
+    """
+    fields = tuple(fields)
+    
+    def write(tmp: Path) -> int:
+        count = 0
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.write("#separator:Semicolon\n#html:false\n")
+            f.write(f"#columns:{';'.join(columns(fields))}\n")
+            writer = csv.writer(f, delimiter=";", lineterminator="\n")
+            for chunk in _chunks(entries, chunk_size):
+                writer.writerows(row(entry, fields) for entry in chunk)
+                count += len(chunk)
+        return count
+    
+    return _replace_with(path, write)
+
+
+# Anki collection, schema 11 (what .apkg packages contain)
+APKG_SCHEMA = """
+CREATE TABLE col (
+    id integer primary key, crt integer not null, mod integer not null,
+    scm integer not null, ver integer not null, dty integer not null,
+    usn integer not null, ls integer not null, conf text not null,
+    models text not null, decks text not null, dconf text not null,
+    tags text not null
+);
+CREATE TABLE notes (
+    id integer primary key, guid text not null, mid integer not null,
+    mod integer not null, usn integer not null, tags text not null,
+    flds text not null, sfld integer not null, csum integer not null,
+    flags integer not null, data text not null
+);
+CREATE TABLE cards (
+    id integer primary key, nid integer not null, did integer not null,
+    ord integer not null, mod integer not null, usn integer not null,
+    type integer not null, queue integer not null, due integer not null,
+    ivl integer not null, factor integer not null, reps integer not null,
+    lapses integer not null, left integer not null, odue integer not null,
+    odid integer not null, flags integer not null, data text not null
+);
+CREATE TABLE revlog (
+    id integer primary key, cid integer not null, usn integer not null,
+    ease integer not null, ivl integer not null, lastIvl integer not null,
+    factor integer not null, time integer not null, type integer not null
+);
+CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+"""
+
+# Created after the inserts: one sort per index instead of per-row upkeep
+APKG_INDEXES = """
+CREATE INDEX ix_notes_usn on notes (usn);
+CREATE INDEX ix_cards_usn on cards (usn);
+CREATE INDEX ix_revlog_usn on revlog (usn);
+CREATE INDEX ix_cards_nid on cards (nid);
+CREATE INDEX ix_cards_sched on cards (did, queue, due);
+CREATE INDEX ix_revlog_cid on revlog (cid);
+CREATE INDEX ix_notes_csum on notes (csum);
+"""
+
+# Stable ids, so every export targets the same note type and deck in Anki
+MODEL_ID = 1607392319
+DECK_ID = 2059400110
+
+DECK_CONF = {
+    "id": 1, "name": "Default", "mod": 0, "usn": 0, "maxTaken": 60, "autoplay": True,
+    "timer": 0, "replayq": True, "dyn": False,
+    "new": {"bury": True, "delays": [1, 10], "initialFactor": 2500, "ints": [1, 4, 7],
+            "order": 1, "perDay": 20, "separate": True},
+    "rev": {"bury": True, "ease4": 1.3, "fuzz": 0.05, "ivlFct": 1, "maxIvl": 36500,
+            "minSpace": 1, "perDay": 200},
+    "lapse": {"delays": [10], "leechAction": 0, "leechFails": 8, "minInt": 1, "mult": 0},
+}
+
+
+def _model(fields: List[str], now: int) -> dict:
+    """A two-sided note type: Front on the question, everything else on the answer."""
+    extras = "".join(f"{{{{#{name}}}}}<div>{name}: {{{{{name}}}}}</div>{{{{/{name}}}}}"
+                     for name in fields[2:])
+    return {
+        "id": MODEL_ID, "name": "define (Front/Back)", "type": 0, "mod": now, "usn": -1,
+        "sortf": 0, "did": DECK_ID, "tags": [], "vers": [], "req": [[0, "all", [0]]],
+        "latexPre": "\\documentclass[12pt]{article}\n\\special{papersize=3in,5in}\n"
+                    "\\usepackage{amssymb,amsmath}\n\\pagestyle{empty}\n"
+                    "\\setlength{\\parindent}{0in}\n\\begin{document}\n",
+        "latexPost": "\\end{document}",
+        "css": ".card { font-family: arial; font-size: 20px; text-align: center; }",
+        "flds": [{"name": name, "ord": i, "sticky": False, "rtl": False,
+                  "font": "Arial", "size": 20, "media": []} for i, name in enumerate(fields)],
+        "tmpls": [{"name": "Card 1", "ord": 0, "did": None, "bqfmt": "", "bafmt": "",
+                   "qfmt": "{{Front}}",
+                   "afmt": "{{FrontSide}}<hr id=answer>{{Back}}" + extras}],
+    }
+
+
+def _deck(deck_id: int, name: str, now: int) -> dict:
+    return {"id": deck_id, "name": name, "mod": now, "usn": -1, "desc": "", "dyn": 0,
+            "conf": 1, "collapsed": False, "extendNew": 10, "extendRev": 50,
+            "lrnToday": [0, 0], "revToday": [0, 0], "newToday": [0, 0], "timeToday": [0, 0]}
+
+
+def guid(entry: dict) -> str:
+    """Stable note GUID of an entry: the same word exports as the same note."""
+    key = f"{entry.get('language', 'en')}:{entry.get('word', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def export_apkg(entries: Iterable[dict], path: Path, fields: Iterable[str] = (),
+                deck_name: str = DECK_NAME, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Write entries as an Anki package (.apkg): one note and card per entry.
+    
+    Reviewed entries become review cards with their interval, ease
+    (easiness * 1000), due date and review counts; the rest are new cards
+    in saved order.
+    
+    Returns:
+        Number of entries written
+    """
+    fields = tuple(fields)
+    names = columns(fields)
+    
+    def write(tmp: Path) -> int:
+        now = int(time.time())
+        today = date.today()
+        crt = int(datetime.combine(today, datetime.min.time()).timestamp())
+        base_id = now * 1000
+        
+        with tempfile.TemporaryDirectory() as work:
+            db_path = Path(work) / "collection.anki2"
+            conn = sqlite3.connect(str(db_path), isolation_level=None)
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(APKG_SCHEMA)
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, '{}')",
+                (crt, now * 1000, now * 1000,
+                 json.dumps({"nextPos": 1, "curDeck": DECK_ID, "activeDecks": [DECK_ID],
+                             "curModel": MODEL_ID, "sortType": "noteFld", "sortBackwards": False,
+                             "newSpread": 0, "collapseTime": 1200, "estTimes": True,
+                             "dueCounts": True, "timeLim": 0, "addToCur": True}),
+                 json.dumps({str(MODEL_ID): _model(names, now)}),
+                 json.dumps({"1": _deck(1, "Default", now),
+                             str(DECK_ID): _deck(DECK_ID, deck_name, now)}),
+                 json.dumps({"1": DECK_CONF}))
+            )
+            
+            count = 0
+            for chunk in _chunks(entries, chunk_size):
+                notes, cards = [], []
+                for entry in chunk:
+                    values = [str(v) for v in row(entry, fields)]
+                    sort_field = values[0]
+                    csum = int(hashlib.sha1(sort_field.encode("utf-8")).hexdigest()[:8], 16)
+                    note_id = card_id = base_id + count
+                    notes.append((note_id, guid(entry), MODEL_ID, now, -1, "define",
+                                  "\x1f".join(html.escape(v, quote=False) for v in values),
+                                  sort_field, csum, 0, ""))
+                    
+                    interval = entry.get("sm2_interval") or 0
+                    reviews = entry.get("timesReviewed") or 0
+                    lapses = max(0, reviews - (entry.get("correctCount") or 0))
+                    if interval > 0:
+                        try:
+                            due = (date.fromisoformat(entry["nextReview"][:10]) - today).days
+                        except (KeyError, ValueError):
+                            due = 0
+                        card = (2, 2, max(0, due), interval,
+                                round((entry.get("sm2_easiness") or 2.5) * 1000))
+                    else:
+                        card = (0, 0, count + 1, 0, 0)
+                    kind, queue, due, ivl, factor = card
+                    cards.append((card_id, note_id, DECK_ID, 0, now, -1, kind, queue, due,
+                                  ivl, factor, reviews, lapses, 0, 0, 0, 0, ""))
+                    count += 1
+                conn.executemany(
+                    "INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", notes)
+                conn.executemany(
+                    "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    cards)
+            conn.execute("COMMIT")
+            conn.executescript(APKG_INDEXES)
+            conn.close()
+            
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as package:
+                package.write(db_path, "collection.anki2")
+                package.writestr("media", "{}")
+        return count
+    
+    return _replace_with(path, write)
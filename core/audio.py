@@ -2,33 +2,24 @@
 Audio playback for pronunciations.
 """
 
+import shutil
 import subprocess
 import tempfile
-import urllib.request
+from functools import cached_property
 from typing import Optional
 
 
 class AudioPlayer:
     """Cross-platform audio playback for pronunciations."""
     
-    def __init__(self):
-        self.player = self._detect_player()
+    PLAYERS = ("mpv", "ffplay", "cvlc", "afplay", "paplay")
     
-    def _detect_player(self) -> Optional[str]:
-        """Detect available audio player."""
-        players = ["mpv", "ffplay", "cvlc", "afplay", "paplay"]
-        
-        for player in players:
-            try:
-                subprocess.run(
-                    ["which", player],
-                    capture_output=True,
-                    check=True
-                )
+    @cached_property
+    def player(self) -> Optional[str]:
+        """First available audio player, detected on first playback."""
+        for player in self.PLAYERS:
+            if shutil.which(player):
                 return player
-            except subprocess.CalledProcessError:
-                continue
-        
         return None
     
     def play(self, url: str) -> bool:
@@ -67,6 +58,7 @@ class AudioPlayer:
                 )
             elif self.player in ("afplay", "paplay"):
                 # These need a local file
+                import urllib.request
                 with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
                     temp_path = f.name
                     urllib.request.urlretrieve(url, temp_path)
@@ -1,61 +1,919 @@
 """
 Caching functionality for dictionary lookups.
+
+Storage is pluggable. The default backend keeps every entry in a single
+SQLite database (cache.db); the legacy one-JSON-file-per-word layout
+is still available as FileBackend.
+
+Payloads are compact JSON, optionally compressed, behind a 4-byte header
+naming the codec. Payloads without a header are legacy pretty-printed
+JSON, so caches holding a mix of formats still read correctly.
 """
 
+import atexit
 import json
 import hashlib
+import lzma
+import os
+import sqlite3
+import threading
 import time
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional, Tuple, Union
+
+
+def _key_hash(word: str, lang: str) -> str:
+    """Hash used by the legacy file layout (<md5>.json)."""
+    key = f"{lang}:{word}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+# Header: MAGIC followed by a one-byte codec tag. JSON text never starts
+# with a NUL byte, so headerless payloads are unambiguously legacy.
+MAGIC = b"\x00DF"
+
+
+class Codec:
+    """Uncompressed compact JSON."""
+    
+    name = "json"
+    tag = b"j"
+    
+    def compress(self, raw: bytes) -> bytes:
+        return raw
+    
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCodec(Codec):
+    """zlib (deflate) compression: fast, moderate ratio."""
+    
+    name = "zlib"
+    tag = b"z"
+    
+    def __init__(self, level: int = 6):
+        self.level = level
+    
+    def compress(self, raw: bytes) -> bytes:
+        return zlib.compress(raw, self.level)
+    
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class LzmaCodec(Codec):
+    """LZMA compression: best ratio, slowest."""
+    
+    name = "lzma"
+    tag = b"x"
+    
+    def compress(self, raw: bytes) -> bytes:
+        return lzma.compress(raw, format=lzma.FORMAT_RAW,
+                             filters=[{"id": lzma.FILTER_LZMA2, "preset": 6}])
+    
+    def decompress(self, data: bytes) -> bytes:
+        return lzma.decompress(data, format=lzma.FORMAT_RAW,
+                               filters=[{"id": lzma.FILTER_LZMA2}])
+
+
+CODECS = {codec.name: codec for codec in (Codec(), ZlibCodec(), LzmaCodec())}
+_CODECS_BY_TAG = {codec.tag: codec for codec in CODECS.values()}
+
+
+def encode_payload(data: Any, codec: Codec) -> Tuple[bytes, int]:
+    """
+    Serialize a value for storage.
+    
+    Returns:
+        Tuple of (payload, uncompressed JSON size)
+    """
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return MAGIC + codec.tag + codec.compress(raw), len(raw)
+
+
+def payload_codec(payload: bytes) -> str:
+    """Name of the codec a payload was written with ("legacy" if none)."""
+    if payload[:3] == MAGIC:
+        codec = _CODECS_BY_TAG.get(payload[3:4])
+        return codec.name if codec else "unknown"
+    return "legacy"
+
+
+def unpack_payload(payload: bytes) -> bytes:
+    """
+    Strip the header and decompress a stored payload to JSON bytes.
+    
+    Raises:
+        ValueError: Unknown codec tag or corrupt data
+    """
+    if payload[:3] != MAGIC:
+        return payload
+    
+    codec = _CODECS_BY_TAG.get(payload[3:4])
+    if codec is None:
+        raise ValueError(f"Unknown cache codec tag: {payload[3:4]!r}")
+    try:
+        return codec.decompress(payload[4:])
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"Corrupt {codec.name} payload: {e}") from e
+
+
+def decode_payload(payload: bytes) -> Any:
+    """
+    Decode a stored payload of any supported format.
+    
+    Raises:
+        ValueError: The payload cannot be decoded
+    """
+    return json.loads(unpack_payload(payload).decode("utf-8"))
+
+
+class CacheBackend(ABC):
+    """
+    Abstract storage backend for the cache.
+    
+    Backends store opaque payload bytes under a (lang, key) pair
+    together with creation and expiry timestamps. Expiry policy is
+    decided by Cache; backends only persist it.
+    """
+    
+    @abstractmethod
+    def get(self, lang: str, key: str) -> Optional[Tuple[bytes, float, float]]:
+        """
+        Fetch a stored entry.
+        
+        Returns:
+            Tuple of (payload, created_at, expires_at) or None
+        """
+        pass
+    
+    @abstractmethod
+    def set(self, lang: str, key: str, payload: bytes, expires_at: float,
+            negative: bool = False) -> None:
+        """
+        Store an entry, replacing any previous value.
+        
+        negative marks a negative-result marker, which keys() leaves out.
+        """
+        pass
+    
+    @abstractmethod
+    def delete(self, lang: str, key: str) -> None:
+        """Remove a single entry if present."""
+        pass
+    
+    @abstractmethod
+    def scan(self) -> Iterator[Tuple[str, str, bytes]]:
+        """Iterate over every stored (lang, key, payload)."""
+        pass
+    
+    @abstractmethod
+    def clear(self) -> int:
+        """
+        Remove every entry.
+        
+        Returns:
+            Number of entries deleted
+        """
+        pass
+    
+    def totals(self) -> Tuple[int, int]:
+        """
+        Current (entry count, stored bytes).
+        
+        Backends without a cheap way to know return (0, 0), which also
+        disables automatic size-triggered sweeps for them.
+        """
+        return 0, 0
+    
+    def keys(self, lang: str, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Iterate the live keys stored for a language, negative markers
+        excluded.
+        
+        Backends that cannot list keys cheaply yield nothing (the file
+        layout only keeps hashes).
+        
+        Args:
+            lang: Language code
+            limit: At most this many keys, most recently used first
+        """
+        return iter(())
+    
+    def sweep(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+              policy: str = "lru", limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Delete expired entries, then evict entries until within bounds.
+        
+        Args:
+            max_entries: Entry count bound (None = unbounded)
+            max_bytes: Stored size bound (None = unbounded)
+            policy: "lru" or "lfu"
+            limit: Maximum rows to delete per step (None = no limit)
+        
+        Returns:
+            Tuple of (expired removed, entries evicted)
+        """
+        return 0, 0
+    
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
+
+
+class FileBackend(CacheBackend):
+    """
+    Legacy layout: one <md5>.json file per entry.
+    
+    The file mtime doubles as the entry timestamp, so files written by
+    older versions keep working. Per-entry expiry is encoded by shifting
+    the mtime so that mtime + lifetime == expires_at. There is no
+    access index, so size bounds are not enforced for this layout.
+    """
+    
+    def __init__(self, cache_dir: Path, lifetime: float):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.lifetime = lifetime
+    
+    def _path(self, lang: str, key: str) -> Path:
+        """Get cache file path for an entry."""
+        return self.cache_dir / f"{_key_hash(key, lang)}.json"
+    
+    def get(self, lang: str, key: str) -> Optional[Tuple[bytes, float, float]]:
+        path = self._path(lang, key)
+        try:
+            mtime = path.stat().st_mtime
+            payload = path.read_bytes()
+        except OSError:
+            return None
+        return payload, mtime, mtime + self.lifetime
+    
+    def set(self, lang: str, key: str, payload: bytes, expires_at: float,
+            negative: bool = False) -> None:
+        path = self._path(lang, key)
+        try:
+            path.write_bytes(payload)
+            stamp = expires_at - self.lifetime
+            os.utime(path, (stamp, stamp))
+        except OSError:
+            pass  # Silently fail on cache write errors
+    
+    def delete(self, lang: str, key: str) -> None:
+        try:
+            self._path(lang, key).unlink()
+        except OSError:
+            pass
+    
+    def scan(self) -> Iterator[Tuple[str, str, bytes]]:
+        # The md5 filename is one-way; the hash stands in for the key
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                yield "", cache_file.stem, cache_file.read_bytes()
+            except OSError:
+                continue
+    
+    def clear(self) -> int:
+        count = 0
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                cache_file.unlink()
+                count += 1
+            except OSError:
+                pass
+        return count
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Single-file SQLite store (WAL mode).
+    
+    Entries live in one table keyed by (lang, key). Secondary indexes on
+    expires_at, accessed_at and (hits, accessed_at) let sweeps walk
+    expired, least recently used or least frequently used rows in order,
+    and triggers keep running totals so size checks never scan the table.
+    
+    Reads are plain SELECTs and never take the write lock. Access times
+    and hit counts are queued in memory and written in one batch: before
+    every sweep, once ACCESS_BATCH entries are pending, on close and at
+    exit. A batch that finds the database locked is kept for the next try.
+    """
+    
+    SCHEMA_VERSION = 3
+    
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS entries (
+            lang         TEXT NOT NULL,
+            key          TEXT NOT NULL,
+            data         BLOB NOT NULL,
+            created_at   REAL NOT NULL,
+            expires_at   REAL NOT NULL,
+            size         INTEGER NOT NULL DEFAULT 0,
+            accessed_at  REAL NOT NULL DEFAULT 0,
+            hits         INTEGER NOT NULL DEFAULT 0,
+            negative     INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (lang, key)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at)",
+        "CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)",
+        "CREATE INDEX IF NOT EXISTS entries_lfu ON entries (hits, accessed_at)",
+        """CREATE TABLE IF NOT EXISTS meta (
+            name   TEXT PRIMARY KEY,
+            value  TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS totals (
+            id       INTEGER PRIMARY KEY CHECK (id = 1),
+            entries  INTEGER NOT NULL,
+            bytes    INTEGER NOT NULL
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+            UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+            UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+            UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 1;
+        END""",
+    )
+    
+    # Upsert rather than INSERT OR REPLACE: REPLACE deletes the old row
+    # without firing the delete trigger, which would skew the totals.
+    UPSERT = """
+        INSERT INTO entries
+            (lang, key, data, created_at, expires_at, size, accessed_at, hits, negative)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)
+        ON CONFLICT (lang, key) DO UPDATE SET
+            data = excluded.data,
+            created_at = excluded.created_at,
+            expires_at = excluded.expires_at,
+            size = excluded.size,
+            accessed_at = excluded.accessed_at,
+            negative = excluded.negative
+    """
+    
+    # Negative markers ({NEGATIVE_KEY: reason, "failures": n}) encode to
+    # far fewer bytes than this; only rows this small are decoded when
+    # flagging the markers of a version 2 database
+    MARKER_MAX_SIZE = 256
+    
+    EVICTION_ORDER = {
+        "lru": "accessed_at",
+        "lfu": "hits, accessed_at"
+    }
+    
+    ACCESS_BATCH = 64
+    
+    TOUCH = """
+        UPDATE entries SET accessed_at = max(accessed_at, ?), hits = hits + ?
+        WHERE lang = ? AND key = ?
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by every thread, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=5,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._upgrade()
+        # (lang, key) -> [last access time, hits] not yet written
+        self._touches = {}
+        ref = weakref.ref(self)
+        atexit.register(lambda: ref() is not None and ref().flush_access())
+    
+    def _upgrade(self) -> None:
+        """Create the schema, upgrading databases written by older versions."""
+        conn = self._conn
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == self.SCHEMA_VERSION:
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if columns and "size" not in columns:
+                # Version 1: entries without size / access tracking
+                conn.execute("ALTER TABLE entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                conn.execute("ALTER TABLE entries ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                conn.execute("ALTER TABLE entries ADD COLUMN hits INTEGER NOT NULL DEFAULT 0")
+                conn.execute("UPDATE entries SET size = length(data), accessed_at = created_at")
+            if columns and "negative" not in columns:
+                # Version 2: negative markers not flagged
+                conn.execute("ALTER TABLE entries ADD COLUMN negative INTEGER NOT NULL DEFAULT 0")
+                self._flag_markers()
+            
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT OR REPLACE INTO totals (id, entries, bytes) "
+                "SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            )
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def _flag_markers(self) -> None:
+        """Set the negative flag on existing negative markers (upgrade only)."""
+        markers = []
+        rows = self._conn.execute(
+            "SELECT lang, key, data FROM entries WHERE length(data) <= ?",
+            (self.MARKER_MAX_SIZE,)
+        )
+        for lang, key, data in rows:
+            try:
+                value = decode_payload(bytes(data))
+            except ValueError:
+                continue
+            if isinstance(value, dict) and NEGATIVE_KEY in value:
+                markers.append((lang, key))
+        self._conn.executemany(
+            "UPDATE entries SET negative = 1 WHERE lang = ? AND key = ?", markers
+        )
+    
+    def get(self, lang: str, key: str) -> Optional[Tuple[bytes, float, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at, expires_at FROM entries WHERE lang = ? AND key = ?",
+                (lang, key)
+            ).fetchone()
+            if row is None:
+                return None
+            touch = self._touches.setdefault((lang, key), [0.0, 0])
+            touch[0] = time.time()
+            touch[1] += 1
+            pending = len(self._touches)
+        if pending >= self.ACCESS_BATCH:
+            self.flush_access()
+        return bytes(row[0]), row[1], row[2]
+    
+    def flush_access(self) -> bool:
+        """
+        Write queued access times and hit counts without waiting for the
+        write lock.
+        
+        Returns:
+            True if nothing is left queued
+        """
+        with self._lock:
+            if not self._touches:
+                return True
+            conn = self._conn
+            try:
+                conn.execute("PRAGMA busy_timeout = 0")
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    self._write_touches()
+                    conn.execute("COMMIT")
+                finally:
+                    conn.execute("PRAGMA busy_timeout = 5000")
+            except sqlite3.Error:
+                try:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                return False
+            return True
+    
+    def _write_touches(self) -> None:
+        """Apply the queued accesses inside the caller's transaction (lock held)."""
+        touches, self._touches = self._touches, {}
+        try:
+            self._conn.executemany(self.TOUCH, [
+                (accessed_at, hits, lang, key)
+                for (lang, key), (accessed_at, hits) in touches.items()
+            ])
+        except sqlite3.Error:
+            for item, (accessed_at, hits) in touches.items():
+                touch = self._touches.setdefault(item, [0.0, 0])
+                touch[0] = max(touch[0], accessed_at)
+                touch[1] += hits
+            raise
+    
+    def set(self, lang: str, key: str, payload: bytes, expires_at: float,
+            negative: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                self.UPSERT,
+                (lang, key, payload, now, expires_at, len(payload), now, int(negative))
+            )
+    
+    def set_many(self, rows: list) -> None:
+        """Insert many (lang, key, payload, created_at, expires_at) rows in one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    self.UPSERT,
+                    [(lang, key, payload, created, expires, len(payload), created, 0)
+                     for lang, key, payload, created, expires in rows]
+                )
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def totals(self) -> Tuple[int, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entries, bytes FROM totals WHERE id = 1"
+            ).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+    
+    def sweep(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+              policy: str = "lru", limit: Optional[int] = None) -> Tuple[int, int]:
+        if policy not in self.EVICTION_ORDER:
+            raise ValueError(f"Unknown eviction policy: {policy!r}")
+        
+        batch = -1 if limit is None else limit
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Queued accesses first, so eviction sees current recency
+                self._write_touches()
+                
+                # Expired rows first, oldest expiry first, via the index
+                expired = conn.execute(
+                    "DELETE FROM entries WHERE (lang, key) IN ("
+                    "SELECT lang, key FROM entries WHERE expires_at <= ? "
+                    "ORDER BY expires_at LIMIT ?)",
+                    (time.time(), batch)
+                ).rowcount
+                
+                entries, size = conn.execute(
+                    "SELECT entries, bytes FROM totals WHERE id = 1"
+                ).fetchone()
+                excess_entries = entries - max_entries if max_entries is not None else 0
+                excess_bytes = size - max_bytes if max_bytes is not None else 0
+                
+                victims = []
+                if excess_entries > 0 or excess_bytes > 0:
+                    # Walk the policy index until enough has been freed;
+                    # only the rows that get evicted are ever read.
+                    rows = conn.execute(
+                        f"SELECT lang, key, size FROM entries "
+                        f"ORDER BY {self.EVICTION_ORDER[policy]}"
+                    )
+                    for lang, key, row_size in rows:
+                        if excess_entries <= 0 and excess_bytes <= 0:
+                            break
+                        if limit is not None and len(victims) >= limit:
+                            break
+                        victims.append((lang, key))
+                        excess_entries -= 1
+                        excess_bytes -= row_size
+                    rows.close()
+                    conn.executemany(
+                        "DELETE FROM entries WHERE lang = ? AND key = ?", victims
+                    )
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        
+        return expired, len(victims)
+    
+    def delete(self, lang: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE lang = ? AND key = ?", (lang, key)
+            )
+    
+    def keys(self, lang: str, limit: Optional[int] = None) -> Iterator[str]:
+        query = "SELECT key FROM entries WHERE lang = ? AND expires_at > ? AND negative = 0"
+        if limit is not None:
+            query += " ORDER BY accessed_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(
+                query,
+                (lang, time.time()) + (() if limit is None else (limit,)),
+            ).fetchall()
+        return (key for (key,) in rows)
+    
+    def scan(self) -> Iterator[Tuple[str, str, bytes]]:
+        # A separate read connection: WAL readers never block the writer
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            for lang, key, data in conn.execute("SELECT lang, key, data FROM entries"):
+                yield lang, key, bytes(data)
+        finally:
+            conn.close()
+    
+    def clear(self) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM entries").rowcount
+    
+    def get_meta(self, name: str) -> Optional[str]:
+        """Read a bookkeeping value."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, name: str, value: str) -> None:
+        """Write a bookkeeping value."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                (name, value)
+            )
+    
+    def close(self) -> None:
+        self.flush_access()
+        with self._lock:
+            self._touches.clear()
+            self._conn.close()
+
+
+def _legacy_key(path: Path, data: dict) -> Optional[Tuple[str, str]]:
+    """
+    Recover the (lang, key) a legacy cache file was written under.
+    
+    The md5 filename cannot be reversed, so candidate keys are rebuilt
+    from the cached result and checked against the filename.
+    """
+    lang = data.get("language")
+    if not isinstance(lang, str):
+        return None
+    
+    candidates = []
+    for field in ("normalized", "original_input", "word"):
+        value = data.get(field)
+        if isinstance(value, str) and value:
+            candidates.extend([value, value.strip().lower()])
+    
+    for word in candidates:
+        for key in (word, f"{word}:translate"):
+            if _key_hash(key, lang) == path.stem:
+                return lang, key
+    return None
+
+
+def migrate_json_cache(cache_dir: Path, backend: SQLiteBackend, lifetime: float) -> int:
+    """
+    Import legacy <md5>.json cache files into a SQLite backend.
+    
+    Imported files are deleted; files whose key cannot be recovered are
+    left untouched. Expiry is carried over from the file mtime.
+    
+    Returns:
+        Number of entries imported
+    """
+    rows = []
+    imported = []
+    now = time.time()
+    
+    for path in Path(cache_dir).glob("*.json"):
+        try:
+            payload = path.read_bytes()
+            mtime = path.stat().st_mtime
+            data = decode_payload(payload)
+        except (OSError, ValueError):
+            continue
+        
+        if mtime + lifetime <= now or not isinstance(data, dict):
+            continue
+        
+        recovered = _legacy_key(path, data)
+        if recovered is None:
+            continue
+        
+        lang, key = recovered
+        rows.append((lang, key, payload, mtime, mtime + lifetime))
+        imported.append(path)
+    
+    if rows:
+        backend.set_many(rows)
+    for path in imported:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    
+    return len(rows)
+
+
+class MemoryCache:
+    """
+    In-process LRU tier kept in front of the persistent backend.
+    
+    Holds already-decoded entries so repeated lookups in a long-running
+    process skip both the backend read and the JSON parse. Bounded by
+    entry count and by the encoded payload size of what it holds.
+    """
+    
+    def __init__(self, max_entries: int = 512, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()  # (lang, key) -> (value, nbytes, expires_at, stale_at)
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, lang: str, key: str) -> Optional[Any]:
+        """Return a live entry and mark it most recently used."""
+        item = self.get_item(lang, key)
+        return item[0] if item else None
+    
+    def get_item(self, lang: str, key: str) -> Optional[Tuple[Any, float]]:
+        """Like get(), but return (value, stale_at)."""
+        with self._lock:
+            item = self._entries.get((lang, key))
+            if item is None:
+                self.misses += 1
+                return None
+            
+            value, nbytes, expires_at, stale_at = item
+            if time.time() > expires_at:
+                del self._entries[(lang, key)]
+                self.size -= nbytes
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end((lang, key))
+            self.hits += 1
+            return value, stale_at
+    
+    def put(self, lang: str, key: str, value: Any, nbytes: int, expires_at: float,
+            stale_at: Optional[float] = None) -> None:
+        """Insert or refresh an entry, evicting least recently used ones."""
+        if nbytes > self.max_bytes or self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            old = self._entries.pop((lang, key), None)
+            if old is not None:
+                self.size -= old[1]
+            
+            if stale_at is None:
+                stale_at = expires_at
+            self._entries[(lang, key)] = (value, nbytes, expires_at, stale_at)
+            self.size += nbytes
+            
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted, _, _) = self._entries.popitem(last=False)
+                self.size -= evicted
+    
+    def discard(self, lang: str, key: str) -> None:
+        """Drop an entry if present."""
+        with self._lock:
+            old = self._entries.pop((lang, key), None)
+            if old is not None:
+                self.size -= old[1]
+    
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+    
+    def stats(self) -> dict:
+        """Hit/miss counters and current occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.size
+        }
+
+
+# Negative entries are stored as {NEGATIVE_KEY: reason} markers, so they
+# share the codec, memory tier and eviction with ordinary entries.
+NEGATIVE_KEY = "__negative__"
+NOT_FOUND = "not_found"   # upstream answered: no such word
+ERROR = "error"           # upstream unreachable or failing: retry soon
+MAX_ERROR_TTL = 3600      # cap on the doubling ERROR lifetime
 
 
 class Cache:
-    """File-based cache for dictionary lookups."""
+    """Cache for dictionary lookups on top of a pluggable storage backend."""
     
-    def __init__(self, cache_dir: Optional[Path] = None, ttl_days: int = 30):
+    DB_NAME = "cache.db"
+    
+    def __init__(self, cache_dir: Optional[Path] = None, ttl_days: int = 30,
+                 hard_ttl_days: int = 90,
+                 backend: Union[str, CacheBackend] = "sqlite",
+                 codec: str = "zlib",
+                 memory_entries: int = 512,
+                 memory_bytes: int = 8 * 1024 * 1024,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = 100 * 1024 * 1024,
+                 eviction: str = "lru",
+                 sweep_every: int = 100,
+                 negative_ttl: int = 86400,
+                 error_ttl: int = 60):
         if cache_dir is None:
             xdg_cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
             cache_dir = xdg_cache / "define"
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Soft TTL: entries older than this are stale but still served
+        # while a refresh runs. Hard TTL: entries older than this are gone.
         self.ttl_seconds = ttl_days * 86400
+        self.hard_ttl_seconds = max(hard_ttl_days, ttl_days) * 86400
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        
+        if codec not in CODECS:
+            raise ValueError(f"Unknown cache codec: {codec!r}")
+        self.codec = CODECS[codec]
+        
+        if backend == "sqlite":
+            backend = SQLiteBackend(self.cache_dir / self.DB_NAME)
+            if backend.get_meta("json_migrated") is None:
+                migrate_json_cache(self.cache_dir, backend, self.hard_ttl_seconds)
+                backend.set_meta("json_migrated", str(int(time.time())))
+        elif backend == "file":
+            backend = FileBackend(self.cache_dir, self.hard_ttl_seconds)
+        elif not isinstance(backend, CacheBackend):
+            raise ValueError(f"Unknown cache backend: {backend!r}")
+        
+        self.backend = backend
+        self.memory = MemoryCache(memory_entries, memory_bytes)
+        
+        if eviction not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction!r}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.sweep_every = sweep_every
+        self.sweep_batch = 500
+        self._lookups = 0
     
     def _hash(self, word: str, lang: str) -> str:
         """Generate cache key hash."""
-        key = f"{lang}:{word}"
-        return hashlib.md5(key.encode()).hexdigest()
-    
-    def _cache_path(self, word: str, lang: str) -> Path:
-        """Get cache file path for a word."""
-        return self.cache_dir / f"{self._hash(word, lang)}.json"
+        return _key_hash(word, lang)
     
-    def get(self, word: str, lang: str) -> Optional[dict]:
+    def get(self, word: str, lang: str, allow_stale: bool = False) -> Optional[dict]:
         """
         Get cached definition if available and not expired.
         
         Args:
             word: The word to look up
             lang: Language code
+            allow_stale: Also return entries past the soft TTL
             
         Returns:
             Cached result or None
         """
-        cache_file = self._cache_path(word, lang)
-        
-        if not cache_file.exists():
+        value, stale = self.get_entry(word, lang)
+        if stale and not allow_stale:
             return None
+        return value
+    
+    def get_entry(self, word: str, lang: str) -> Tuple[Optional[dict], bool]:
+        """
+        Get a cached definition together with its freshness.
         
-        # Check if expired
-        file_age = time.time() - cache_file.stat().st_mtime
-        if file_age > self.ttl_seconds:
-            cache_file.unlink()
-            return None
+        Args:
+            word: The word to look up
+            lang: Language code
         
-        try:
-            return json.loads(cache_file.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, IOError):
-            return None
+        Returns:
+            Tuple of (cached result or None, True if past the soft TTL)
+        """
+        value, stale_at = self._get_value(word, lang)
+        if value is None or (isinstance(value, dict) and NEGATIVE_KEY in value):
+            return None, False
+        return value, time.time() > stale_at
+    
+    def get_negative(self, word: str, lang: str) -> Optional[str]:
+        """
+        Check for a cached negative result.
+        
+        Args:
+            word: The word to look up
+            lang: Language code
+        
+        Returns:
+            NOT_FOUND, ERROR, or None if there is no live negative entry
+        """
+        value, _ = self._get_value(word, lang)
+        if isinstance(value, dict) and NEGATIVE_KEY in value:
+            return value[NEGATIVE_KEY]
+        return None
     
     def set(self, word: str, lang: str, data: dict) -> None:
         """
@@ -66,31 +924,180 @@ class Cache:
             lang: Language code
             data: Definition data to cache
         """
-        cache_file = self._cache_path(word, lang)
+        self._put(word, lang, data, self.hard_ttl_seconds, self.ttl_seconds)
+    
+    def keys(self, lang: str, limit: Optional[int] = None) -> list:
+        """
+        Words with a cached definition in a language (cache keys, so
+        translate-mode entries carry a ":translate" suffix). Negative
+        entries are flagged when stored and left out.
+        
+        Args:
+            lang: Language code
+            limit: At most this many keys, most recently used first
+        """
+        return list(self.backend.keys(lang, limit))
+    
+    def set_negative(self, word: str, lang: str, reason: str = NOT_FOUND) -> None:
+        """
+        Remember that a lookup produced nothing.
+        
+        NOT_FOUND entries live for negative_ttl. ERROR entries (network
+        failures, rate limiting) start at error_ttl and double with each
+        consecutive failure, capped at one hour, so a flapping upstream
+        is backed off without hiding words for long.
+        
+        Args:
+            word: The word
+            lang: Language code
+            reason: NOT_FOUND or ERROR
+        """
+        marker = {NEGATIVE_KEY: reason}
+        if reason == ERROR:
+            previous, _ = self._get_value(word, lang)
+            failures = 1
+            if isinstance(previous, dict) and previous.get(NEGATIVE_KEY) == ERROR:
+                failures = previous.get("failures", 0) + 1
+            marker["failures"] = failures
+            ttl = min(self.error_ttl * 2 ** (failures - 1), MAX_ERROR_TTL)
+        else:
+            ttl = self.negative_ttl
+        self._put(word, lang, marker, ttl)
+    
+    def _get_value(self, word: str, lang: str) -> Tuple[Any, float]:
+        """
+        Fetch a live decoded entry (definition or negative marker).
+        
+        Returns:
+            Tuple of (value or None, time the value goes stale)
+        """
+        self._lookups += 1
+        if self.sweep_every and self._lookups % self.sweep_every == 0:
+            self.sweep()
+        
+        item = self.memory.get_item(lang, word)
+        if item is not None:
+            return item
+        
         try:
-            cache_file.write_text(
-                json.dumps(data, ensure_ascii=False, indent=2),
-                encoding="utf-8"
-            )
-        except IOError:
+            entry = self.backend.get(lang, word)
+        except sqlite3.Error:
+            return None, 0.0  # Unreadable (e.g. locked) cache: treat as a miss
+        if entry is None:
+            return None, 0.0
+        
+        payload, created_at, expires_at = entry
+        if time.time() > expires_at:
+            try:
+                self.backend.delete(lang, word)
+            except sqlite3.Error:
+                pass
+            return None, 0.0
+        
+        try:
+            raw = unpack_payload(payload)
+            value = json.loads(raw.decode("utf-8"))
+        except ValueError:  # includes JSONDecodeError and UnicodeDecodeError
+            return None, 0.0
+        
+        if isinstance(value, dict) and NEGATIVE_KEY in value:
+            stale_at = expires_at
+        else:
+            stale_at = min(created_at + self.ttl_seconds, expires_at)
+        self.memory.put(lang, word, value, len(raw), expires_at, stale_at)
+        return value, stale_at
+    
+    def _put(self, word: str, lang: str, value: Any, ttl: float,
+             fresh_for: Optional[float] = None) -> None:
+        """Encode and store a value in both tiers."""
+        payload, raw_size = encode_payload(value, self.codec)
+        now = time.time()
+        expires_at = now + ttl
+        stale_at = now + fresh_for if fresh_for is not None else expires_at
+        
+        # Write through: the memory tier always mirrors the latest value
+        self.memory.put(lang, word, value, raw_size, expires_at, stale_at)
+        try:
+            negative = isinstance(value, dict) and NEGATIVE_KEY in value
+            self.backend.set(lang, word, payload, expires_at, negative)
+            if self._over_bounds():
+                self.sweep()
+        except sqlite3.Error:
             pass  # Silently fail on cache write errors
     
+    def _over_bounds(self) -> bool:
+        """Whether the backend currently exceeds max_entries / max_bytes."""
+        entries, size = self.backend.totals()
+        return ((self.max_entries is not None and entries > self.max_entries) or
+                (self.max_bytes is not None and size > self.max_bytes))
+    
+    def sweep(self, full: bool = False) -> Tuple[int, int]:
+        """
+        Purge expired entries and evict down to 90% of the size bounds.
+        
+        Automatic sweeps delete at most sweep_batch rows so a lookup never
+        stalls on a large backlog; full=True (define --cache-gc) does not stop
+        until done. Evicting below the bound leaves headroom so the next
+        few writes do not trigger another sweep.
+        
+        Returns:
+            Tuple of (expired removed, entries evicted)
+        """
+        target_entries = int(self.max_entries * 0.9) if self.max_entries is not None else None
+        target_bytes = int(self.max_bytes * 0.9) if self.max_bytes is not None else None
+        try:
+            return self.backend.sweep(
+                target_entries, target_bytes, self.eviction,
+                limit=None if full else self.sweep_batch
+            )
+        except sqlite3.Error:
+            return 0, 0
+    
     def clear(self) -> int:
         """
         Clear all cached definitions.
         
         Returns:
-            Number of files deleted
+            Number of entries deleted
         """
-        count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
+        self.memory.clear()
+        return self.backend.clear()
+    
+    def stats(self) -> dict:
+        """
+        Storage statistics: entry count, on-disk vs. uncompressed size,
+        codec mix and decode cost. Reads every entry once.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        stats = {
+            "backend": type(self.backend).__name__,
+            "codec": self.codec.name,
+            "entries": 0,
+            "stored_bytes": 0,
+            "raw_bytes": 0,
+            "codecs": {},
+            "unpack_seconds": 0.0,
+            "parse_seconds": 0.0,
+            "memory": self.memory.stats()
+        }
+        
+        for _, _, payload in self.backend.scan():
+            name = payload_codec(payload)
+            stats["codecs"][name] = stats["codecs"].get(name, 0) + 1
+            stats["entries"] += 1
+            stats["stored_bytes"] += len(payload)
+            
             try:
-                cache_file.unlink()
-                count += 1
-            except IOError:
-                pass
-        return count
-
-
-# Need this import at the top level
-import os
+                start = time.perf_counter()
+                raw = unpack_payload(payload)
+                unpacked = time.perf_counter()
+                json.loads(raw.decode("utf-8"))
+                stats["unpack_seconds"] += unpacked - start
+                stats["parse_seconds"] += time.perf_counter() - unpacked
+            except ValueError:
+                continue
+            stats["raw_bytes"] += len(raw)
+        
+        return stats
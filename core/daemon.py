@@ -0,0 +1,193 @@
+"""
+Lookup daemon: one long-lived process keeps the dictionary, caches and
+HTTP connections warm and serves `define` invocations over a Unix
+domain socket.
+
+The client half (request/forward) runs before anything else is loaded,
+so it only uses modules that are built into the interpreter: messages
+are marshal-encoded and the socket comes from _socket, skipping the
+json, re, enum and pathlib imports that would cost more than the lookup
+itself. Any failure to talk to the daemon makes forward() return None
+and the caller runs the command in-process as usual.
+"""
+
+from __future__ import annotations
+
+import _socket
+import marshal
+import os
+import sys
+
+# Bumped whenever the request/reply format changes; mismatches fall back
+PROTOCOL_VERSION = 1
+
+# A daemon that does not accept within this is treated as absent
+CONNECT_TIMEOUT = 0.5
+
+# A miss may wait on the upstream API: just over the HTTP client's 15 s
+# request deadline. Completions never touch the network, so a slow reply
+# means a stuck daemon and the client completes in-process instead.
+CLIENT_TIMEOUT = 20.0
+COMPLETE_TIMEOUT = 2.0
+
+
+def socket_path() -> str:
+    """Socket location: $XDG_RUNTIME_DIR/define, else the cache directory."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "define", "daemon.sock")
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg_cache, "define", "daemon.sock")
+
+
+def _recv_all(sock) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def request(argv: list, path: str | None = None,
+            timeout: float | None = None) -> dict | None:
+    """
+    Send a command line to the daemon.
+    
+    Args:
+        timeout: Seconds to wait for the reply (default: COMPLETE_TIMEOUT
+            for --complete, CLIENT_TIMEOUT otherwise)
+    
+    Returns:
+        Reply dict with "code", "stdout" and "stderr", or None if there is
+        no daemon or it asked the client to run the command itself
+    """
+    message = {
+        "version": PROTOCOL_VERSION,
+        "argv": list(argv),
+        "cwd": os.getcwd(),
+        "tty": sys.stdout.isatty(),
+    }
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path or socket_path()))
+        if timeout is None:
+            timeout = COMPLETE_TIMEOUT if "--complete" in argv else CLIENT_TIMEOUT
+        sock.settimeout(timeout)
+        sock.sendall(marshal.dumps(message))
+        sock.shutdown(_socket.SHUT_WR)
+        reply = marshal.loads(_recv_all(sock))
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    finally:
+        sock.close()
+    
+    if not isinstance(reply, dict) or reply.get("fallback"):
+        return None
+    return reply
+
+
+def forward(argv: list, path: str | None = None) -> int | None:
+    """
+    Run a command line through the daemon and print its output.
+    
+    Returns:
+        Exit code, or None if the command must run in-process
+    """
+    reply = request(argv, path)
+    if reply is None:
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.stdout.flush()
+    return int(reply.get("code", 0))
+
+
+def _alive(path) -> bool:
+    """True if a daemon is accepting connections on path."""
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def make_server(handler, path):
+    """
+    Bind a server for the daemon protocol on path.
+    
+    Each connection is handled on its own thread, so a lookup waiting on
+    the network does not hold up completions or cached lookups.
+    
+    Args:
+        handler: Called with each request dict (concurrently, so it must
+            be thread-safe); returns the reply dict, or None to make the
+            client run the command itself
+        path: Socket path; must not be in use
+    """
+    import socketserver
+    
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                message = marshal.loads(self.rfile.read())
+            except (ValueError, EOFError, TypeError):
+                return
+            reply = None
+            if isinstance(message, dict) and message.get("version") == PROTOCOL_VERSION:
+                reply = handler(message)
+            if reply is None:
+                reply = {"fallback": True}
+            self.wfile.write(marshal.dumps(reply))
+    
+    old_umask = os.umask(0o077)  # Socket usable by this user only
+    try:
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    return server
+
+
+def serve(handler, path: str | None = None) -> int:
+    """
+    Serve requests until interrupted (Ctrl+C or SIGTERM).
+    
+    Args:
+        handler: See make_server()
+        path: Socket path (default: socket_path())
+    
+    Returns:
+        Exit code (1 if another daemon already owns the socket)
+    """
+    import signal
+    from pathlib import Path
+    
+    path = Path(path or socket_path())
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if path.exists():
+        if _alive(path):
+            print(f"define daemon already running on {path}", file=sys.stderr)
+            return 1
+        path.unlink()  # Left behind by a daemon that died
+    
+    server = make_server(handler, path)
+    
+    # Let `kill` shut down cleanly and remove the socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"define daemon listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return 0
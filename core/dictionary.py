@@ -2,21 +2,45 @@
 Core dictionary functionality.
 """
 
-import urllib.request
-import urllib.error
-import json
-from typing import Optional
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from .cache import Cache
+from .cache import Cache, NOT_FOUND, ERROR
+from languages.base import LookupFailed
 
 
 class Dictionary:
     """Multi-language dictionary with caching."""
     
-    def __init__(self, languages: list, cache: Cache):
+    # Cached words searched by suggest(): the most recently used ones, so
+    # the index over them builds in a fraction of a second on any cache
+    SUGGEST_CACHED_KEYS = 5000
+    
+    def __init__(self, languages: list, cache: Cache,
+                 refresh_command: Optional[list] = None):
+        """
+        Args:
+            languages: Language instances
+            cache: Cache instance
+            refresh_command: Command prefix used to refresh stale entries in a
+                detached process (e.g. [sys.executable, "/path/to/define"]).
+                None refreshes in a daemon thread, which suits long-running
+                processes; one-shot CLI runs need the detached process since
+                they exit before a thread would finish.
+        """
         self.languages = {lang.code: lang for lang in languages}
         self.language_list = languages
         self.cache = cache
+        self.refresh_command = refresh_command
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # Language code -> SuggestionIndex over cached words, built on the
+        # first suggest() and kept current by _record()
+        self._cached_terms = {}
+        self._terms_lock = threading.Lock()
     
     def detect_language(self, text: str) -> str:
         """Auto-detect language of input text."""
@@ -33,19 +57,12 @@ class Dictionary:
         
         return "en"  # Default to English
     
-    def lookup(self, word: str, force_lang: Optional[str] = None,
-               offline: bool = False, translate: bool = False) -> Optional[dict]:
+    def _resolve(self, word: str, force_lang: Optional[str], translate: bool) -> tuple:
         """
-        Look up a word in the dictionary.
+        Pick the language and cache key for an input.
         
-        Args:
-            word: The word to look up
-            force_lang: Force a specific language code
-            offline: Only use cached results
-            translate: Use translation mode (show translation, not definition)
-            
         Returns:
-            Dictionary result or None if not found
+            Tuple of (stripped word, language, language code, normalized word, cache key)
         """
         word = word.strip()
         
@@ -60,18 +77,184 @@ class Dictionary:
         # Normalize word (e.g., transliterate Russian)
         normalized = lang.normalize(word)
         
-        # Check cache first (different cache key for translate mode)
+        # Different cache key for translate mode
         cache_key = f"{normalized}:translate" if translate else normalized
-        cached = self.cache.get(cache_key, lang_code)
+        return word, lang, lang_code, normalized, cache_key
+    
+    def lookup(self, word: str, force_lang: Optional[str] = None,
+               offline: bool = False, translate: bool = False,
+               raise_errors: bool = False) -> Optional[dict]:
+        """
+        Look up a word in the dictionary.
+        
+        Entries past the cache's soft TTL are returned immediately and
+        refreshed in the background (stale-while-revalidate).
+        
+        Args:
+            word: The word to look up
+            force_lang: Force a specific language code
+            offline: Only use cached results
+            translate: Use translation mode (show translation, not definition)
+            raise_errors: Raise LookupFailed when the upstream fails (or
+                failed recently) instead of returning None
+            
+        Returns:
+            Dictionary result or None if not found
+        """
+        word, lang, lang_code, normalized, cache_key = self._resolve(word, force_lang, translate)
+        
+        # Check cache first
+        cached, stale = self.cache.get_entry(cache_key, lang_code)
         if cached:
+            if stale and not offline:
+                self._schedule_refresh(word, lang_code, translate)
             return cached
         
         if offline:
             return None
         
-        # Look up in language module
-        result = lang.lookup(normalized, translate=translate)
+        # Known misses (not found, or upstream recently failing)
+        reason = self.cache.get_negative(cache_key, lang_code)
+        if reason == ERROR and raise_errors:
+            raise LookupFailed("upstream lookup failed recently")
+        if reason:
+            return None
         
+        return self._fetch(word, lang, lang_code, normalized, cache_key, translate,
+                           raise_errors=raise_errors)
+    
+    def lookup_many(self, words: Iterable[str], concurrency: int = 8,
+                    force_lang: Optional[str] = None, offline: bool = False,
+                    translate: bool = False,
+                    ordered: bool = True) -> Iterator[Tuple[str, Optional[dict], Optional[str]]]:
+        """
+        Look up many words, fetching cache misses concurrently.
+        
+        Inputs that normalize to the same cache key are fetched once.
+        Cache hits are resolved up front; misses go to a pool of at most
+        `concurrency` threads. Upstream request rates are bounded per host
+        by the shared HTTP client, so a large batch does not hammer the APIs.
+        
+        Args:
+            words: Words to look up
+            concurrency: Maximum upstream lookups in flight
+            force_lang: Force a specific language code
+            offline: Only use cached results
+            translate: Use translation mode
+            ordered: Yield in input order; otherwise cache hits come first
+                and fetched words follow as they complete
+            
+        Yields:
+            Tuple of (input word, result or None, error message or None)
+            for every input, duplicates included. A failed word is reported
+            with its error and does not stop the batch.
+        """
+        words = list(words)
+        slots, resolved, done, misses = self._plan_batch(words, force_lang, offline, translate)
+        
+        def fetch(key):
+            word, lang, lang_code, normalized, cache_key = resolved[key]
+            try:
+                return self._fetch(word, lang, lang_code, normalized, cache_key,
+                                   translate, raise_errors=True), None
+            except Exception as e:
+                return None, str(e) or type(e).__name__
+        
+        if not misses:
+            for i, key in enumerate(slots):
+                yield (words[i], *done[key])
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency),
+                                      thread_name_prefix="lookup")
+        try:
+            futures = {key: executor.submit(fetch, key) for key in misses}
+            
+            if ordered:
+                for i, key in enumerate(slots):
+                    if key not in done:
+                        done[key] = futures[key].result()
+                    yield (words[i], *done[key])
+                return
+            
+            pending = {}    # key -> input indices still to report
+            for i, key in enumerate(slots):
+                if key in done:
+                    yield (words[i], *done[key])
+                else:
+                    pending.setdefault(key, []).append(i)
+            
+            by_future = {future: key for key, future in futures.items()}
+            for future in as_completed(by_future):
+                key = by_future[future]
+                for i in pending[key]:
+                    yield (words[i], *future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _plan_batch(self, words: list, force_lang: Optional[str],
+                    offline: bool, translate: bool) -> tuple:
+        """
+        Resolve a batch of words against the cache.
+        
+        Returns:
+            Tuple of (slots, resolved, done, misses): the cache key of each
+            input, the _resolve() tuple per distinct key, (result, error)
+            for keys answered from the cache, and keys still to fetch
+        """
+        resolved = {}   # (lang_code, cache_key) -> _resolve() tuple
+        slots = []      # input index -> (lang_code, cache_key)
+        for word in words:
+            info = self._resolve(word, force_lang, translate)
+            key = (info[2], info[4])
+            resolved.setdefault(key, info)
+            slots.append(key)
+        
+        done = {}       # key -> (result, error)
+        misses = []
+        for key, (word, lang, lang_code, normalized, cache_key) in resolved.items():
+            cached, stale = self.cache.get_entry(cache_key, lang_code)
+            if cached:
+                if stale and not offline:
+                    self._schedule_refresh(word, lang_code, translate)
+                done[key] = (cached, None)
+            elif offline:
+                done[key] = (None, None)
+            else:
+                reason = self.cache.get_negative(cache_key, lang_code)
+                if reason == ERROR:
+                    done[key] = (None, "upstream lookup failed recently")
+                elif reason:
+                    done[key] = (None, None)
+                else:
+                    misses.append(key)
+        
+        return slots, resolved, done, misses
+    
+    def _fetch(self, word: str, lang, lang_code: str, normalized: str,
+               cache_key: str, translate: bool, keep_stale: bool = False,
+               raise_errors: bool = False) -> Optional[dict]:
+        """
+        Look up a word upstream and record the outcome in the cache.
+        
+        With keep_stale, misses and failures are not cached, so an
+        existing (stale) entry survives a failed refresh. With
+        raise_errors, LookupFailed propagates after being recorded.
+        """
+        try:
+            result = lang.lookup(normalized, translate=translate)
+        except LookupFailed:
+            if not keep_stale:
+                self.cache.set_negative(cache_key, lang_code, ERROR)
+            if raise_errors:
+                raise
+            return None
+        
+        return self._record(word, lang_code, normalized, cache_key, result, keep_stale)
+    
+    def _record(self, word: str, lang_code: str, normalized: str, cache_key: str,
+                result: Optional[dict], keep_stale: bool) -> Optional[dict]:
+        """Add metadata to an upstream result and cache it (or the miss)."""
         if result:
             # Add metadata
             result["language"] = lang_code
@@ -81,9 +264,110 @@ class Dictionary:
             
             # Cache the result
             self.cache.set(cache_key, lang_code, result)
+            with self._terms_lock:
+                index = self._cached_terms.get(lang_code)
+                if index is not None:
+                    index.add(cache_key.removesuffix(":translate"))
+        elif not keep_stale:
+            self.cache.set_negative(cache_key, lang_code, NOT_FOUND)
         
         return result
     
+    def suggest(self, word: str, force_lang: Optional[str] = None,
+                limit: int = 5) -> List[str]:
+        """
+        "Did you mean" candidates for a word that was not found.
+        
+        Searches each language's local headwords and the words already
+        cached, without network access. Every language sees the input in
+        its normalized form, so Latin input is also tried as
+        transliterated Russian.
+        
+        Returns:
+            Up to `limit` suggestions, nearest first; at equal distance the
+            detected (or forced) language comes first
+        """
+        word = word.strip()
+        if force_lang in self.languages:
+            langs = [self.languages[force_lang]]
+        else:
+            detected = self.detect_language(word)
+            langs = sorted(self.language_list, key=lambda lang: lang.code != detected)
+        
+        scored = {}
+        for rank, lang in enumerate(langs):
+            query = lang.normalize(word)
+            matches = lang.suggestion_index.lookup(query, limit)
+            with self._terms_lock:
+                matches += self._cached_index(lang.code).lookup(query, limit)
+            for term, distance in matches:
+                scored[term] = min(scored.get(term, (distance, rank)), (distance, rank))
+        
+        scored.pop(word.lower(), None)
+        return sorted(scored, key=lambda term: (*scored[term], term))[:limit]
+    
+    def _cached_index(self, lang_code: str):
+        """Suggestion index over a language's cached words (caller holds _terms_lock)."""
+        index = self._cached_terms.get(lang_code)
+        if index is None:
+            from languages.suggest import SuggestionIndex
+            index = SuggestionIndex(
+                key.removesuffix(":translate")
+                for key in self.cache.keys(lang_code, self.SUGGEST_CACHED_KEYS)
+            )
+            self._cached_terms[lang_code] = index
+        return index
+    
+    def refresh(self, word: str, force_lang: Optional[str] = None,
+                translate: bool = False) -> Optional[dict]:
+        """
+        Re-fetch a word upstream, bypassing the cache.
+        
+        The cached copy is replaced only when the upstream returns a
+        result; on failure it is left as it was.
+        
+        Returns:
+            Fresh result or None
+        """
+        word, lang, lang_code, normalized, cache_key = self._resolve(word, force_lang, translate)
+        return self._fetch(word, lang, lang_code, normalized, cache_key,
+                           translate, keep_stale=True)
+    
+    def _schedule_refresh(self, word: str, lang_code: str, translate: bool) -> None:
+        """Refresh a stale entry in the background, at most once at a time per key."""
+        key = (word, lang_code, translate)
+        
+        if self.refresh_command:
+            args = list(self.refresh_command) + ["--refresh", lang_code]
+            if translate:
+                args.append("--translate")
+            args += ["--", word]
+            try:
+                subprocess.Popen(
+                    args,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+            except OSError:
+                pass  # The stale copy is still good
+            return
+        
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def run():
+            try:
+                self.refresh(word, force_lang=lang_code, translate=translate)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=run, name=f"refresh:{word}", daemon=True).start()
+    
     def random_word(self) -> str:
         """Get a random interesting word for learning."""
         interesting_words = [
@@ -97,3 +381,148 @@ class Dictionary:
         ]
         import random
         return random.choice(interesting_words)
+
+
+class AsyncDictionary(Dictionary):
+    """
+    Dictionary for asyncio applications.
+    
+    asyncio is imported by the methods that need it, so the CLI (which
+    only uses the synchronous API) does not pay for loading it.
+    
+    Plugins that implement alookup() natively are awaited directly;
+    sync-only plugins run on a bounded thread pool, so lookups in several
+    languages proceed concurrently on one event loop. Cache reads and
+    writes stay on the loop since they are local and sub-millisecond.
+    The synchronous API inherited from Dictionary keeps working.
+    """
+    
+    def __init__(self, languages: list, cache: Cache, max_workers: int = 8):
+        """
+        Args:
+            languages: Language instances
+            cache: Cache instance
+            max_workers: Threads available to sync-only plugins
+        """
+        super().__init__(languages, cache)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="alookup")
+        self._tasks = set()
+    
+    async def _call_lookup(self, lang, word: str, translate: bool) -> Optional[dict]:
+        """Await a plugin lookup, natively or via the thread pool."""
+        import asyncio
+        
+        if lang.is_async_native():
+            return await lang.alookup(word, translate=translate)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor,
+                                          partial(lang.lookup, word, translate))
+    
+    async def _afetch(self, word: str, lang, lang_code: str, normalized: str,
+                      cache_key: str, translate: bool, keep_stale: bool = False,
+                      raise_errors: bool = False) -> Optional[dict]:
+        """Async counterpart of Dictionary._fetch()."""
+        try:
+            result = await self._call_lookup(lang, normalized, translate)
+        except LookupFailed:
+            if not keep_stale:
+                self.cache.set_negative(cache_key, lang_code, ERROR)
+            if raise_errors:
+                raise
+            return None
+        
+        return self._record(word, lang_code, normalized, cache_key, result, keep_stale)
+    
+    async def alookup(self, word: str, force_lang: Optional[str] = None,
+                      offline: bool = False, translate: bool = False) -> Optional[dict]:
+        """
+        Look up a word in the dictionary without blocking the event loop.
+        
+        Same arguments and cache behaviour as Dictionary.lookup().
+        
+        Returns:
+            Dictionary result or None if not found
+        """
+        word, lang, lang_code, normalized, cache_key = self._resolve(word, force_lang, translate)
+        
+        cached, stale = self.cache.get_entry(cache_key, lang_code)
+        if cached:
+            if stale and not offline:
+                self._schedule_refresh(word, lang_code, translate)
+            return cached
+        
+        if offline or self.cache.get_negative(cache_key, lang_code):
+            return None
+        
+        return await self._afetch(word, lang, lang_code, normalized, cache_key, translate)
+    
+    async def alookup_many(self, words: Iterable[str], concurrency: int = 8,
+                           force_lang: Optional[str] = None, offline: bool = False,
+                           translate: bool = False) -> list:
+        """
+        Look up many words concurrently.
+        
+        Same deduplication and error reporting as Dictionary.lookup_many();
+        at most `concurrency` upstream lookups are in flight.
+        
+        Returns:
+            List of (input word, result or None, error message or None)
+            in input order
+        """
+        import asyncio
+        
+        words = list(words)
+        slots, resolved, done, misses = self._plan_batch(words, force_lang, offline, translate)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def fetch(key):
+            word, lang, lang_code, normalized, cache_key = resolved[key]
+            async with semaphore:
+                try:
+                    return await self._afetch(word, lang, lang_code, normalized,
+                                              cache_key, translate, raise_errors=True), None
+                except Exception as e:
+                    return None, str(e) or type(e).__name__
+        
+        results = await asyncio.gather(*(fetch(key) for key in misses))
+        done.update(zip(misses, results))
+        return [(words[i], *done[key]) for i, key in enumerate(slots)]
+    
+    async def arefresh(self, word: str, force_lang: Optional[str] = None,
+                       translate: bool = False) -> Optional[dict]:
+        """Async counterpart of Dictionary.refresh()."""
+        word, lang, lang_code, normalized, cache_key = self._resolve(word, force_lang, translate)
+        return await self._afetch(word, lang, lang_code, normalized, cache_key,
+                                  translate, keep_stale=True)
+    
+    def _schedule_refresh(self, word: str, lang_code: str, translate: bool) -> None:
+        """Refresh as a task on the running loop; outside a loop, as Dictionary does."""
+        import asyncio
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return super()._schedule_refresh(word, lang_code, translate)
+        
+        key = (word, lang_code, translate)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        async def run():
+            try:
+                await self.arefresh(word, force_lang=lang_code, translate=translate)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        # Keep a reference so the task is not garbage-collected mid-flight
+        task = loop.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def close(self) -> None:
+        """Release the worker threads."""
+        self._executor.shutdown(wait=False)
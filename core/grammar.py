@@ -21,7 +21,12 @@ Russian noun/adjective cases:
 """
 
 import re
-from typing import Optional, Dict, List, Tuple
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Optional, Dict, Iterable, List, Tuple
+
+# Memo statistics, in the shape of functools.lru_cache's cache_info()
+MemoInfo = namedtuple("MemoInfo", "hits misses maxsize currsize")
 
 
 class StressMarker:
@@ -41,6 +46,17 @@ class StressMarker:
     }
     UNSTRESSED_MAP = {v: k for k, v in STRESSED_MAP.items() if k != v}
     
+    # Stress is the combining acute accent (U+0301) after the vowel; there
+    # are no precomposed stressed Cyrillic vowels, so every check below
+    # comes down to finding that one code point
+    ACCENT = '\u0301'
+    VOWEL_RE = re.compile(f'[{VOWELS}]')
+    STRESSED_VOWEL_RE = re.compile(f'[{VOWELS}]\u0301')
+    # Stress position -> pattern matching everything before that vowel
+    _NTH_VOWEL_RE = {}
+    # Joins remove_stress_many() batches; never part of a word
+    SEPARATOR = '\n'
+    
     @classmethod
     def mark_stress(cls, word: str, stress_position: int) -> str:
         """
@@ -56,55 +72,47 @@ class StressMarker:
         if stress_position < 1:
             return word
         
-        vowel_count = 0
-        result = []
-        
-        for char in word:
-            if char in cls.VOWELS:
-                vowel_count += 1
-                if vowel_count == stress_position and char in cls.STRESSED_MAP:
-                    result.append(cls.STRESSED_MAP[char])
-                else:
-                    result.append(char)
-            else:
-                result.append(char)
-        
-        return ''.join(result)
+        pattern = cls._NTH_VOWEL_RE.get(stress_position)
+        if pattern is None:
+            pattern = cls._NTH_VOWEL_RE[stress_position] = re.compile(
+                f'(?:[^{cls.VOWELS}]*[{cls.VOWELS}]){{{stress_position - 1}}}[^{cls.VOWELS}]*'
+            )
+        match = pattern.match(word)
+        if match is None or match.end() == len(word):
+            return word  # Fewer vowels than stress_position
+        i = match.end()
+        return word[:i] + cls.STRESSED_MAP[word[i]] + word[i + 1:]
     
     @classmethod
     def remove_stress(cls, word: str) -> str:
         """Remove all stress marks from a word."""
-        result = []
-        for char in word:
-            # Remove combining acute accent
-            if char == '\u0301':
-                continue
-            # Check for pre-composed stressed characters
-            result.append(cls.UNSTRESSED_MAP.get(char, char))
-        return ''.join(result)
+        return word.replace(cls.ACCENT, '')
+    
+    @classmethod
+    def remove_stress_many(cls, words: Iterable[str]) -> List[str]:
+        """
+        Remove stress marks from a batch of words in one pass over the
+        joined text; same output as remove_stress() on each word.
+        """
+        words = list(words)
+        if not words:
+            return []
+        if any(cls.SEPARATOR in word for word in words):
+            return [cls.remove_stress(word) for word in words]
+        return cls.remove_stress(cls.SEPARATOR.join(words)).split(cls.SEPARATOR)
     
     @classmethod
     def has_stress(cls, word: str) -> bool:
         """Check if word has stress marks."""
-        return '\u0301' in word or any(c in word for c in cls.UNSTRESSED_MAP)
+        return cls.ACCENT in word
     
     @classmethod
     def get_stress_position(cls, word: str) -> Optional[int]:
         """Get the vowel position of stress (1-indexed), or None if unmarked."""
-        vowel_count = 0
-        i = 0
-        while i < len(word):
-            char = word[i]
-            if char in cls.VOWELS:
-                vowel_count += 1
-                # Check for combining accent after this vowel
-                if i + 1 < len(word) and word[i + 1] == '\u0301':
-                    return vowel_count
-                # Check for pre-composed stressed vowel
-                if char in cls.UNSTRESSED_MAP:
-                    return vowel_count
-            i += 1
-        return None
+        match = cls.STRESSED_VOWEL_RE.search(word)
+        if match is None:
+            return None
+        return len(cls.VOWEL_RE.findall(word, 0, match.end()))
 
 
 class VerbConjugator:
@@ -193,9 +201,9 @@ class VerbConjugator:
         if clean.endswith('чь'):
             stem = infinitive[:-2]
             # чь → г or к depending on verb
-            if StressMarker.remove_stress(infinitive) in ('мочь', 'смочь', 'помочь'):
+            if clean in ('мочь', 'смочь', 'помочь'):
                 return stem + 'г'
-            elif StressMarker.remove_stress(infinitive) in ('печь', 'испечь'):
+            elif clean in ('печь', 'испечь'):
                 return stem + 'к'
             return stem + 'г'  # Default to г
         
@@ -571,12 +579,47 @@ class NounDecliner:
 class GrammarEngine:
     """
     Main grammar engine combining all components.
+    
+    Full paradigms are memoized per engine (least recently used first out,
+    CACHE_SIZE entries per part of speech), keyed on the fields that
+    determine them, so repeated lookups of a word cost a dict copy. The
+    memo is a plain dict in recency order, not a functools.lru_cache
+    around a bound method, which would tie the engine into a reference
+    cycle that only the cycle collector frees.
     """
     
-    def __init__(self):
+    CACHE_SIZE = 4096
+    
+    def __init__(self, cache_size: int = CACHE_SIZE):
         self.stress = StressMarker
         self.verbs = VerbConjugator
         self.nouns = NounDecliner
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._memo = {'verbs': OrderedDict(), 'nouns': OrderedDict()}  # oldest first
+        self._counts = {'verbs': [0, 0], 'nouns': [0, 0]}  # [hits, misses]
+    
+    def _memoized(self, part: str, build, key: tuple) -> dict:
+        """The paradigm for key from the memo, built (and kept) on a miss."""
+        memo = self._memo[part]
+        counts = self._counts[part]
+        paradigm = memo.get(key)
+        if paradigm is not None:
+            try:
+                memo.move_to_end(key)
+            except KeyError:
+                pass  # Evicted by another thread in between
+            counts[0] += 1
+            return paradigm
+        
+        counts[1] += 1
+        paradigm = build(key)
+        if self.cache_size > 0:
+            with self._lock:
+                while len(memo) >= self.cache_size:
+                    memo.popitem(last=False)
+                memo[key] = paradigm
+        return paradigm
     
     def get_full_verb_conjugation(self, verb_data: dict) -> dict:
         """
@@ -589,9 +632,17 @@ class GrammarEngine:
         Returns:
             Dictionary with all conjugation forms
         """
-        infinitive = verb_data.get('word', '')
-        aspect = verb_data.get('aspect', 'imperfective')
-        present = verb_data.get('conjugation', {})
+        key = (
+            verb_data.get('word', ''),
+            verb_data.get('aspect', 'imperfective'),
+            tuple((verb_data.get('conjugation') or {}).items()),
+        )
+        return _copy(self._memoized('verbs', self._build_verb_conjugation, key))
+    
+    def _build_verb_conjugation(self, key: tuple) -> dict:
+        """Uncached get_full_verb_conjugation() for a normalized key."""
+        infinitive, aspect, present = key
+        present = dict(present)
         
         result = {
             'infinitive': infinitive,
@@ -602,8 +653,9 @@ class GrammarEngine:
         if 'imperfective' in aspect.lower() and present:
             result['present'] = present
         
-        # Past tense
-        result['past'] = self.verbs.get_past_tense(infinitive)
+        # Past tense (the stem is shared with the participles)
+        past_stem = self.verbs._get_past_stem(infinitive)
+        result['past'] = self.verbs.get_past_tense(infinitive, past_stem)
         
         # Future tense
         result['future'] = self.verbs.get_future_tense(infinitive, aspect, present)
@@ -617,7 +669,7 @@ class GrammarEngine:
         
         # Participles
         result['participles'] = self.verbs.get_participles(
-            infinitive, aspect, present
+            infinitive, aspect, present, past_stem
         )
         
         return result
@@ -632,9 +684,17 @@ class GrammarEngine:
         Returns:
             Dictionary with singular and plural declensions
         """
-        singular = noun_data.get('cases', {})
-        gender = noun_data.get('gender', '')
-        animate = noun_data.get('animate', False)
+        key = (
+            tuple((noun_data.get('cases') or {}).items()),
+            noun_data.get('gender', ''),
+            bool(noun_data.get('animate', False)),
+        )
+        return _copy(self._memoized('nouns', self._build_noun_declension, key))
+    
+    def _build_noun_declension(self, key: tuple) -> dict:
+        """Uncached get_full_noun_declension() for a normalized key."""
+        singular, gender, animate = key
+        singular = dict(singular)
         
         if not singular or not gender:
             return {}
@@ -649,3 +709,57 @@ class GrammarEngine:
             result['plural'] = plural
         
         return result
+    
+    def precompute_all(self, grammar_data: dict) -> dict:
+        """
+        Materialize every paradigm of a lexicon in one pass, warming the
+        memo for later lookups.
+        
+        Args:
+            grammar_data: ru_grammar.json layout, {"verbs": {infinitive:
+                {aspect, present, future, ...}}, "nouns": {nominative:
+                {gender, animate, singular, ...}}}
+        
+        Returns:
+            {"verbs": {infinitive: conjugation}, "nouns": {nominative: declension}}
+        """
+        verbs = {}
+        for infinitive, data in grammar_data.get('verbs', {}).items():
+            aspect = data.get('aspect', 'imperfective')
+            conjugation = data.get('present')
+            if not conjugation and 'imperfective' not in aspect:
+                conjugation = data.get('future')  # Simple future of perfectives
+            verbs[infinitive] = self.get_full_verb_conjugation({
+                'word': data.get('infinitive', infinitive),
+                'aspect': aspect,
+                'conjugation': conjugation,
+            })
+        
+        nouns = {}
+        for nominative, data in grammar_data.get('nouns', {}).items():
+            nouns[nominative] = self.get_full_noun_declension({
+                'cases': data.get('singular'),
+                'gender': data.get('gender', ''),
+                'animate': data.get('animate', False),
+            })
+        
+        return {'verbs': verbs, 'nouns': nouns}
+    
+    def cache_info(self) -> dict:
+        """Memo statistics per part of speech (MemoInfo, as lru_cache reports)."""
+        with self._lock:
+            return {part: MemoInfo(hits, misses, self.cache_size, len(self._memo[part]))
+                    for part, (hits, misses) in self._counts.items()}
+    
+    def cache_clear(self) -> None:
+        """Drop all memoized paradigms and reset the statistics."""
+        with self._lock:
+            for part in self._memo:
+                self._memo[part].clear()
+                self._counts[part] = [0, 0]
+
+
+def _copy(paradigm: dict) -> dict:
+    """Copy of a memoized paradigm, so callers cannot modify the cached one."""
+    return {key: dict(value) if isinstance(value, dict) else value
+            for key, value in paradigm.items()}
@@ -0,0 +1,314 @@
+"""
+Small pooled HTTP client for the dictionary backends.
+
+Built on http.client so connections can be kept alive and reused across
+lookups: a batch of words to the same host pays the TCP and TLS
+handshake once instead of once per word.
+"""
+
+import gzip
+import http.client
+import json
+import random
+import socket
+import ssl
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class HTTPError(Exception):
+    """The server answered with an error status."""
+    
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+
+class NetworkError(Exception):
+    """The request could not be completed (DNS, connect, TLS, timeout...)."""
+    
+    def __init__(self, reason: str, url: str):
+        super().__init__(f"{reason} ({url})")
+        self.reason = reason
+        self.url = url
+
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per second allowed per host, shared by every caller of a client.
+# Both services are free and ask clients to be gentle.
+DEFAULT_RATE_LIMITS = {
+    "api.dictionaryapi.dev": 5,
+    "en.wiktionary.org": 20,
+}
+
+
+class RateLimiter:
+    """
+    Spaces out calls to at most `rate` per second, allowing short bursts.
+    
+    Thread-safe: each caller reserves the next free slot under the lock
+    and sleeps outside it until the slot arrives.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 1.0 / rate
+        self.burst = burst
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            # Unused slots accumulate, but only up to the burst size
+            slot = max(self._next, now - (self.burst - 1) * self.interval)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HTTPClient:
+    """
+    HTTP/1.1 client with per-host keep-alive connection pooling.
+    
+    Thread-safe: each request checks a connection out of the pool for its
+    own exclusive use and returns it once the response is fully read.
+    """
+    
+    def __init__(self, timeout: float = 10, retries: int = 2, backoff: float = 0.5,
+                 max_idle_per_host: int = 4, user_agent: str = "define/2.0",
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 deadline: Optional[float] = 15):
+        """
+        Args:
+            timeout: Socket timeout in seconds (connect and each read)
+            retries: Extra attempts after a network error or retryable status
+            deadline: Total seconds for one get(), retries and backoff
+                included; later attempts get only the time left (None: no cap)
+            backoff: Base delay in seconds; doubles per attempt, with jitter
+            max_idle_per_host: Idle connections kept open per host
+            user_agent: User-Agent header
+            rate_limits: Requests per second by host name; hosts not listed
+                are unlimited. Defaults to DEFAULT_RATE_LIMITS.
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = deadline
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+        self._idle = {}  # (scheme, host, port) -> [connection, ...]
+        self._lock = threading.Lock()
+        self._ssl_context = None
+        if rate_limits is None:
+            rate_limits = DEFAULT_RATE_LIMITS
+        self._limiters = {
+            host: RateLimiter(rate, burst=max(1, int(rate)))
+            for host, rate in rate_limits.items()
+        }
+    
+    def _connect(self, scheme: str, host: str, port: int,
+                 timeout: Optional[float] = None) -> http.client.HTTPConnection:
+        """Open a new connection."""
+        timeout = self.timeout if timeout is None else timeout
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+    
+    def _acquire(self, origin: tuple,
+                 timeout: Optional[float] = None) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Check a connection out of the pool, set to the given socket timeout.
+        
+        Returns:
+            Tuple of (connection, True if it was reused)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            idle = self._idle.get(origin)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._connect(*origin, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+    
+    def _release(self, origin: tuple, conn: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, or close it if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+    
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[str] = None,
+                            until: Optional[float] = None) -> bool:
+        """
+        Exponential backoff with jitter; honours a short Retry-After.
+        
+        Returns:
+            False, without sleeping, if the delay would run past until
+            (a time.monotonic() deadline)
+        """
+        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(int(retry_after), 10))
+        if until is not None and time.monotonic() + delay >= until:
+            return False
+        time.sleep(delay)
+        return True
+    
+    def _send(self, origin: tuple, path: str, headers: dict,
+              timeout: Optional[float] = None) -> Tuple[int, dict, bytes]:
+        """
+        Perform one request on a pooled connection.
+        
+        A reused keep-alive connection may have been closed by the server
+        while idle; that case is retried once on a fresh connection
+        without counting as a failed attempt.
+        """
+        conn, reused = self._acquire(origin, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            conn = self._connect(*origin, timeout)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(origin, conn)
+        
+        response_headers = {k.lower(): v for k, v in response.getheaders()}
+        return response.status, response_headers, body
+    
+    @staticmethod
+    def _decode_body(headers: dict, body: bytes) -> bytes:
+        """Undo Content-Encoding."""
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            return zlib.decompress(body)
+        return body
+    
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        GET a URL and return the (decompressed) body.
+        
+        Failed attempts are retried while the client's deadline allows, so
+        on a network that drops packets a lookup gives up after `deadline`
+        seconds rather than `retries + 1` full timeouts.
+        
+        Raises:
+            HTTPError: Error status (after retries, for retryable ones)
+            NetworkError: The request failed on every attempt
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        origin = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        
+        request_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+        if headers:
+            request_headers.update(headers)
+        
+        limiter = self._limiters.get(parts.hostname)
+        until = time.monotonic() + self.deadline if self.deadline is not None else None
+        
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            if limiter:
+                limiter.acquire()
+            timeout = self.timeout
+            if until is not None:
+                timeout = min(timeout, until - time.monotonic())
+                if timeout <= 0:
+                    raise NetworkError("deadline exceeded", url)
+            try:
+                status, response_headers, body = self._send(origin, path, request_headers, timeout)
+            except (OSError, http.client.HTTPException) as e:
+                # DNS failures mean we are offline; retrying only adds delay
+                if (last or isinstance(e, socket.gaierror)
+                        or not self._sleep_before_retry(attempt, until=until)):
+                    raise NetworkError(str(getattr(e, "reason", None) or e), url) from e
+                continue
+            
+            if (status in RETRY_STATUSES and not last
+                    and self._sleep_before_retry(attempt, response_headers.get("retry-after"),
+                                                 until)):
+                continue
+            if status >= 400:
+                raise HTTPError(status, url)
+            
+            try:
+                return self._decode_body(response_headers, body)
+            except (OSError, EOFError, zlib.error) as e:
+                raise NetworkError(f"Bad {response_headers.get('content-encoding')} body", url) from e
+        
+        raise NetworkError("retries exhausted", url)  # not reached
+    
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        GET a URL and parse the body as JSON.
+        
+        Raises:
+            HTTPError, NetworkError: See get()
+            ValueError: The body is not valid JSON
+        """
+        return json.loads(self.get(url, headers).decode("utf-8"))
+    
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """Process-wide client shared by all language backends."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient()
+        return _shared_client
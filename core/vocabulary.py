@@ -1,13 +1,27 @@
 """
 Vocabulary management for learning features with SM-2 Spaced Repetition.
+
+Storage is pluggable. The default store is a SQLite database
+(vocabulary.db) with one row per (word, language) and an index on the
+next review date; the original vocabulary.json list is still available as
+JSONStore. Cards the Bash version adds to vocabulary.json are imported
+into the database; with the "sqlite+json" backend, cards saved here are
+also appended to the file (a rewrite per save). JournalStore
+keeps vocabulary.json but appends changes to a journal next to it,
+folding them back into the file once the journal grows.
 """
 
+import heapq
 import json
+import os
 import random
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict
-import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 
 class SM2:
@@ -67,14 +81,183 @@ class SM2:
         return new_repetitions, new_easiness, new_interval
 
 
-class Vocabulary:
-    """Manage saved vocabulary for learning with spaced repetition."""
+# Entries are dicts with these keys (the vocabulary.json layout); the
+# SM-2 defaults apply to entries written before SM-2 was added
+SM2_DEFAULTS = {"sm2_easiness": 2.5, "sm2_interval": 0, "sm2_repetitions": 0}
+MASTERED_INTERVAL = 21  # days
+
+
+def migrate_entry(entry: dict, now: Optional[datetime] = None) -> dict:
+    """Add missing SM-2 fields to an entry (in place); new cards are due now."""
+    if "sm2_easiness" not in entry:
+        entry.update(SM2_DEFAULTS)
+        entry["nextReview"] = (now or datetime.now()).isoformat()
+    return entry
+
+
+def review_entry(entry: dict, quality: int, now: Optional[datetime] = None) -> dict:
+    """Apply one SM-2 rating to an entry (in place) and reschedule it."""
+    new_reps, new_ease, new_interval = SM2.calculate(
+        quality,
+        entry["sm2_repetitions"],
+        entry["sm2_easiness"],
+        entry["sm2_interval"]
+    )
     
-    def __init__(self, vocab_file: Optional[Path] = None):
-        if vocab_file is None:
-            xdg_data = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local/share"))
-            vocab_file = xdg_data / "define" / "vocabulary.json"
+    entry["sm2_repetitions"] = new_reps
+    entry["sm2_easiness"] = new_ease
+    entry["sm2_interval"] = new_interval
+    
+    # Calculate next review date
+    next_review = (now or datetime.now()) + timedelta(days=new_interval)
+    entry["nextReview"] = next_review.isoformat()
+    
+    # Update legacy counters
+    entry["timesReviewed"] = entry.get("timesReviewed", 0) + 1
+    if quality >= 3:
+        entry["correctCount"] = entry.get("correctCount", 0) + 1
+    return entry
+
+
+class VocabularyStore(ABC):
+    """
+    Abstract storage for vocabulary entries.
+    
+    Entries are identified by (word, language). Lookups by word alone
+    return the first entry saved under that word, in any language.
+    """
+    
+    @abstractmethod
+    def get(self, word: str, language: Optional[str] = None) -> Optional[dict]:
+        """Fetch an entry, or None."""
+        pass
+    
+    @abstractmethod
+    def add(self, entry: dict) -> bool:
+        """
+        Store a new entry.
+        
+        Returns:
+            False if an entry with the same (word, language) exists
+        """
+        pass
+    
+    @abstractmethod
+    def modify(self, word: str, language: Optional[str],
+               change: Callable[[dict], None]) -> Optional[dict]:
+        """
+        Apply change to an entry in one transaction.
+        
+        Returns:
+            The changed entry, or None if there is no such entry
+        """
+        pass
+    
+    @abstractmethod
+    def entries(self) -> Iterator[dict]:
+        """Iterate over every entry, in the order saved."""
+        pass
+    
+    @abstractmethod
+    def due(self, now: str) -> List[dict]:
+        """Entries with nextReview <= now (ISO format), oldest first."""
+        pass
+    
+    def update_many(self, entries: List[dict]) -> int:
+        """
+        Write back changed entries (matched by word and language).
+        
+        Returns:
+            Number of entries found and updated
+        """
+        updated = 0
+        for entry in entries:
+            updated += self.modify(entry["word"], entry.get("language", "en"),
+                                   lambda stored: stored.update(entry)) is not None
+        return updated
+    
+    def count(self) -> int:
+        """Number of entries."""
+        return sum(1 for _ in self.entries())
+    
+    def schedule(self) -> Iterator[tuple]:
+        """(repetitions, easiness, interval, nextReview) of every entry."""
+        return ((e["sm2_repetitions"], e["sm2_easiness"], e["sm2_interval"], e["nextReview"])
+                for e in self.entries())
+    
+    def sample(self, n: int) -> List[dict]:
+        """Up to n distinct entries chosen at random."""
+        vocab = list(self.entries())
+        return random.sample(vocab, min(n, len(vocab)))
+    
+    def stats(self, now: str) -> dict:
+        """Counts of total, due, new, learning and mastered entries."""
+        return self._tally(self.entries(), now)
+    
+    @staticmethod
+    def _tally(entries: Iterable[dict], now: str) -> dict:
+        """stats() from scratch, in one pass over the entries."""
+        stats = {"total": 0, "due": 0, "mastered": 0, "learning": 0, "new": 0}
+        for entry in entries:
+            stats["total"] += 1
+            if entry["nextReview"] <= now:
+                stats["due"] += 1
+            interval = entry["sm2_interval"]
+            if interval == 0:
+                stats["new"] += 1
+            elif interval >= MASTERED_INTERVAL:
+                stats["mastered"] += 1
+            else:
+                stats["learning"] += 1
+        return stats
+    
+    def recount(self) -> bool:
+        """
+        Rebuild any counters the store keeps for stats() from the entries.
         
+        Returns:
+            True if the counters were already correct
+        """
+        return True
+    
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        pass
+
+
+def read_json_vocabulary(vocab_file: Path) -> list:
+    """Entries of a vocabulary.json file ([] if missing or invalid)."""
+    try:
+        vocab = json.loads(Path(vocab_file).read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, IOError):
+        return []
+    return vocab if isinstance(vocab, list) else []
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace path with text through a temporary file and a rename."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class JSONStore(VocabularyStore):
+    """
+    The whole vocabulary as one JSON list (vocabulary.json), read and
+    rewritten on every operation. Shared with the Bash version.
+    """
+    
+    def __init__(self, vocab_file: Path):
         self.vocab_file = Path(vocab_file)
         self.vocab_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -83,26 +266,814 @@ class Vocabulary:
     
     def _load(self) -> list:
         """Load vocabulary from file."""
-        try:
-            return json.loads(self.vocab_file.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, IOError):
-            return []
+        return read_json_vocabulary(self.vocab_file)
     
     def _save_vocab(self, vocab: list) -> None:
-        """Save vocabulary to file."""
-        self.vocab_file.write_text(
-            json.dumps(vocab, ensure_ascii=False, indent=2),
-            encoding="utf-8"
+        """Save vocabulary to file (atomically: a crash leaves the old file)."""
+        write_atomic(self.vocab_file, json.dumps(vocab, ensure_ascii=False, indent=2))
+    
+    @staticmethod
+    def _matches(entry: dict, word: str, language: Optional[str]) -> bool:
+        return entry.get("word") == word and language in (None, entry.get("language", "en"))
+    
+    def get(self, word: str, language: Optional[str] = None) -> Optional[dict]:
+        for entry in self._load():
+            if self._matches(entry, word, language):
+                return migrate_entry(entry)
+        return None
+    
+    def add(self, entry: dict) -> bool:
+        vocab = self._load()
+        if any(self._matches(e, entry["word"], entry["language"]) for e in vocab):
+            return False
+        vocab.append(entry)
+        self._save_vocab(vocab)
+        return True
+    
+    def modify(self, word: str, language: Optional[str],
+               change: Callable[[dict], None]) -> Optional[dict]:
+        vocab = self._load()
+        for entry in vocab:
+            if self._matches(entry, word, language):
+                change(migrate_entry(entry))
+                self._save_vocab(vocab)
+                return entry
+        return None
+    
+    def update_many(self, entries: List[dict]) -> int:
+        changes = {(e["word"], e.get("language", "en")): e for e in entries}
+        vocab = self._load()
+        updated = 0
+        for entry in vocab:
+            change = changes.pop((entry.get("word"), entry.get("language", "en")), None)
+            if change is not None:
+                entry.update(change)
+                updated += 1
+        if updated:
+            self._save_vocab(vocab)
+        return updated
+    
+    def entries(self) -> Iterator[dict]:
+        now = datetime.now()
+        return (migrate_entry(entry, now) for entry in self._load())
+    
+    def due(self, now: str) -> List[dict]:
+        due = [entry for entry in self.entries() if entry["nextReview"] <= now]
+        due.sort(key=lambda x: x["nextReview"])
+        return due
+
+
+class JournalStore(JSONStore):
+    """
+    vocabulary.json plus an append-only journal (vocabulary.journal).
+    
+    Saves and ratings append one JSON line to the journal instead of
+    rewriting the list. The journal is replayed on load, and once it grows
+    past compact_bytes it is folded into vocabulary.json (written to a
+    temporary file and renamed over it) and emptied.
+    
+    Records carry the card's new state rather than the rating, so
+    replaying a record twice (a crash between the rename and emptying the
+    journal) is harmless. A last line without its newline (torn by a crash,
+    or still being appended by another process) is left alone until it is
+    complete, and a corrupt complete line is skipped. Records appended by
+    other processes are picked up before every operation; compaction
+    assumes one writer at a time.
+    """
+    
+    JOURNAL_SUFFIX = ".journal"
+    COMPACT_BYTES = 1024 * 1024
+    
+    # Records (one JSON array per line):
+    #   ["add", entry]                        a new card
+    #   ["review", word, language, *REVIEW]   the card after a rating
+    #   ["put", entry]                        any other change
+    REVIEW_FIELDS = ("timesReviewed", "correctCount", "sm2_easiness",
+                     "sm2_interval", "sm2_repetitions", "nextReview")
+    
+    def __init__(self, vocab_file: Path, compact_bytes: int = COMPACT_BYTES):
+        super().__init__(vocab_file)
+        self.journal_file = self.vocab_file.with_name(self.vocab_file.stem + self.JOURNAL_SUFFIX)
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        with self._lock:
+            self._reload()
+    
+    @staticmethod
+    def _stamp(path: Path) -> Optional[tuple]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+    
+    def _reload(self) -> None:
+        """Read vocabulary.json and the whole journal; the lock must be held."""
+        self._base_stamp = self._stamp(self.vocab_file)
+        now = datetime.now()
+        self._vocab = []
+        self._index = {}
+        self._first = {}  # word -> first entry saved under it
+        for entry in self._load():
+            if isinstance(entry, dict) and entry.get("word"):
+                self._insert(migrate_entry(entry, now))
+        self._offset = 0
+        self._replay()
+    
+    def _refresh(self) -> None:
+        """Catch up with changes made by other processes; the lock must be held."""
+        # Another process compacted: vocabulary.json replaced, journal emptied
+        if (self._stamp(self.vocab_file) != self._base_stamp
+                or self.journal_size() < self._offset):
+            self._reload()
+        else:
+            self._replay()
+    
+    def _replay(self) -> None:
+        """Apply journal records past the offset; the lock must be held."""
+        try:
+            with open(self.journal_file, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Not complete yet: read it again next time
+            self._offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, TypeError, IndexError, KeyError):
+                continue  # Corrupt record: keep the ones after it
+    
+    def _apply(self, record: list) -> None:
+        op = record[0]
+        if op == "add":
+            entry = record[1]
+            if self._key(entry) not in self._index:
+                self._insert(entry)
+        elif op == "review":
+            entry = self._index.get((record[1], record[2]))
+            if entry is not None:
+                entry.update(zip(self.REVIEW_FIELDS, record[3:]))
+        elif op == "put":
+            entry = self._index.get(self._key(record[1]))
+            if entry is not None:
+                entry.clear()
+                entry.update(record[1])
+        else:
+            raise ValueError(f"Unknown journal record: {op!r}")
+    
+    @staticmethod
+    def _key(entry: dict) -> tuple:
+        return entry["word"], entry.get("language", "en")
+    
+    def _insert(self, entry: dict) -> None:
+        if self._key(entry) not in self._index:
+            self._index[self._key(entry)] = entry
+            self._first.setdefault(entry["word"], entry)
+            self._vocab.append(entry)
+    
+    def _find(self, word: str, language: Optional[str]) -> Optional[dict]:
+        if language is not None:
+            return self._index.get((word, language))
+        return self._first.get(word)
+    
+    def _append(self, *records: list) -> None:
+        """Append records, apply them and compact if due; the lock must be held."""
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        # End a torn last line first, so it is skipped rather than merged
+        # with ours (a blank line if it was another process's append)
+        if self.journal_size() > self._offset:
+            lines = "\n" + lines
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        self._replay()
+        if size >= self.compact_bytes:
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Fold the journal into vocabulary.json; the lock must be held."""
+        self._save_vocab(self._vocab)
+        self._base_stamp = self._stamp(self.vocab_file)
+        with open(self.journal_file, "w"):
+            pass
+        self._offset = 0
+    
+    def _change_record(self, entry: dict, updated: dict) -> list:
+        """The record turning entry into updated: "review" if only review fields changed."""
+        if self._key(updated) != self._key(entry):
+            raise ValueError("Changes cannot alter the word or language")
+        unchanged = {k: v for k, v in updated.items() if k not in self.REVIEW_FIELDS}
+        if unchanged == {k: v for k, v in entry.items() if k not in self.REVIEW_FIELDS}:
+            return ["review", *self._key(updated),
+                    *(updated.get(field) for field in self.REVIEW_FIELDS)]
+        return ["put", updated]
+    
+    def compact(self) -> None:
+        """Fold the journal into vocabulary.json now."""
+        with self._lock:
+            self._refresh()
+            self._compact()
+    
+    def journal_size(self) -> int:
+        """Bytes of journal not yet folded into vocabulary.json."""
+        stamp = self._stamp(self.journal_file)
+        return stamp[1] if stamp else 0
+    
+    def get(self, word: str, language: Optional[str] = None) -> Optional[dict]:
+        with self._lock:
+            self._refresh()
+            entry = self._find(word, language)
+            return dict(entry) if entry else None
+    
+    def add(self, entry: dict) -> bool:
+        with self._lock:
+            self._refresh()
+            entry = migrate_entry(dict(entry))
+            entry.setdefault("language", "en")
+            if self._key(entry) in self._index:
+                return False
+            self._append(["add", entry])
+            return True
+    
+    def modify(self, word: str, language: Optional[str],
+               change: Callable[[dict], None]) -> Optional[dict]:
+        with self._lock:
+            self._refresh()
+            entry = self._find(word, language)
+            if entry is None:
+                return None
+            updated = dict(entry)
+            change(updated)
+            self._append(self._change_record(entry, updated))
+            return dict(updated)
+    
+    def update_many(self, entries: List[dict]) -> int:
+        with self._lock:
+            self._refresh()
+            records = []
+            for change in entries:
+                entry = self._index.get((change["word"], change.get("language", "en")))
+                if entry is not None:
+                    records.append(self._change_record(entry, {**entry, **change}))
+            if records:
+                self._append(*records)
+            return len(records)
+    
+    def entries(self) -> Iterator[dict]:
+        with self._lock:
+            self._refresh()
+            return iter([dict(entry) for entry in self._vocab])
+    
+    def due(self, now: str) -> List[dict]:
+        with self._lock:
+            self._refresh()
+            due = [dict(entry) for entry in self._vocab if entry["nextReview"] <= now]
+        due.sort(key=lambda x: x["nextReview"])
+        return due
+    
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._vocab)
+    
+    def stats(self, now: str) -> dict:
+        # The deck is in memory: scan it without copying every entry
+        with self._lock:
+            self._refresh()
+            return self._tally(self._vocab, now)
+
+
+class SQLiteStore(VocabularyStore):
+    """
+    Single-file SQLite store (WAL mode).
+    
+    One row per card, unique on (word, language), with an index on
+    next_review so due cards and counts come from index range scans.
+    Updates run in IMMEDIATE transactions, so concurrent sessions never
+    lose a review.
+    
+    Triggers keep the stats() counters: card totals by SM-2 state, and
+    the number of cards due on each day, so the due count only scans
+    today's cards.
+    """
+    
+    SCHEMA_VERSION = 2
+    
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS cards (
+            id              INTEGER PRIMARY KEY,
+            word            TEXT NOT NULL,
+            language        TEXT NOT NULL,
+            original        TEXT NOT NULL DEFAULT '',
+            definition      TEXT NOT NULL DEFAULT '',
+            part_of_speech  TEXT NOT NULL DEFAULT '',
+            phonetic        TEXT NOT NULL DEFAULT '',
+            date_added      TEXT NOT NULL DEFAULT '',
+            times_reviewed  INTEGER NOT NULL DEFAULT 0,
+            correct_count   INTEGER NOT NULL DEFAULT 0,
+            easiness        REAL NOT NULL DEFAULT 2.5,
+            interval        INTEGER NOT NULL DEFAULT 0,
+            repetitions     INTEGER NOT NULL DEFAULT 0,
+            next_review     TEXT NOT NULL,
+            extra           TEXT
+        )""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS cards_word ON cards (word, language)",
+        "CREATE INDEX IF NOT EXISTS cards_due ON cards (next_review)",
+        """CREATE TABLE IF NOT EXISTS meta (
+            name   TEXT PRIMARY KEY,
+            value  TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS totals (
+            id        INTEGER PRIMARY KEY CHECK (id = 1),
+            cards     INTEGER NOT NULL,
+            new       INTEGER NOT NULL,
+            mastered  INTEGER NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS due_days (
+            day    TEXT PRIMARY KEY,
+            cards  INTEGER NOT NULL
+        ) WITHOUT ROWID""",
+        f"""CREATE TRIGGER IF NOT EXISTS cards_insert AFTER INSERT ON cards BEGIN
+            UPDATE totals SET cards = cards + 1, new = new + (NEW.interval = 0),
+                mastered = mastered + (NEW.interval >= {MASTERED_INTERVAL}) WHERE id = 1;
+            INSERT INTO due_days (day, cards) VALUES (substr(NEW.next_review, 1, 10), 1)
+                ON CONFLICT (day) DO UPDATE SET cards = cards + 1;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS cards_delete AFTER DELETE ON cards BEGIN
+            UPDATE totals SET cards = cards - 1, new = new - (OLD.interval = 0),
+                mastered = mastered - (OLD.interval >= {MASTERED_INTERVAL}) WHERE id = 1;
+            UPDATE due_days SET cards = cards - 1 WHERE day = substr(OLD.next_review, 1, 10);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS cards_interval AFTER UPDATE OF interval ON cards BEGIN
+            UPDATE totals SET new = new - (OLD.interval = 0) + (NEW.interval = 0),
+                mastered = mastered - (OLD.interval >= {MASTERED_INTERVAL})
+                    + (NEW.interval >= {MASTERED_INTERVAL}) WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS cards_reschedule AFTER UPDATE OF next_review ON cards BEGIN
+            UPDATE due_days SET cards = cards - 1 WHERE day = substr(OLD.next_review, 1, 10);
+            INSERT INTO due_days (day, cards) VALUES (substr(NEW.next_review, 1, 10), 1)
+                ON CONFLICT (day) DO UPDATE SET cards = cards + 1;
+        END""",
+    )
+    
+    # Rebuild the stats counters from the cards table
+    RECOUNT = (
+        "DELETE FROM due_days",
+        "INSERT INTO due_days (day, cards) "
+        "SELECT substr(next_review, 1, 10), COUNT(*) FROM cards GROUP BY 1",
+        "INSERT OR REPLACE INTO totals (id, cards, new, mastered) "
+        "SELECT 1, COUNT(*), COALESCE(SUM(interval = 0), 0), "
+        f"COALESCE(SUM(interval >= {MASTERED_INTERVAL}), 0) FROM cards",
+    )
+    
+    # Entry key -> column, in table order
+    COLUMNS = {
+        "word": "word",
+        "language": "language",
+        "original": "original",
+        "definition": "definition",
+        "partOfSpeech": "part_of_speech",
+        "phonetic": "phonetic",
+        "dateAdded": "date_added",
+        "timesReviewed": "times_reviewed",
+        "correctCount": "correct_count",
+        "sm2_easiness": "easiness",
+        "sm2_interval": "interval",
+        "sm2_repetitions": "repetitions",
+        "nextReview": "next_review",
+    }
+    # Defaults for keys missing from old entries (other columns: "")
+    DEFAULTS = {"timesReviewed": 0, "correctCount": 0, **SM2_DEFAULTS}
+    
+    SELECT = f"SELECT {', '.join(COLUMNS.values())}, extra FROM cards"
+    INSERT = (f"INSERT OR IGNORE INTO cards ({', '.join(COLUMNS.values())}, extra) "
+              f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})")
+    UPDATE = (f"UPDATE cards SET {', '.join(f'{c} = ?' for c in COLUMNS.values())}, "
+              f"extra = ? WHERE id = ?")
+    
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by every thread, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=5,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._upgrade()
+    
+    def _upgrade(self) -> None:
+        """Create the schema, adding the stats counters to version 1 databases."""
+        conn = self._conn
+        if conn.execute("PRAGMA user_version").fetchone()[0] == self.SCHEMA_VERSION:
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in self.SCHEMA + self.RECOUNT:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @classmethod
+    def _row(cls, entry: dict) -> tuple:
+        """Column values of an entry; unknown keys are kept as JSON in extra."""
+        entry = migrate_entry(dict(entry))
+        entry.setdefault("language", "en")
+        extra = {k: v for k, v in entry.items() if k not in cls.COLUMNS}
+        values = [entry.get(key) for key in cls.COLUMNS]
+        values = [cls.DEFAULTS.get(key, "") if value is None else value
+                  for key, value in zip(cls.COLUMNS, values)]
+        return (*values, json.dumps(extra, ensure_ascii=False) if extra else None)
+    
+    @classmethod
+    def _entry(cls, row: tuple) -> dict:
+        entry = dict(zip(cls.COLUMNS, row))
+        if row[-1]:
+            entry.update(json.loads(row[-1]))
+        return entry
+    
+    def _find(self, word: str, language: Optional[str]) -> Optional[tuple]:
+        """(id, row) of an entry; the lock must be held."""
+        if language is None:
+            query = self.SELECT.replace("SELECT ", "SELECT id, ", 1) + \
+                " WHERE word = ? ORDER BY id LIMIT 1"
+            row = self._conn.execute(query, (word,)).fetchone()
+        else:
+            query = self.SELECT.replace("SELECT ", "SELECT id, ", 1) + \
+                " WHERE word = ? AND language = ?"
+            row = self._conn.execute(query, (word, language)).fetchone()
+        return (row[0], row[1:]) if row else None
+    
+    def get(self, word: str, language: Optional[str] = None) -> Optional[dict]:
+        with self._lock:
+            found = self._find(word, language)
+        return self._entry(found[1]) if found else None
+    
+    def add(self, entry: dict) -> bool:
+        with self._lock:
+            return self._conn.execute(self.INSERT, self._row(entry)).rowcount == 1
+    
+    def add_many(self, entries: Iterator[dict]) -> int:
+        """Insert entries in one transaction, skipping duplicates; returns the number added."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                added = self._conn.executemany(self.INSERT, (self._row(e) for e in entries)).rowcount
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return added
+    
+    def modify(self, word: str, language: Optional[str],
+               change: Callable[[dict], None]) -> Optional[dict]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                found = self._find(word, language)
+                if found is None:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                card_id, row = found
+                entry = self._entry(row)
+                change(entry)
+                self._conn.execute(self.UPDATE, (*self._row(entry), card_id))
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return entry
+    
+    def update_many(self, entries: List[dict]) -> int:
+        update = self.UPDATE.replace("WHERE id = ?", "WHERE word = ? AND language = ?")
+        rows = []
+        for entry in entries:
+            entry = dict(entry, language=entry.get("language", "en"))
+            rows.append((*self._row(entry), entry["word"], entry["language"]))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = self._conn.executemany(update, rows).rowcount
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return updated
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._entry(row) for row in rows]
+    
+    CHUNK_SIZE = 1000
+    
+    def entries(self) -> Iterator[dict]:
+        # Streamed in id order, one chunk per query, so a large deck is never
+        # held in memory and the lock is released between chunks
+        query = self.SELECT.replace("SELECT ", "SELECT id, ", 1) + " WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, (last_id, self.CHUNK_SIZE)).fetchall()
+            for row in rows:
+                yield self._entry(row[1:])
+            if len(rows) < self.CHUNK_SIZE:
+                return
+            last_id = rows[-1][0]
+    
+    def due(self, now: str) -> List[dict]:
+        return self._query(f"{self.SELECT} WHERE next_review <= ? ORDER BY next_review", (now,))
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+    
+    def schedule(self) -> Iterator[tuple]:
+        with self._lock:
+            return iter(self._conn.execute(
+                "SELECT repetitions, easiness, interval, next_review FROM cards"
+            ).fetchall())
+    
+    def sample(self, n: int) -> List[dict]:
+        return self._query(f"{self.SELECT} ORDER BY RANDOM() LIMIT ?", (n,))
+    
+    def stats(self, now: str) -> dict:
+        today = now[:10]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cards, new, mastered FROM totals WHERE id = 1"
+            ).fetchone()
+            before_today = self._conn.execute(
+                "SELECT COALESCE(SUM(cards), 0) FROM due_days WHERE day < ?", (today,)
+            ).fetchone()[0]
+            due_today = self._conn.execute(
+                "SELECT COUNT(*) FROM cards WHERE next_review >= ? AND next_review <= ?",
+                (today, now)
+            ).fetchone()[0]
+        total, new, mastered = row if row else (0, 0, 0)
+        return {
+            "total": total,
+            "due": before_today + due_today,
+            "mastered": mastered,
+            "learning": total - new - mastered,
+            "new": new
+        }
+    
+    def _counters(self) -> tuple:
+        """Current counter tables; the lock must be held."""
+        return (
+            self._conn.execute("SELECT cards, new, mastered FROM totals WHERE id = 1").fetchone(),
+            self._conn.execute("SELECT day, cards FROM due_days WHERE cards != 0 ORDER BY day").fetchall(),
         )
     
+    def recount(self) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._counters()
+                for statement in self.RECOUNT:
+                    self._conn.execute(statement)
+                after = self._counters()
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return before == after
+    
+    def get_meta(self, name: str) -> Optional[str]:
+        """Read a bookkeeping value."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, name: str, value: str) -> None:
+        """Write a bookkeeping value."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                (name, value)
+            )
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_vocabulary(vocab_file: Path, store: SQLiteStore) -> int:
+    """
+    Import a vocabulary.json list into a SQLite store.
+    
+    The file is left in place (the Bash version still reads it). Cards
+    already in the store, and later duplicates of a (word, language) pair,
+    are skipped, as save() would.
+    
+    Returns:
+        Number of entries imported
+    """
+    now = datetime.now()
+    return store.add_many(
+        migrate_entry(entry, now) for entry in read_json_vocabulary(vocab_file)
+        if isinstance(entry, dict) and entry.get("word")
+    )
+
+
+class StudyQueue:
+    """
+    The cards of one study session, on a min-heap of due times (epoch seconds).
+    
+    Due cards are read from the store once. A rating updates the card in
+    memory; changed cards are written back in batches of flush_every (and
+    on flush()), so a session costs one store write per batch instead of
+    one per card.
+    
+    A failed card (quality < 3) gets its SM-2 reschedule and is also put
+    back in the queue to be seen again this session, after each of
+    learning_steps (seconds). Re-reviews only move a card through the
+    steps: passing advances it, failing restarts them, and passing the
+    last step drops it from the session. They do not touch SM-2 again.
+    """
+    
+    LEARNING_STEPS = (60, 600)
+    LEARN_AHEAD = 20 * 60  # show learning cards early rather than end the session
+    FLUSH_EVERY = 10
+    
+    def __init__(self, store: VocabularyStore,
+                 learning_steps: tuple = LEARNING_STEPS,
+                 learn_ahead: float = LEARN_AHEAD,
+                 flush_every: int = FLUSH_EVERY,
+                 clock: Callable[[], float] = time.time):
+        self.store = store
+        self.learning_steps = learning_steps
+        self.learn_ahead = learn_ahead
+        self.flush_every = flush_every
+        self.clock = clock
+        
+        now = self.clock()
+        self._heap = []
+        self._steps = {}  # (word, language) -> next learning step of a failed card
+        self._dirty = {}  # (word, language) -> entry not yet written back
+        self._seq = 0     # heap tie-breaker: equal due times keep load order
+        for entry in store.due(datetime.fromtimestamp(now).isoformat()):
+            self._push(datetime.fromisoformat(entry["nextReview"]).timestamp(), entry)
+        heapq.heapify(self._heap)
+    
+    @staticmethod
+    def _key(entry: dict) -> tuple:
+        return entry["word"], entry.get("language", "en")
+    
+    def _push(self, due: float, entry: dict) -> None:
+        self._heap.append((due, self._seq, entry))
+        self._seq += 1
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def pop(self) -> Optional[dict]:
+        """
+        The next card to show, or None when the session is over.
+        
+        Cards come in due order. Learning cards due within learn_ahead are
+        shown early when nothing else is due.
+        """
+        if not self._heap or self._heap[0][0] > self.clock() + self.learn_ahead:
+            return None
+        return heapq.heappop(self._heap)[2]
+    
+    def rate(self, entry: dict, quality: int) -> Optional[float]:
+        """
+        Record a rating for a card returned by pop().
+        
+        Returns:
+            Seconds until the card comes back this session, or None if it
+            is done for the session
+        """
+        key = self._key(entry)
+        step = self._steps.get(key)
+        if step is None:
+            review_entry(entry, quality)
+            self._dirty[key] = entry
+            if len(self._dirty) >= self.flush_every:
+                self.flush()
+            if quality >= 3 or not self.learning_steps:
+                return None
+            step = 0
+        elif quality < 3:
+            step = 0
+        elif step + 1 < len(self.learning_steps):
+            step += 1
+        else:
+            del self._steps[key]
+            return None
+        
+        self._steps[key] = step
+        delay = self.learning_steps[step]
+        heapq.heappush(self._heap, (self.clock() + delay, self._seq, entry))
+        self._seq += 1
+        return delay
+    
+    def flush(self) -> int:
+        """Write changed cards back to the store; returns how many were written."""
+        if not self._dirty:
+            return 0
+        written = self.store.update_many(list(self._dirty.values()))
+        self._dirty.clear()
+        return written
+
+
+class Vocabulary:
+    """Manage saved vocabulary for learning with spaced repetition."""
+    
+    DB_NAME = "vocabulary.db"
+    BACKEND_ENV = "DEFINE_VOCAB_BACKEND"
+    
+    def __init__(self, vocab_file: Optional[Path] = None,
+                 backend: Union[str, VocabularyStore, None] = None):
+        """
+        Args:
+            vocab_file: vocabulary.json path; the SQLite database lives
+                next to it (default: $XDG_DATA_HOME/define/)
+            backend: "sqlite", "sqlite+json", "json", "journal" or a
+                VocabularyStore (default: $DEFINE_VOCAB_BACKEND, else "sqlite")
+        """
+        if vocab_file is None:
+            xdg_data = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local/share"))
+            vocab_file = xdg_data / "define" / "vocabulary.json"
+        if backend is None:
+            backend = os.environ.get(self.BACKEND_ENV) or "sqlite"
+        
+        self.vocab_file = Path(vocab_file)
+        # The Bash version only knows vocabulary.json: import its cards, and
+        # on request write ours back (which costs a rewrite of the file)
+        self._reads_json = backend in ("sqlite", "sqlite+json")
+        self._writes_json = backend == "sqlite+json"
+        
+        if self._reads_json:
+            backend = SQLiteStore(self.vocab_file.with_name(self.DB_NAME))
+        elif backend == "json":
+            backend = JSONStore(self.vocab_file)
+        elif backend == "journal":
+            backend = JournalStore(self.vocab_file)
+        elif not isinstance(backend, VocabularyStore):
+            raise ValueError(f"Unknown vocabulary backend: {backend!r}")
+        
+        self.store = backend
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """
+        Pick up cards added to vocabulary.json by the Bash version since
+        this Vocabulary was opened (the SQLite store only; the others read
+        the file on every operation). Cheap when the file is unchanged.
+        """
+        if self._reads_json:
+            self._import_json()
+    
+    def _json_stamp(self) -> Optional[str]:
+        try:
+            st = self.vocab_file.stat()
+        except OSError:
+            return None
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    
+    def _import_json(self) -> None:
+        """Import cards added to vocabulary.json since it was last seen."""
+        stamp = self._json_stamp()
+        if stamp is not None and stamp != self.store.get_meta("json_stamp"):
+            migrate_json_vocabulary(self.vocab_file, self.store)
+            self.store.set_meta("json_stamp", stamp)
+    
+    def _export_json(self, entry: dict) -> None:
+        """Append a newly saved card to vocabulary.json."""
+        vocab = read_json_vocabulary(self.vocab_file)
+        if not any(JSONStore._matches(e, entry["word"], entry["language"]) for e in vocab):
+            vocab.append(entry)
+            write_atomic(self.vocab_file, json.dumps(vocab, ensure_ascii=False, indent=2))
+        self.store.set_meta("json_stamp", self._json_stamp())
+    
+    def _load(self) -> list:
+        """All entries, in the order saved."""
+        return list(self.store.entries())
+    
     def _migrate_entry(self, entry: dict) -> dict:
         """Migrate old entry format to SM-2 format."""
-        if "sm2_easiness" not in entry:
-            entry["sm2_easiness"] = 2.5
-            entry["sm2_interval"] = 0
-            entry["sm2_repetitions"] = 0
-            entry["nextReview"] = datetime.now().isoformat()
-        return entry
+        return migrate_entry(entry)
     
     def save(self, result: dict) -> None:
         """
@@ -111,15 +1082,8 @@ class Vocabulary:
         Args:
             result: Dictionary lookup result
         """
-        vocab = self._load()
-        
         word = result.get("word", result.get("normalized", ""))
         
-        # Check if already saved
-        for entry in vocab:
-            if entry.get("word") == word:
-                return  # Already exists
-        
         # Extract first definition
         definition = ""
         pos = ""
@@ -146,97 +1110,55 @@ class Vocabulary:
             "nextReview": datetime.now().isoformat()
         }
         
-        vocab.append(entry)
-        self._save_vocab(vocab)
+        # Already saved entries are left untouched
+        if self.store.add(entry) and self._writes_json:
+            self._export_json(entry)
     
     def get_due_words(self) -> List[Dict]:
-        """Get words that are due for review."""
-        vocab = self._load()
-        now = datetime.now()
-        due = []
-        
-        for entry in vocab:
-            entry = self._migrate_entry(entry)
-            next_review = datetime.fromisoformat(entry.get("nextReview", now.isoformat()))
-            if next_review <= now:
-                due.append(entry)
-        
-        # Sort by next review date (oldest first)
-        due.sort(key=lambda x: x.get("nextReview", ""))
-        return due
+        """Get words that are due for review, oldest first."""
+        return self.store.due(datetime.now().isoformat())
     
-    def update_sm2(self, word: str, quality: int) -> None:
+    def update_sm2(self, word: str, quality: int,
+                   language: Optional[str] = None) -> Optional[dict]:
         """
         Update SM-2 parameters for a word after review.
         
         Args:
             word: The word that was reviewed
             quality: Quality of recall (0-5)
-        """
-        vocab = self._load()
-        
-        for entry in vocab:
-            if entry.get("word") == word:
-                entry = self._migrate_entry(entry)
-                
-                # Calculate new SM-2 values
-                new_reps, new_ease, new_interval = SM2.calculate(
-                    quality,
-                    entry["sm2_repetitions"],
-                    entry["sm2_easiness"],
-                    entry["sm2_interval"]
-                )
-                
-                entry["sm2_repetitions"] = new_reps
-                entry["sm2_easiness"] = new_ease
-                entry["sm2_interval"] = new_interval
-                
-                # Calculate next review date
-                next_review = datetime.now() + timedelta(days=new_interval)
-                entry["nextReview"] = next_review.isoformat()
-                
-                # Update legacy counters
-                entry["timesReviewed"] = entry.get("timesReviewed", 0) + 1
-                if quality >= 3:
-                    entry["correctCount"] = entry.get("correctCount", 0) + 1
-                
-                break
+            language: Language of the entry (default: the first saved)
         
-        self._save_vocab(vocab)
+        Returns:
+            The updated entry, or None if the word is not saved
+        """
+        return self.store.modify(word, language, lambda entry: review_entry(entry, quality))
     
     def get_stats(self) -> dict:
         """Get vocabulary learning statistics."""
-        vocab = self._load()
-        now = datetime.now()
-        
-        total = len(vocab)
-        due = 0
-        mastered = 0  # Words with interval >= 21 days
-        learning = 0  # Words with 0 < interval < 21
-        new = 0       # Words never reviewed
+        return self.store.stats(datetime.now().isoformat())
+    
+    def forecast(self, days: int, qualities: Optional[Dict[int, float]] = None,
+                 seed: Optional[int] = 0) -> List[int]:
+        """
+        Projected number of reviews on each of the next days.
         
-        for entry in vocab:
-            entry = self._migrate_entry(entry)
-            interval = entry.get("sm2_interval", 0)
-            next_review = datetime.fromisoformat(entry.get("nextReview", now.isoformat()))
-            
-            if next_review <= now:
-                due += 1
-            
-            if interval == 0:
-                new += 1
-            elif interval >= 21:
-                mastered += 1
-            else:
-                learning += 1
+        Args:
+            days: Days to simulate, starting today
+            qualities: Assumed recall quality -> relative weight
+                (default: core.forecast.DEFAULT_QUALITIES)
+            seed: Random seed for the simulated ratings
+        """
+        from core.forecast import Deck, forecast
+        return forecast(Deck.from_schedule(self.store.schedule()), days, qualities, seed)
+    
+    def verify_stats(self) -> bool:
+        """
+        Recompute the store's stats counters from scratch.
         
-        return {
-            "total": total,
-            "due": due,
-            "mastered": mastered,
-            "learning": learning,
-            "new": new
-        }
+        Returns:
+            True if the counters were already correct
+        """
+        return self.store.recount()
     
     def review(self, formatter) -> None:
         """Review saved vocabulary (simple list view)."""
@@ -278,24 +1200,18 @@ class Vocabulary:
     
     def quiz(self, formatter) -> None:
         """Quiz on saved vocabulary (random selection)."""
-        vocab = self._load()
-        
-        if len(vocab) < 4:
+        if self.store.count() < 4:
             formatter.info("Need at least 4 saved words for quiz / "
                           "Нужно минимум 4 слова для викторины")
             return
         
         formatter.header("Vocabulary Quiz / Викторина")
         
-        # Pick a random word
-        correct_entry = random.choice(vocab)
+        # Pick a random word and 3 wrong answers
+        correct_entry, *wrong_entries = self.store.sample(4)
         word = correct_entry.get("word", "")
         correct_def = correct_entry.get("definition", "")
-        
-        # Get 3 wrong answers
-        wrong_entries = [e for e in vocab if e.get("word") != word]
-        random.shuffle(wrong_entries)
-        wrong_defs = [e.get("definition", "") for e in wrong_entries[:3]]
+        wrong_defs = [e.get("definition", "") for e in wrong_entries]
         
         # Combine and shuffle options
         options = [correct_def] + wrong_defs
@@ -316,12 +1232,12 @@ class Vocabulary:
             if answer == str(correct_index + 1):
                 formatter.success("Correct! / Правильно!")
                 # SM-2: quality 4 (correct after hesitation)
-                self.update_sm2(word, 4)
+                self.update_sm2(word, 4, correct_entry.get("language"))
             else:
                 formatter.error(f"Wrong. The answer was {correct_index + 1} / "
                                f"Неверно. Правильный ответ: {correct_index + 1}")
                 # SM-2: quality 1 (incorrect but remembered upon seeing)
-                self.update_sm2(word, 1)
+                self.update_sm2(word, 1, correct_entry.get("language"))
             
         except (KeyboardInterrupt, EOFError):
             print("\nQuiz cancelled / Викторина отменена")
@@ -329,11 +1245,12 @@ class Vocabulary:
     def study(self, formatter) -> None:
         """
         Spaced repetition study session.
-        Reviews words that are due, using SM-2 algorithm.
+        Reviews words that are due, using SM-2 algorithm; failed words come
+        back later in the session (see StudyQueue).
         """
-        due_words = self.get_due_words()
+        queue = StudyQueue(self.store)
         
-        if not due_words:
+        if not queue:
             stats = self.get_stats()
             formatter.success("All caught up! No words due for review. / "
                             "Всё повторено! Нет слов для повторения.")
@@ -341,7 +1258,7 @@ class Vocabulary:
                           f"{stats['learning']} learning")
             return
         
-        formatter.header(f"Study Session / Сессия обучения ({len(due_words)} words due)")
+        formatter.header(f"Study Session / Сессия обучения ({len(queue)} words due)")
         
         print("Rate your recall quality after each card:")
         print("  0 - Complete blackout / Полный провал")
@@ -356,19 +1273,23 @@ class Vocabulary:
         
         reviewed = 0
         
-        for entry in due_words:
-            word = entry.get("word", "")
-            definition = entry.get("definition", "")
-            pos = entry.get("partOfSpeech", "")
-            phonetic = entry.get("phonetic", "")
-            lang = entry.get("language", "en")
-            
-            # Show word
-            print(f"\n{'🇷🇺' if lang == 'ru' else '🇬🇧'} {word}")
-            if phonetic:
-                print(f"   {phonetic}")
-            
-            try:
+        try:
+            while True:
+                entry = queue.pop()
+                if entry is None:
+                    break
+                
+                word = entry.get("word", "")
+                definition = entry.get("definition", "")
+                pos = entry.get("partOfSpeech", "")
+                phonetic = entry.get("phonetic", "")
+                lang = entry.get("language", "en")
+                
+                # Show word
+                print(f"\n{'🇷🇺' if lang == 'ru' else '🇬🇧'} {word}")
+                if phonetic:
+                    print(f"   {phonetic}")
+                
                 response = input("\n[Press Enter to reveal / Enter для ответа] ")
                 if response.lower() == 'q':
                     break
@@ -386,7 +1307,7 @@ class Vocabulary:
                     try:
                         quality = int(rating)
                         if 0 <= quality <= 5:
-                            self.update_sm2(word, quality)
+                            again = queue.rate(entry, quality)
                             reviewed += 1
                             
                             # Show feedback
@@ -396,12 +1317,10 @@ class Vocabulary:
                                 print("✗ Keep practicing! ", end="")
                             
                             # Show next review
-                            vocab = self._load()
-                            for e in vocab:
-                                if e.get("word") == word:
-                                    interval = e.get("sm2_interval", 1)
-                                    print(f"Next review in {interval} day(s)")
-                                    break
+                            if again is not None:
+                                print(f"Again in {round(again / 60)} min this session")
+                            else:
+                                print(f"Next review in {entry['sm2_interval']} day(s)")
                             break
                         else:
                             print("Please enter 0-5 / Введите 0-5")
@@ -413,9 +1332,10 @@ class Vocabulary:
                     
                 print("-" * 50)
                 
-            except (KeyboardInterrupt, EOFError):
-                print("\n\nSession ended / Сессия завершена")
-                break
+        except (KeyboardInterrupt, EOFError):
+            print("\n\nSession ended / Сессия завершена")
+        finally:
+            queue.flush()
         
         # Summary
         print(f"\n{'=' * 50}")
@@ -425,41 +1345,29 @@ class Vocabulary:
         stats = self.get_stats()
         formatter.info(f"Remaining due: {stats['due']} | Mastered: {stats['mastered']}")
     
-    def export_anki(self, filename: str) -> int:
+    def export_anki(self, filename: str, fields: Iterable[str] = ()) -> int:
         """
-        Export vocabulary to Anki-compatible CSV.
+        Export vocabulary for Anki, streaming entries from the store.
+        
+        A filename ending in .apkg gets an Anki package (notes keep their
+        SM-2 schedule and are updated, not duplicated, on re-import);
+        anything else gets a semicolon-separated CSV.
         
         Args:
-            filename: Output CSV filename
+            filename: Output filename
+            fields: Extra fields after Front and Back
+                (see core.anki.EXTRA_FIELDS: language, phonetic, sm2)
             
         Returns:
-            Number of words exported
+            Number of words exported (nothing is written for an empty vocabulary)
         """
-        vocab = self._load()
+        from itertools import chain
+        from core import anki
         
-        if not vocab:
+        entries = self.store.entries()
+        first = next(entries, None)
+        if first is None:
             return 0
         
-        with open(filename, "w", encoding="utf-8") as f:
-            for entry in vocab:
-                word = entry.get("word", "")
-                definition = entry.get("definition", "")
-                phonetic = entry.get("phonetic", "")
-                pos = entry.get("partOfSpeech", "")
-                
-                # Anki format: front;back
-                front = word
-                if phonetic:
-                    front += f" ({phonetic})"
-                
-                back = definition
-                if pos:
-                    back = f"[{pos}] {back}"
-                
-                # Escape semicolons
-                front = front.replace(";", ",")
-                back = back.replace(";", ",")
-                
-                f.write(f"{front};{back}\n")
-        
-        return len(vocab)
+        export = anki.export_apkg if filename.lower().endswith(".apkg") else anki.export_csv
+        return export(chain([first], entries), Path(filename), fields)
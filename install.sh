@@ -130,16 +130,22 @@ install_python() {
     local suffix="$1"
     echo -e "\n${YELLOW}Installing Python version...${NC}"
     
-    # Create wrapper scripts that call the Python CLI
-    printf '#!/bin/bash\nexec python3 "%s/cli.py" "$@"\n' "${SCRIPT_DIR}" > "${INSTALL_DIR}/define${suffix}"
+    # Create wrapper scripts that call the Python CLI (via the entry script,
+    # which hands the command to a running `define --daemon` if there is one)
+    printf '#!/bin/bash\nexec python3 "%s/define" "$@"\n' "${SCRIPT_DIR}" > "${INSTALL_DIR}/define${suffix}"
     chmod +x "${INSTALL_DIR}/define${suffix}"
     echo -e "${GREEN}*${NC} define${suffix}"
     
     for cmd in определить словарь слово; do
-        printf '#!/bin/bash\nexec python3 "%s/cli.py" "$@"\n' "${SCRIPT_DIR}" > "${INSTALL_DIR}/${cmd}${suffix}"
+        printf '#!/bin/bash\nexec python3 "%s/define" "$@"\n' "${SCRIPT_DIR}" > "${INSTALL_DIR}/${cmd}${suffix}"
         chmod +x "${INSTALL_DIR}/${cmd}${suffix}"
         echo -e "${GREEN}*${NC} ${cmd}${suffix}"
     done
+    
+    # Precompile language data so the first lookup starts fast
+    if (cd "${SCRIPT_DIR}" && python3 -c 'from languages.snapshot import build_all; build_all()') 2>/dev/null; then
+        echo -e "${GREEN}*${NC} language data snapshot"
+    fi
 }
 
 install_bash() {
@@ -233,3 +239,6 @@ echo -e "  define hello"
 echo -e "  define -f love"
 echo -e "  определить привет"
 echo ""
+echo -e "${BLUE}Tab completion / Автодополнение:${NC}"
+echo -e "  source <(define --completion bash)   # or zsh"
+echo ""
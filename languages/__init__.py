@@ -1,8 +1,24 @@
 """
 Language support for define.
+
+The language modules are imported on first use, so code that only needs
+the base class (e.g. LookupFailed) does not load the HTTP stack.
 """
 
-from .english import English
-from .russian import Russian
+import importlib
+
+from .base import Language, LookupFailed
+
+_LAZY = {
+    "English": "english",
+    "Russian": "russian",
+}
+
+__all__ = ["Language", "LookupFailed", "English", "Russian"]
+
 
-__all__ = ["English", "Russian"]
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
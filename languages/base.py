@@ -3,7 +3,17 @@ Base language class for dictionary languages.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import cached_property
+from typing import Iterable, Optional
+
+
+class LookupFailed(Exception):
+    """
+    The upstream source could not answer (network error, rate limiting,
+    server error). Distinct from a word that simply does not exist, which
+    is reported by returning None.
+    """
+    pass
 
 
 class Language(ABC):
@@ -13,6 +23,10 @@ class Language(ABC):
     name: str           # English name
     native_name: str    # Native name
     
+    # Data files (languages/data/<name>.json) whose headwords feed the
+    # "did you mean" suggestions, see headwords()
+    SUGGEST_SOURCES: tuple = ()
+    
     @abstractmethod
     def detect(self, text: str) -> bool:
         """
@@ -52,5 +66,82 @@ class Language(ABC):
             
         Returns:
             Dictionary result or None if not found
+        
+        Raises:
+            LookupFailed: The upstream source could not be reached
         """
         pass
+    
+    async def alookup(self, word: str, translate: bool = False) -> Optional[dict]:
+        """
+        Look up a word without blocking the event loop.
+        
+        The default runs the synchronous lookup() in the loop's default
+        executor. Plugins with a native async client override this.
+        
+        Args:
+            word: Word to look up (should be normalized)
+            translate: If True, return translation instead of definition
+            
+        Returns:
+            Dictionary result or None if not found
+        
+        Raises:
+            LookupFailed: The upstream source could not be reached
+        """
+        import asyncio
+        from functools import partial
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.lookup, word, translate))
+    
+    @classmethod
+    def is_async_native(cls) -> bool:
+        """True if the plugin overrides alookup() with a native implementation."""
+        return cls.alookup is not Language.alookup
+    
+    @classmethod
+    def headwords(cls, data: dict) -> Iterable[str]:
+        """
+        Words and phrases to offer as spelling suggestions.
+        
+        Args:
+            data: Parsed SUGGEST_SOURCES, keyed by file stem
+        
+        The default yields the keys of every source, skipping "_meta".
+        """
+        for name in cls.SUGGEST_SOURCES:
+            for key in data.get(name, {}):
+                if not key.startswith("_"):
+                    yield key
+    
+    @classmethod
+    def completions(cls, data: dict) -> Iterable[str]:
+        """
+        Terms offered by `define --complete`, from the parsed
+        SUGGEST_SOURCES. The default is headwords().
+        """
+        return cls.headwords(data)
+    
+    @classmethod
+    def suggest_snapshot(cls) -> str:
+        """Snapshot name of the suggestion index."""
+        return f"{cls.code}_suggest"
+    
+    @classmethod
+    def derive_suggestions(cls, data: dict) -> dict:
+        """Build the suggestion index; runs only when its snapshot is (re)built."""
+        from .suggest import SuggestionIndex
+        return {"index": SuggestionIndex(cls.headwords(data))}
+    
+    @cached_property
+    def suggestion_index(self):
+        """SuggestionIndex over the local headwords, loaded on first use."""
+        from . import snapshot
+        from .suggest import SuggestionIndex
+        
+        if not self.SUGGEST_SOURCES:
+            return SuggestionIndex()
+        data = snapshot.load(self.suggest_snapshot(), self.SUGGEST_SOURCES,
+                             self.derive_suggestions, keep_sources=False)
+        return data["index"]
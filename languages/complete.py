@@ -0,0 +1,86 @@
+"""
+Prefix completion over the local headwords of every language, behind
+`define --complete` and the bash/zsh completion scripts.
+
+The index is a sorted list of terms searched with bisect, stored in its
+own snapshot. Loading it needs neither the language classes nor their
+HTTP stack; they are imported only when the snapshot is (re)built.
+"""
+
+import bisect
+from typing import Iterator, List, Optional
+
+from . import snapshot
+
+SNAPSHOT = "complete"
+
+# SUGGEST_SOURCES of the built-in languages (kept in sync by the tests;
+# listed here so loading the snapshot does not import the languages)
+SOURCES = ("en_phrases", "en_variations", "ru_definitions", "ru_phrases", "ru_translit")
+
+
+class PrefixIndex:
+    """Sorted, array-backed prefix index."""
+    
+    def __init__(self, terms):
+        self._terms = sorted({" ".join(term.lower().split()) for term in terms} - {""})
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """Terms starting with prefix, in sorted order."""
+        terms = self._terms
+        for i in range(bisect.bisect_left(terms, prefix), len(terms)):
+            if not terms[i].startswith(prefix):
+                return
+            yield terms[i]
+
+
+def derive(data: dict) -> dict:
+    """Build the index; runs only when the snapshot is (re)built."""
+    from .english import English
+    from .russian import Russian
+    
+    terms = []
+    for lang in (English, Russian):
+        terms.extend(lang.completions({name: data[name] for name in lang.SUGGEST_SOURCES}))
+    return {"index": PrefixIndex(terms)}
+
+
+def load_index() -> PrefixIndex:
+    """The completion index, from the snapshot."""
+    return snapshot.load(SNAPSHOT, SOURCES, derive, keep_sources=False)["index"]
+
+
+def complete(text: str, limit: int = 100, index: Optional[PrefixIndex] = None) -> List[str]:
+    """
+    Completions for the last word of text, as a shell completes words.
+    
+    The words before the last one must match a term's leading words, and
+    each result is the term's word at the last position, so phrases
+    complete one word at a time ("how ar" -> "are").
+    
+    Args:
+        text: Words typed so far; a trailing space starts a new word
+        limit: Maximum number of completions
+        index: Index to search (default: load_index())
+    
+    Returns:
+        Distinct words in sorted order
+    """
+    words = text.lower().split()
+    if not words or text[-1:].isspace():
+        words.append("")
+    position = len(words) - 1
+    
+    results = []
+    seen = set()
+    for term in (index or load_index()).iter_prefix(" ".join(words)):
+        parts = term.split(" ")
+        if len(parts) > position and parts[position] not in seen:
+            seen.add(parts[position])
+            results.append(parts[position])
+            if len(results) >= limit:
+                break
+    return results
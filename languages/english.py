@@ -3,13 +3,13 @@ English language support.
 """
 
 import re
-import json
-import urllib.request
-import urllib.error
-from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+from urllib.parse import quote
 
-from .base import Language
+from core.http import HTTPClient, HTTPError, NetworkError, get_client
+from . import snapshot
+from .base import Language, LookupFailed
+from .idioms import IdiomIndex
 
 
 class English(Language):
@@ -21,47 +21,57 @@ class English(Language):
     
     API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en"
     
-    def __init__(self):
-        self._idioms = None
-        self._phrases = None
-        self._variations = None
+    # Data files (languages/data/<name>.json) loaded through the snapshot
+    DATA_SOURCES = ("en_idioms", "en_phrases", "en_variations")
+    SUGGEST_SOURCES = ("en_phrases", "en_variations")
     
-    def _load_json(self, path: Path) -> dict:
-        """Load JSON file, return empty dict if not found."""
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (IOError, json.JSONDecodeError):
-            return {}
+    def __init__(self, http: Optional[HTTPClient] = None):
+        self.http = http or get_client()
+        self._data = None
+    
+    @staticmethod
+    def derive_data(data: dict) -> dict:
+        """
+        Clean the parsed data files and build the idiom index.
+        
+        Runs only when the snapshot is (re)built.
+        """
+        data["en_phrases"].pop("_meta", None)
+        data["en_variations"].pop("_meta", None)
+        return {"idiom_index": IdiomIndex(data["en_idioms"])}
+    
+    @classmethod
+    def headwords(cls, data: dict) -> Iterable[str]:
+        """Phrases, abbreviations and spellings (never the misspellings)."""
+        yield from (key for key in data["en_phrases"] if not key.startswith("_"))
+        variations = data["en_variations"]
+        yield from variations.get("abbreviations", {})
+        yield from variations.get("text_speak", {})
+        for british, american in variations.get("british_american", {}).items():
+            yield british
+            yield american
+        yield from variations.get("common_misspellings", {}).values()
+    
+    def _load_data(self) -> dict:
+        """Load all data files lazily, in one read from the snapshot."""
+        if self._data is None:
+            self._data = snapshot.load(self.code, self.DATA_SOURCES, self.derive_data)
+        return self._data
     
     @property
     def idioms(self) -> dict:
         """Load idioms database lazily."""
-        if self._idioms is None:
-            idiom_file = Path(__file__).parent / "data" / "en_idioms.json"
-            if idiom_file.exists():
-                with open(idiom_file, 'r', encoding='utf-8') as f:
-                    self._idioms = json.load(f)
-            else:
-                self._idioms = {}
-        return self._idioms
+        return self._load_data()["en_idioms"]
     
     @property
     def phrases(self) -> dict:
         """Load phrases database lazily."""
-        if self._phrases is None:
-            phrase_file = Path(__file__).parent / "data" / "en_phrases.json"
-            self._phrases = self._load_json(phrase_file)
-            self._phrases.pop("_meta", None)
-        return self._phrases
+        return self._load_data()["en_phrases"]
     
     @property
     def variations(self) -> dict:
         """Load variations (text speak, abbreviations, etc.) lazily."""
-        if self._variations is None:
-            var_file = Path(__file__).parent / "data" / "en_variations.json"
-            self._variations = self._load_json(var_file)
-            self._variations.pop("_meta", None)
-        return self._variations
+        return self._load_data()["en_variations"]
     
     def detect(self, text: str) -> bool:
         """
@@ -117,7 +127,14 @@ class English(Language):
         # For multi-word phrases not in database, try API or breakdown
         if ' ' in word:
             # Try the phrase in API first
-            result = self._lookup_api(word)
+            try:
+                result = self._lookup_api(word)
+            except LookupFailed:
+                # Offline: the local breakdown is better than nothing
+                breakdown = self._lookup_phrase_breakdown(word)
+                if breakdown:
+                    return breakdown
+                raise
             if result:
                 return result
             # Fall back to phrase lookup in database
@@ -223,28 +240,27 @@ class English(Language):
         }
     
     def _lookup_api(self, word: str) -> Optional[dict]:
-        """Look up a word using the Free Dictionary API."""
-        url = f"{self.API_URL}/{urllib.request.quote(word)}"
+        """
+        Look up a word using the Free Dictionary API.
+        
+        Returns None when the API has no entry (404).
+        
+        Raises:
+            LookupFailed: Network error or any other HTTP error
+        """
+        url = f"{self.API_URL}/{quote(word)}"
         
         try:
-            req = urllib.request.Request(
-                url,
-                headers={"User-Agent": "define/2.0"}
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
+            data = self.http.get_json(url)
+        except HTTPError as e:
+            if e.status == 404:
                 return None  # Word not found in dictionary
             # Other HTTP errors - could be rate limiting, server issues
-            return None
-        except urllib.error.URLError as e:
-            # Network error - SSL issues common on macOS
-            import sys
-            print(f"Network error: {e.reason}", file=sys.stderr)
-            print("Hint: If on macOS, try: /Applications/Python\\ 3.*/Install\\ Certificates.command", file=sys.stderr)
-            return None
-        except json.JSONDecodeError:
+            raise LookupFailed(f"HTTP {e.status} from {self.API_URL}") from e
+        except NetworkError as e:
+            # Reported once by the caller, not per worker thread
+            raise LookupFailed(str(e.reason)) from e
+        except ValueError:
             return None
         
         if not data or not isinstance(data, list):
@@ -290,23 +306,8 @@ class English(Language):
         return result
     
     def _get_idioms(self, word: str) -> list:
-        """Get idioms containing this word."""
-        word_lower = word.lower()
-        idiom_list = []
-        
-        # Direct match in idioms database
-        if word_lower in self.idioms:
-            idiom_list.extend(self.idioms[word_lower].get("idioms", []))
-        
-        # Also search for word in other idioms
-        for key, data in self.idioms.items():
-            if key != word_lower:
-                for idiom in data.get("idioms", []):
-                    if word_lower in idiom.get("phrase", "").lower():
-                        if idiom not in idiom_list:
-                            idiom_list.append(idiom)
-        
-        return idiom_list[:10]  # Limit to 10 idioms
+        """Get idioms containing this word (at most 10)."""
+        return self._load_data()["idiom_index"].search(word)
     
     def _detect_register(self, meaning: dict) -> str:
         """Detect formality register from definition text."""
@@ -0,0 +1,139 @@
+"""
+Inflected form -> lemma index over the Russian paradigms (ru_grammar.json,
+ru_definitions.json), so `книги` or `писал` resolve to their dictionary
+entry without a Wiktionary round trip.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# The paradigms are expanded with core.grammar; its source is part of the
+# snapshot fingerprint (see languages/snapshot.py)
+GRAMMAR_MODULE = Path(__file__).parent.parent / "core" / "grammar.py"
+
+SHORT_CASES = {"nom": "nominative", "gen": "genitive", "dat": "dative",
+               "acc": "accusative", "ins": "instrumental", "prep": "prepositional"}
+PERSONS = {
+    "я": "1st person singular", "ты": "2nd person singular", "он/она": "3rd person singular",
+    "мы": "1st person plural", "вы": "2nd person plural", "они": "3rd person plural",
+}
+GENDERS = {"masc": "masculine", "fem": "feminine", "neut": "neuter", "plural": "plural"}
+
+# Single words only: compound futures ("буду знать") and notes are skipped
+FORM_RE = re.compile(r"[а-я-]+")
+
+
+def normalize(word: str) -> str:
+    """Lowercase, without stress marks, with ё folded to е."""
+    return word.lower().replace("\u0301", "").replace("ё", "е")
+
+
+def verb_forms(paradigm: dict) -> Iterable[Tuple[str, str]]:
+    """(form, tag) pairs of a full verb conjugation."""
+    for person, form in (paradigm.get("present") or {}).items():
+        yield form, f"present {PERSONS.get(person, person)}"
+    for person, form in (paradigm.get("future") or {}).items():
+        yield form, f"future {PERSONS.get(person, person)}"
+    for gender, form in (paradigm.get("past") or {}).items():
+        yield form, f"past {GENDERS.get(gender, gender)}"
+    for number, form in (paradigm.get("imperative") or {}).items():
+        yield form, f"imperative {number}"
+    for kind, form in (paradigm.get("participles") or {}).items():
+        yield form, f"{kind.replace('_', ' ')} participle"
+
+
+def noun_forms(paradigm: dict, numbered: bool = True) -> Iterable[Tuple[str, str]]:
+    """(form, tag) pairs of a singular/plural declension."""
+    for number in ("singular", "plural"):
+        for case, form in (paradigm.get(number) or {}).items():
+            yield form, f"{case} {number}" if numbered else case
+
+
+class FormIndex:
+    """
+    Form -> ((lemma, tag), ...) index, built once (stored in the Russian
+    data snapshot).
+    
+    Curated paradigms (ru_grammar.json, and the conjugations and cases
+    listed in ru_definitions.json) take precedence: forms the grammar
+    engine generates on top of them are only added where no curated form
+    exists, so a rule's mistake never shadows a real word.
+    """
+    
+    def __init__(self, definitions: dict, grammar: dict):
+        from core.grammar import GrammarEngine
+        
+        engine = GrammarEngine()
+        curated = {}
+        generated = {}
+        
+        for lemma, data in grammar.get("verbs", {}).items():
+            self._add(curated, lemma, verb_forms(data))
+        for lemma, data in grammar.get("nouns", {}).items():
+            self._add(curated, lemma, noun_forms(data))
+        
+        for lemma, data in definitions.items():
+            if lemma.startswith("_") or not isinstance(data, dict):
+                continue
+            pos = data.get("pos", "").split("/")
+            if "verb" in pos and lemma not in grammar.get("verbs", {}):
+                present = data.get("conjugation", {})
+                full = engine.get_full_verb_conjugation({
+                    "word": lemma,
+                    "aspect": data.get("aspect") or "imperfective",
+                    "conjugation": present,
+                })
+                # The engine passes the listed conjugation through as the
+                # present (imperfective) or simple future (perfective)
+                listed = {key: full.pop(key) for key in ("present", "future")
+                          if present and full.get(key) == present}
+                self._add(curated, lemma, verb_forms(listed))
+                self._add(generated, lemma, verb_forms(full))
+            elif data.get("cases") and lemma not in grammar.get("nouns", {}):
+                singular = {SHORT_CASES.get(case, case): form
+                            for case, form in data["cases"].items()}
+                if "noun" not in pos:
+                    self._add(curated, lemma, noun_forms({"singular": singular}, numbered=False))
+                    continue
+                self._add(curated, lemma, noun_forms({"singular": singular}))
+                full = engine.get_full_noun_declension({
+                    "cases": singular,
+                    "gender": data.get("gender", ""),
+                    "animate": data.get("animate", False),
+                })
+                self._add(generated, lemma, noun_forms({"plural": full.get("plural")}))
+        
+        for form, analyses in generated.items():
+            curated.setdefault(form, analyses)
+        self._forms = {form: tuple(analyses) for form, analyses in curated.items()}
+    
+    @staticmethod
+    def _add(forms: dict, lemma: str, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Record the (form, tag) pairs of one lemma, skipping the lemma itself."""
+        base = normalize(lemma)
+        for value, tag in pairs:
+            for alternative in value.split("/"):
+                form = normalize(alternative.strip())
+                if form == base or not FORM_RE.fullmatch(form):
+                    continue
+                analyses = forms.setdefault(form, [])
+                if (lemma, tag) not in analyses:
+                    analyses.append((lemma, tag))
+    
+    def __len__(self) -> int:
+        return len(self._forms)
+    
+    def __contains__(self, word: str) -> bool:
+        return normalize(word) in self._forms
+    
+    def lookup(self, word: str) -> List[Tuple[str, str]]:
+        """(lemma, tag) analyses of a form, curated ones first."""
+        return list(self._forms.get(normalize(word), ()))
+    
+    def lemmatize(self, word: str) -> Dict[str, List[str]]:
+        """Lemmas of a form with their tags, in lookup() order."""
+        lemmas = {}
+        for lemma, tag in self.lookup(word):
+            lemmas.setdefault(lemma, []).append(tag)
+        return lemmas
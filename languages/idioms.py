@@ -0,0 +1,97 @@
+"""
+Inverted index over an idioms database (en_idioms.json, ru_idioms.json).
+"""
+
+import re
+from typing import List
+
+# Word characters, so Latin and Cyrillic tokenize alike ("break one's
+# heart" -> break, one, s, heart)
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> tuple:
+    """Lowercase word tokens of text."""
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+
+class IdiomIndex:
+    """
+    Token -> idiom index, built once per language (stored in the data
+    snapshot), so finding the idioms of a word costs O(matches) instead
+    of a scan over every idiom.
+    
+    An idiom matches a word if the word's tokens appear as consecutive
+    whole tokens of its phrase: "ice" matches "break the ice" but not
+    "nice try".
+    """
+    
+    # Shorter words ("a", "в", "не") only get the idioms listed under them
+    MIN_SEARCH_LENGTH = 3
+    LIMIT = 10
+    
+    def __init__(self, idioms: dict):
+        """
+        Args:
+            idioms: Idioms database, {key: {"idioms": [{"phrase": ...}, ...]}}
+        """
+        self._idioms = []     # idiom id -> idiom dict
+        self._keys = []       # idiom id -> database key
+        self._tokens = []     # idiom id -> phrase tokens
+        self._by_key = {}     # key -> idiom ids, in file order
+        self._postings = {}   # token -> idiom ids, ascending
+        
+        for key, data in idioms.items():
+            if not isinstance(data, dict):
+                continue
+            ids = self._by_key.setdefault(key.lower(), [])
+            for idiom in data.get("idioms", []):
+                idiom_id = len(self._idioms)
+                tokens = tokenize(idiom.get("phrase", ""))
+                self._idioms.append(idiom)
+                self._keys.append(key.lower())
+                self._tokens.append(tokens)
+                ids.append(idiom_id)
+                for token in set(tokens):
+                    self._postings.setdefault(token, []).append(idiom_id)
+    
+    def __len__(self) -> int:
+        return len(self._idioms)
+    
+    def search(self, word: str, limit: int = LIMIT) -> List[dict]:
+        """
+        Idioms for a word: those listed under it first, then other
+        phrases containing it, in database order.
+        
+        Args:
+            word: Word or phrase to search for
+            limit: Maximum number of idioms returned
+        """
+        word = word.lower()
+        results = [self._idioms[i] for i in self._by_key.get(word, ())]
+        
+        query = tokenize(word)
+        if len(word) < self.MIN_SEARCH_LENGTH or not query:
+            return results[:limit]
+        
+        # Walk the shortest posting list; multi-word queries must also
+        # appear as a contiguous run of tokens
+        candidates = min((self._postings.get(token, ()) for token in query), key=len)
+        for idiom_id in candidates:
+            if len(results) >= limit:
+                break
+            if self._keys[idiom_id] == word:
+                continue
+            if len(query) > 1 and not _contains(self._tokens[idiom_id], query):
+                continue
+            idiom = self._idioms[idiom_id]
+            if idiom not in results:
+                results.append(idiom)
+        
+        return results[:limit]
+
+
+def _contains(tokens: tuple, query: tuple) -> bool:
+    """True if query occurs as a contiguous run in tokens."""
+    n = len(query)
+    return any(tokens[i:i + n] == query for i in range(len(tokens) - n + 1))
@@ -3,13 +3,54 @@ Russian language support with transliteration.
 """
 
 import re
-import json
-import urllib.request
-import urllib.error
-from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
+from urllib.parse import quote
 
-from .base import Language
+from core.http import HTTPClient, HTTPError, NetworkError, get_client
+from . import snapshot
+from .base import Language, LookupFailed
+from .forms import GRAMMAR_MODULE, FormIndex
+from .idioms import IdiomIndex
+
+# Files outside this package the data snapshot is derived with
+SNAPSHOT_DEPENDS = (GRAMMAR_MODULE,)
+
+
+class Transliterator:
+    """
+    Latin to Cyrillic rules from ru_translit.json, compiled once.
+    
+    Rules apply longest first (file order breaks ties), each over the whole
+    text. Every rule produces Cyrillic, which no later rule can match, so
+    the single-letter rules never interact and collapse into one
+    str.translate() pass after the multi-letter ones.
+    """
+    
+    # Joins batch items; no rule matches it, so it survives unchanged
+    SEPARATOR = "\n"
+    
+    def __init__(self, rules: dict):
+        ordered = sorted(rules.items(), key=lambda x: -len(x[0]))
+        self._multi = tuple((latin, cyr) for latin, cyr in ordered if len(latin) > 1)
+        self._table = str.maketrans({latin: cyr for latin, cyr in ordered if len(latin) == 1})
+    
+    def __call__(self, text: str) -> str:
+        """Transliterate text."""
+        for latin, cyrillic in self._multi:
+            text = text.replace(latin, cyrillic)
+        return text.translate(self._table)
+    
+    def transliterate_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Transliterate a batch in one pass over the joined texts.
+        
+        Same output as calling the transliterator on each item, but the
+        per-rule overhead is paid once per batch instead of once per word.
+        """
+        texts = list(texts)
+        if any(self.SEPARATOR in text for text in texts):
+            return [self(text) for text in texts]
+        return self(self.SEPARATOR.join(texts)).split(self.SEPARATOR)
 
 
 class Russian(Language):
@@ -35,38 +76,85 @@ class Russian(Language):
         re.IGNORECASE
     )
     
-    def __init__(self):
-        # Load data files
-        data_dir = Path(__file__).parent / "data"
+    # Data files (languages/data/<name>.json) loaded through the snapshot
+    DATA_SOURCES = ("ru_translit", "ru_definitions", "ru_grammar", "ru_phrases", "ru_idioms")
+    SUGGEST_SOURCES = ("ru_definitions", "ru_phrases", "ru_translit")
+    
+    def __init__(self, http: Optional[HTTPClient] = None):
+        self.http = http or get_client()
+        
+        # Load data files (parsed JSON + derived maps, from the snapshot)
+        data = snapshot.load(self.code, self.DATA_SOURCES, self.derive_data)
         
         # Transliteration rules
-        self.translit_rules = self._load_json(data_dir / "ru_translit.json")
+        self.translit_rules = data["ru_translit"]
+        self._transliterator = data["transliterator"]
         
         # Word lookup (common words with special handling)
         self.word_lookup = self.translit_rules.get("word_lookup", {})
         
         # Local definitions
-        self.local_definitions = self._load_json(data_dir / "ru_definitions.json")
+        self.local_definitions = data["ru_definitions"]
         
         # Grammar data (verbs with all tenses, nouns with declensions)
-        self.grammar_data = self._load_json(data_dir / "ru_grammar.json")
-        self.grammar_data.pop("_meta", None)
+        self.grammar_data = data["ru_grammar"]
+        
+        # Inflected form -> (lemma, tag) index over the paradigms
+        self.form_index = data["form_index"]
         
         # Phrases database
-        self.phrases = self._load_json(data_dir / "ru_phrases.json")
-        # Remove meta key if present
-        self.phrases.pop("_meta", None)
+        self.phrases = data["ru_phrases"]
         
-        # Build reverse transliteration lookup for phrases
-        self._phrase_translit_map = self._build_phrase_translit_map()
+        # Reverse transliteration lookup for phrases
+        self._phrase_translit_map = data["phrase_translit_map"]
         
         # Idioms
-        self._idioms = None
+        self._idioms = data["ru_idioms"]
+        self._idiom_index = data["idiom_index"]
+    
+    @classmethod
+    def derive_data(cls, data: dict) -> dict:
+        """
+        Clean the parsed data files and build the derived lookup maps.
+        
+        Runs only when the snapshot is (re)built.
+        """
+        data["ru_grammar"].pop("_meta", None)
+        data["ru_phrases"].pop("_meta", None)
+        return {
+            "transliterator": Transliterator(data["ru_translit"].get("rules", {})),
+            "phrase_translit_map": cls._build_phrase_translit_map(data["ru_phrases"]),
+            "idiom_index": IdiomIndex(data["ru_idioms"]),
+            "form_index": FormIndex(data["ru_definitions"], data["ru_grammar"]),
+        }
+    
+    @classmethod
+    def headwords(cls, data: dict) -> Iterable[str]:
+        """Cyrillic headwords, including the targets of the transliteration table."""
+        yield from (key for key in data["ru_definitions"] if not key.startswith("_"))
+        yield from (key for key in data["ru_phrases"] if not key.startswith("_"))
+        yield from data["ru_translit"].get("word_lookup", {}).values()
+    
+    @classmethod
+    def completions(cls, data: dict) -> Iterable[str]:
+        """
+        Headwords plus their Latin spellings, so `privet` completes too.
+        
+        Only the canonical transliteration of each phrase is offered; the
+        yo/ye variants in the phrase transliteration map are lookup aliases.
+        """
+        yield from cls.headwords(data)
+        yield from data["ru_translit"].get("word_lookup", {})
+        for phrase in data["ru_phrases"].values():
+            translit = phrase.get("transliteration", "").lower()
+            if translit:
+                yield translit
     
-    def _build_phrase_translit_map(self) -> dict:
+    @staticmethod
+    def _build_phrase_translit_map(phrases: dict) -> dict:
         """Build a map from transliterated phrases to Cyrillic."""
         mapping = {}
-        for cyrillic, data in self.phrases.items():
+        for cyrillic, data in phrases.items():
             translit = data.get("transliteration", "").lower()
             if translit:
                 # Store original transliteration
@@ -122,23 +210,9 @@ class Russian(Language):
     
     @property
     def idioms(self) -> dict:
-        """Load idioms database lazily."""
-        if self._idioms is None:
-            idiom_file = Path(__file__).parent / "data" / "ru_idioms.json"
-            if idiom_file.exists():
-                with open(idiom_file, 'r', encoding='utf-8') as f:
-                    self._idioms = json.load(f)
-            else:
-                self._idioms = {}
+        """Idioms database."""
         return self._idioms
     
-    def _load_json(self, path: Path) -> dict:
-        """Load JSON file, return empty dict if not found."""
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (IOError, json.JSONDecodeError):
-            return {}
-    
     def detect(self, text: str) -> bool:
         """Detect if text is Russian."""
         text = text.lower().strip()
@@ -192,18 +266,36 @@ class Russian(Language):
         # Single word: apply transliteration rules
         return self._transliterate_word(text)
     
-    def _transliterate_word(self, word: str) -> str:
-        """Transliterate a single word from Latin to Cyrillic."""
-        rules = self.translit_rules.get("rules", {})
-        
-        # Sort by length (longest first) to handle multi-char patterns
-        sorted_rules = sorted(rules.items(), key=lambda x: -len(x[0]))
+    def transliterate_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Normalize many inputs at once.
         
-        result = word
-        for latin, cyrillic in sorted_rules:
-            result = result.replace(latin, cyrillic)
+        Returns the same as normalize() for each text, but words that
+        need the transliteration rules are converted in a single batch.
+        """
+        results = []
+        pending = []    # (result index, word) still to transliterate
+        for text in texts:
+            if ' ' in text.strip() or re.search(r'[\u0400-\u04FF]', text):
+                results.append(self.normalize(text))
+                continue
+            
+            word = text.lower().strip()
+            known = self._phrase_translit_map.get(word) or self.word_lookup.get(word)
+            if known:
+                results.append(known)
+            else:
+                pending.append((len(results), word))
+                results.append(None)
         
-        return result
+        converted = self._transliterator.transliterate_many(word for _, word in pending)
+        for (i, _), cyrillic in zip(pending, converted):
+            results[i] = cyrillic
+        return results
+    
+    def _transliterate_word(self, word: str) -> str:
+        """Transliterate a single word from Latin to Cyrillic."""
+        return self._transliterator(word)
     
     def lookup(self, word: str, translate: bool = False) -> Optional[dict]:
         """Look up a Russian word or phrase.
@@ -224,6 +316,10 @@ class Russian(Language):
         if word in self.phrases:
             return self._format_phrase(word, self.phrases[word])
         
+        # Inflected forms of known paradigms resolve to their lemma
+        if ' ' not in word and word in self.form_index:
+            return self._lookup_form(word)
+        
         # Fall back to Wiktionary for single words
         if ' ' not in word:
             return self._lookup_wiktionary(word)
@@ -231,6 +327,23 @@ class Russian(Language):
         # For multi-word that's not in phrases, try to break down
         return self._lookup_phrase_words(word)
     
+    def _lookup_form(self, form: str) -> Optional[dict]:
+        """
+        Look up the lemma of an inflected form, annotated with the form's
+        tags ("книги" -> книга, genitive singular / nominative plural ...).
+        
+        Lemmas without a local definition (ru_grammar.json only) still go
+        to Wiktionary, but under the lemma.
+        """
+        lemma, tags = next(iter(self.form_index.lemmatize(form).items()))
+        if lemma in self.local_definitions:
+            result = self._format_local(lemma, self.local_definitions[lemma])
+        else:
+            result = self._lookup_wiktionary(lemma)
+        if result:
+            result["form_of"] = {"form": form, "lemma": lemma, "tags": tags}
+        return result
+    
     def _format_phrase(self, phrase: str, data: dict) -> dict:
         """Format phrase data to standard format."""
         return {
@@ -388,38 +501,29 @@ class Russian(Language):
         return "neutral"
     
     def _get_idioms(self, word: str) -> list:
-        """Get idioms containing this word."""
-        idiom_list = []
-        
-        # Direct match only for short words (< 3 chars)
-        if word in self.idioms:
-            idiom_list.extend(self.idioms[word].get("idioms", []))
-        
-        # For longer words, also search in other entries
-        if len(word) >= 3:
-            for key, data in self.idioms.items():
-                if key != word:
-                    for idiom in data.get("idioms", []):
-                        phrase = idiom.get("phrase", "")
-                        # Match word boundary
-                        if f" {word}" in phrase or f"{word} " in phrase or phrase.startswith(word) or phrase.endswith(word):
-                            if idiom not in idiom_list:
-                                idiom_list.append(idiom)
-        
-        return idiom_list[:10]
+        """Get idioms containing this word (at most 10)."""
+        return self._idiom_index.search(word)
     
     def _lookup_wiktionary(self, word: str) -> Optional[dict]:
-        """Look up word on Wiktionary."""
-        url = f"{self.WIKTIONARY_URL}/{urllib.request.quote(word)}"
+        """
+        Look up word on Wiktionary.
+        
+        Returns None when Wiktionary has no Russian or English entry.
+        
+        Raises:
+            LookupFailed: Network error or HTTP error other than 404
+        """
+        url = f"{self.WIKTIONARY_URL}/{quote(word)}"
         
         try:
-            req = urllib.request.Request(
-                url,
-                headers={"User-Agent": "define/2.0"}
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
-        except (urllib.error.URLError, urllib.error.HTTPError, json.JSONDecodeError):
+            data = self.http.get_json(url)
+        except HTTPError as e:
+            if e.status == 404:
+                return None
+            raise LookupFailed(f"HTTP {e.status} from {self.WIKTIONARY_URL}") from e
+        except NetworkError as e:
+            raise LookupFailed(e.reason) from e
+        except ValueError:
             return None
         
         # Parse Wiktionary response
@@ -0,0 +1,179 @@
+"""
+Precompiled snapshots of the language data files.
+
+Parsing languages/data/*.json and deriving lookup maps from them is the
+bulk of a language's startup cost. Each language's parsed files and
+derived maps are pickled into one file under the cache directory and
+loaded back with a single read. A snapshot is rebuilt automatically when
+a source file, the package of the module deriving the maps or a file that
+module lists in SNAPSHOT_DEPENDS changes (mtime and size), or when
+SNAPSHOT_VERSION is bumped.
+
+install.sh builds the snapshots ahead of time with build_all().
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+SNAPSHOT_VERSION = 1
+MAGIC = b"DFSNAP"
+DATA_DIR = Path(__file__).parent / "data"
+
+# Set to False to always parse the JSON sources (benchmarks, debugging)
+ENABLED = True
+
+
+def snapshot_dir() -> Path:
+    """
+    Default snapshot location, next to the lookup cache.
+    
+    Each installation gets its own subdirectory (named after a hash of
+    its path), so checkouts sharing a cache directory do not keep
+    replacing each other's snapshots.
+    """
+    xdg_cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    install = hashlib.sha1(str(Path(__file__).resolve().parent.parent).encode("utf-8"))
+    return xdg_cache / "define" / "snapshots" / install.hexdigest()[:12]
+
+
+def read_sources(sources: Iterable[str], data_dir: Path = DATA_DIR) -> dict:
+    """
+    Parse the JSON sources.
+    
+    Returns:
+        Dict of source name (file stem) to parsed data; missing or
+        invalid files give an empty dict
+    """
+    data = {}
+    for name in sources:
+        try:
+            data[name] = json.loads((data_dir / f"{name}.json").read_text(encoding="utf-8"))
+        except (IOError, json.JSONDecodeError):
+            data[name] = {}
+    return data
+
+
+def _fingerprint(sources: Iterable[str], data_dir: Path,
+                 derive: Optional[Callable]) -> bytes:
+    """Stat-based key identifying the inputs a snapshot was built from."""
+    paths = [data_dir / f"{name}.json" for name in sources]
+    if derive is not None:
+        # The derived objects may be instances of classes from sibling
+        # modules (e.g. IdiomIndex), so any change in the package counts
+        module = sys.modules.get(derive.__module__)
+        if module is not None and getattr(module, "__file__", None):
+            paths.extend(sorted(Path(module.__file__).parent.glob("*.py")))
+            paths.extend(getattr(module, "SNAPSHOT_DEPENDS", ()))
+    
+    parts = [f"v{SNAPSHOT_VERSION}"]
+    for path in paths:
+        # Full paths: a file of the same name elsewhere is a different input
+        path = Path(path).absolute()
+        try:
+            st = path.stat()
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return "|".join(parts).encode("utf-8")
+
+
+def _header(key: bytes) -> bytes:
+    return MAGIC + struct.pack(">I", len(key)) + key
+
+
+def _write(path: Path, header: bytes, data: dict) -> None:
+    """Write atomically; a failed write only costs the next start a rebuild."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(header + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def build(name: str, sources: Iterable[str], derive: Optional[Callable[[dict], dict]] = None,
+          data_dir: Path = DATA_DIR, directory: Optional[Path] = None,
+          keep_sources: bool = True) -> dict:
+    """
+    Parse the sources, derive maps and write a fresh snapshot.
+    
+    Args:
+        name: Snapshot name (e.g. language code)
+        sources: JSON file stems in data_dir
+        derive: Function receiving the parsed sources and returning extra
+            entries to store alongside them (must be picklable)
+        data_dir: Directory holding the JSON sources
+        directory: Snapshot directory (default: snapshot_dir())
+        keep_sources: False stores only the derived entries, for
+            snapshots that just need something computed from the sources
+    
+    Returns:
+        Parsed sources plus derived entries
+    """
+    sources = list(sources)
+    data = read_sources(sources, data_dir)
+    if derive is not None:
+        derived = derive(data)
+        if keep_sources:
+            data.update(derived)
+        else:
+            data = derived
+    
+    if ENABLED:
+        path = (directory or snapshot_dir()) / f"{name}.pickle"
+        _write(path, _header(_fingerprint(sources, data_dir, derive)), data)
+    return data
+
+
+def load(name: str, sources: Iterable[str], derive: Optional[Callable[[dict], dict]] = None,
+         data_dir: Path = DATA_DIR, directory: Optional[Path] = None,
+         keep_sources: bool = True) -> dict:
+    """
+    Load a snapshot, rebuilding it if missing, stale or unreadable.
+    
+    Arguments as for build(). Each call returns freshly unpickled objects,
+    so callers may modify them.
+    """
+    sources = list(sources)
+    if ENABLED:
+        path = (directory or snapshot_dir()) / f"{name}.pickle"
+        header = _header(_fingerprint(sources, data_dir, derive))
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            blob = b""
+        if blob.startswith(header):
+            try:
+                return pickle.loads(memoryview(blob)[len(header):])
+            except Exception:
+                pass  # Corrupt or incompatible: rebuild below
+    
+    return build(name, sources, derive, data_dir, directory, keep_sources)
+
+
+def build_all() -> list:
+    """Rebuild the data, suggestion and completion snapshots of the built-in languages."""
+    from . import complete
+    from .english import English
+    from .russian import Russian
+    
+    built = []
+    for lang in (English, Russian):
+        build(lang.code, lang.DATA_SOURCES, lang.derive_data)
+        build(lang.suggest_snapshot(), lang.SUGGEST_SOURCES, lang.derive_suggestions,
+              keep_sources=False)
+        built.append(lang.code)
+    build(complete.SNAPSHOT, complete.SOURCES, complete.derive, keep_sources=False)
+    built.append(complete.SNAPSHOT)
+    return built
+
@@ -0,0 +1,112 @@
+"""
+Symmetric-delete spelling suggestions ("did you mean") over local words.
+"""
+
+from typing import Iterable, List, Tuple
+
+
+def _deletes(text: str, distance: int) -> set:
+    """Every string obtained by removing up to `distance` characters."""
+    found = {text}
+    level = {text}
+    for _ in range(distance):
+        level = {s[:i] + s[i + 1:] for s in level for i in range(len(s))}
+        found |= level
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or limit + 1 once it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SuggestionIndex:
+    """
+    SymSpell-style index: each term is stored under every variant of its
+    prefix with up to max_distance characters deleted. A query generates
+    the same deletes of its own prefix, so candidates come from a few
+    dictionary lookups and only they are checked with edit_distance().
+    Works for any script; Russian callers pass Cyrillic (transliterate
+    Latin input first).
+    """
+    
+    def __init__(self, terms: Iterable[str] = (), max_distance: int = 2,
+                 prefix_length: int = 7):
+        """
+        Args:
+            terms: Initial terms
+            max_distance: Largest edit distance suggested
+            prefix_length: Characters of each term indexed (bounds the
+                deletes per term; longer phrases are verified in full)
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._terms = set()
+        self._deletes = {}   # delete -> terms
+        self.update(terms)
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    def __contains__(self, term: str) -> bool:
+        return term.lower().strip() in self._terms
+    
+    def add(self, term: str) -> None:
+        """Index one term (case-insensitive)."""
+        term = term.lower().strip()
+        if not term or term in self._terms:
+            return
+        self._terms.add(term)
+        for delete in _deletes(term[:self.prefix_length], self.max_distance):
+            self._deletes.setdefault(delete, []).append(term)
+    
+    def update(self, terms: Iterable[str]) -> None:
+        """Index several terms."""
+        for term in terms:
+            self.add(term)
+    
+    def lookup(self, word: str, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Closest terms to a word.
+        
+        Short words allow fewer edits (one per three characters, at least
+        one), so "colr" suggests "color" but not "four".
+        
+        Returns:
+            Up to `limit` (term, distance) pairs, nearest first; ties go to
+            the term closest in length, then alphabetical order
+        """
+        word = word.lower().strip()
+        if not word:
+            return []
+        max_distance = min(self.max_distance, max(1, len(word) // 3))
+        
+        candidates = set()
+        for delete in _deletes(word[:self.prefix_length], max_distance):
+            candidates.update(self._deletes.get(delete, ()))
+        
+        results = []
+        for term in candidates:
+            distance = edit_distance(word, term, max_distance)
+            if distance <= max_distance:
+                results.append((term, distance))
+        results.sort(key=lambda item: (item[1], abs(len(item[0]) - len(word)), item[0]))
+        return results[:limit]
@@ -0,0 +1,32 @@
+"""
+Shared test fixtures.
+"""
+
+import os
+import shutil
+import tempfile
+
+
+def temp_cache_home():
+    """
+    Module fixtures pointing XDG_CACHE_HOME at a temporary directory, so
+    language snapshots built by the tests never touch ~/.cache/define.
+    
+    Usage (at module level):
+        setUpModule, tearDownModule = temp_cache_home()
+    """
+    state = {}
+    
+    def set_up():
+        state["saved"] = os.environ.get("XDG_CACHE_HOME")
+        state["dir"] = tempfile.mkdtemp()
+        os.environ["XDG_CACHE_HOME"] = state["dir"]
+    
+    def tear_down():
+        if state["saved"] is None:
+            os.environ.pop("XDG_CACHE_HOME", None)
+        else:
+            os.environ["XDG_CACHE_HOME"] = state["saved"]
+        shutil.rmtree(state["dir"], ignore_errors=True)
+    
+    return set_up, tear_down
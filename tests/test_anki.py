@@ -0,0 +1,147 @@
+"""
+Tests for the Anki CSV and .apkg exporters.
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.anki import export_apkg, export_csv, guid, parse_fields
+from core.vocabulary import SQLiteStore, Vocabulary
+
+
+def entry(word: str, **fields) -> dict:
+    """A saved vocabulary entry."""
+    result = {"word": word, "definition": f"meaning of {word}", "partOfSpeech": "noun",
+              "phonetic": "", "language": "en", "timesReviewed": 0, "correctCount": 0,
+              "sm2_easiness": 2.5, "sm2_interval": 0, "sm2_repetitions": 0,
+              "nextReview": date.today().isoformat()}
+    result.update(fields)
+    return result
+
+
+def read_csv(path: Path) -> list:
+    """Rows of an exported CSV, without its # header lines."""
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    return list(csv.reader(io.StringIO("".join(l for l in lines if not l.startswith("#"))),
+                           delimiter=";"))
+
+
+class TestAnkiExport(unittest.TestCase):
+    """Test the exporters on plain entry lists."""
+    
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_csv_keeps_separators_and_quotes(self):
+        """Test semicolons, quotes and newlines survive a round trip."""
+        tricky = entry("a;b", definition='say "hi"; then\nleave', phonetic="/ə/")
+        path = self.temp_dir / "deck.csv"
+        count = export_csv([tricky, entry("plain")], path, chunk_size=1)
+        
+        self.assertEqual(count, 2)
+        self.assertTrue(path.read_text(encoding="utf-8").startswith(
+            "#separator:Semicolon\n#html:false\n#columns:Front;Back\n"))
+        self.assertEqual(read_csv(path), [
+            ["a;b (/ə/)", '[noun] say "hi"; then\nleave'],
+            ["plain", "[noun] meaning of plain"],
+        ])
+    
+    def test_csv_extra_fields(self):
+        """Test the language, phonetic and SM-2 columns."""
+        reviewed = entry("dom", language="ru", phonetic="/dom/", sm2_easiness=2.36,
+                         sm2_interval=6, sm2_repetitions=2, nextReview="2026-05-01T10:00:00")
+        path = self.temp_dir / "deck.csv"
+        export_csv([reviewed], path, parse_fields("language, phonetic,sm2"))
+        
+        self.assertIn("#columns:Front;Back;Language;Phonetic;Easiness;Interval;"
+                      "Repetitions;Next review\n", path.read_text(encoding="utf-8"))
+        self.assertEqual(read_csv(path), [["dom (/dom/)", "[noun] meaning of dom", "ru",
+                                           "/dom/", "2.36", "6", "2", "2026-05-01T10:00:00"]])
+    
+    def test_file_mode(self):
+        """Test a new export follows the umask and a replaced file keeps its mode."""
+        path = self.temp_dir / "deck.csv"
+        old_umask = os.umask(0o022)
+        try:
+            export_csv([entry("one")], path)
+        finally:
+            os.umask(old_umask)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o644)
+        
+        path.chmod(0o640)
+        export_apkg([entry("one")], path)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+    
+    def test_parse_fields(self):
+        """Test unknown fields raise ValueError."""
+        self.assertEqual(parse_fields("sm2,language"), ("sm2", "language"))
+        with self.assertRaises(ValueError):
+            parse_fields("language,audio")
+    
+    def test_apkg_notes_and_schedule(self):
+        """Test the package holds one note per entry and cards keep their SM-2 state."""
+        due = (date.today() + timedelta(days=5)).isoformat()
+        entries = [
+            entry("new<word>"),
+            entry("known", language="ru", sm2_interval=6, sm2_easiness=2.2, sm2_repetitions=2,
+                  timesReviewed=3, correctCount=2, nextReview=due + "T08:00:00"),
+        ]
+        path = self.temp_dir / "deck.apkg"
+        self.assertEqual(export_apkg(entries, path, ("language",), chunk_size=1), 2)
+        
+        with zipfile.ZipFile(path) as package:
+            self.assertEqual(sorted(package.namelist()), ["collection.anki2", "media"])
+            collection = self.temp_dir / "collection.anki2"
+            collection.write_bytes(package.read("collection.anki2"))
+        conn = sqlite3.connect(str(collection))
+        try:
+            models = json.loads(conn.execute("SELECT models FROM col").fetchone()[0])
+            self.assertEqual([f["name"] for f in next(iter(models.values()))["flds"]],
+                             ["Front", "Back", "Language"])
+            notes = conn.execute("SELECT guid, flds, sfld FROM notes ORDER BY id").fetchall()
+            self.assertEqual(notes[0], (guid(entries[0]),
+                                        "new&lt;word&gt;\x1f[noun] meaning of new&lt;word&gt;\x1fen",
+                                        "new<word>"))
+            cards = conn.execute(
+                "SELECT type, queue, due, ivl, factor, reps, lapses FROM cards ORDER BY id"
+            ).fetchall()
+            self.assertEqual(cards, [(0, 0, 1, 0, 0, 0, 0), (2, 2, 5, 6, 2200, 3, 1)])
+        finally:
+            conn.close()
+    
+    def test_guid_is_stable(self):
+        """Test re-exports give a word the same GUID, distinct per language."""
+        self.assertEqual(guid(entry("dom")), guid(entry("dom", definition="house")))
+        self.assertNotEqual(guid(entry("dom")), guid(entry("dom", language="ru")))
+    
+    def test_vocabulary_export_streams_sqlite(self):
+        """Test Vocabulary.export_anki reads the SQLite store across chunks."""
+        vocabulary = Vocabulary(vocab_file=self.temp_dir / "vocabulary.json")
+        self.assertIsInstance(vocabulary.store, SQLiteStore)
+        vocabulary.store.CHUNK_SIZE = 3
+        vocabulary.store.add_many([entry(f"w{i}") for i in range(10)])
+        
+        self.assertEqual(vocabulary.export_anki(str(self.temp_dir / "out.csv")), 10)
+        self.assertEqual([r[0] for r in read_csv(self.temp_dir / "out.csv")],
+                         [f"w{i}" for i in range(10)])
+        self.assertEqual(vocabulary.export_anki(str(self.temp_dir / "out.apkg")), 10)
+        vocabulary.store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,7 +13,10 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.cache import Cache
+from core.cache import (
+    Cache, FileBackend, MemoryCache, SQLiteBackend,
+    decode_payload, payload_codec, NOT_FOUND, ERROR
+)
 
 
 class TestCache(unittest.TestCase):
@@ -128,6 +131,493 @@ class TestCache(unittest.TestCase):
         self.assertEqual(result, complex_data)
         self.assertEqual(len(result["meanings"]), 2)
         self.assertEqual(result["nested"]["deep"]["value"], True)
+    
+    def test_keys_skip_negative_entries(self):
+        """Test keys() lists cached definitions but not negative markers."""
+        self.cache.set("run", "en", {"word": "run"})
+        self.cache.set("walk", "en", {"word": "walk"})
+        self.cache.set("бег", "ru", {"word": "бег"})
+        self.cache.set_negative("runn", "en", NOT_FOUND)
+        self.cache.set_negative("wlak", "en", ERROR)
+        
+        self.assertEqual(sorted(self.cache.keys("en")), ["run", "walk"])
+        self.assertEqual(self.cache.keys("ru"), ["бег"])
+    
+    def test_keys_with_overlapping_ttls(self):
+        """Test definitions are listed even when they live shorter than negative entries."""
+        cache = Cache(cache_dir=Path(self.temp_dir) / "short", ttl_days=1,
+                      hard_ttl_days=1, negative_ttl=7 * 86400)
+        cache.set("run", "en", {"word": "run"})
+        cache.set_negative("runn", "en", NOT_FOUND)
+        
+        self.assertEqual(cache.keys("en"), ["run"])
+        cache.backend.close()
+
+
+class TestCacheBackends(unittest.TestCase):
+    """Test the pluggable storage backends."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_default_backend_is_sqlite(self):
+        """Test that the default cache stores entries in one database file."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        self.assertIsInstance(cache.backend, SQLiteBackend)
+        
+        cache.set("hello", "en", {"word": "hello"})
+        self.assertTrue((Path(self.temp_dir) / "cache.db").exists())
+        self.assertEqual(list(Path(self.temp_dir).glob("*.json")), [])
+    
+    def test_file_backend_round_trip(self):
+        """Test that the legacy backend writes one JSON file per word."""
+        cache = Cache(cache_dir=Path(self.temp_dir), backend="file")
+        self.assertIsInstance(cache.backend, FileBackend)
+        
+        cache.set("hello", "en", {"word": "hello"})
+        self.assertEqual(cache.get("hello", "en"), {"word": "hello"})
+        self.assertTrue((Path(self.temp_dir) / f"{cache._hash('hello', 'en')}.json").exists())
+    
+    def test_unknown_backend_rejected(self):
+        """Test that an unknown backend name raises."""
+        with self.assertRaises(ValueError):
+            Cache(cache_dir=Path(self.temp_dir), backend="redis")
+    
+    def test_expired_entry_is_dropped(self):
+        """Test that entries past their expiry are not returned."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        cache.backend.set("en", "old", b'{"word": "old"}', time.time() - 1)
+        
+        self.assertIsNone(cache.get("old", "en"))
+        self.assertIsNone(cache.backend.get("en", "old"))
+    
+    def test_legacy_files_migrated(self):
+        """Test that legacy md5 JSON files are imported into SQLite."""
+        legacy = Cache(cache_dir=Path(self.temp_dir), backend="file")
+        legacy.set("привет", "ru", {
+            "word": "привет", "language": "ru",
+            "original_input": "privet", "normalized": "привет"
+        })
+        legacy.set("hello:translate", "en", {
+            "word": "hello", "language": "en", "original_input": "hello"
+        })
+        # Unrecoverable key: left in place
+        (Path(self.temp_dir) / "0123456789abcdef0123456789abcdef.json").write_text(
+            json.dumps({"word": "x", "language": "en"}), encoding="utf-8"
+        )
+        
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        
+        self.assertEqual(cache.get("привет", "ru")["original_input"], "privet")
+        self.assertEqual(cache.get("hello:translate", "en")["word"], "hello")
+        self.assertEqual(len(list(Path(self.temp_dir).glob("*.json"))), 1)
+    
+    def test_migration_runs_once(self):
+        """Test that the migration is not repeated on later opens."""
+        Cache(cache_dir=Path(self.temp_dir)).backend.close()
+        
+        legacy = Cache(cache_dir=Path(self.temp_dir), backend="file")
+        legacy.set("late", "en", {"word": "late", "language": "en", "original_input": "late"})
+        
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        self.assertIsNone(cache.get("late", "en"))
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Test the in-process LRU tier."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first."""
+        memory = MemoryCache(max_entries=2)
+        expires = time.time() + 60
+        memory.put("en", "a", 1, 10, expires)
+        memory.put("en", "b", 2, 10, expires)
+        memory.get("en", "a")               # a is now most recent
+        memory.put("en", "c", 3, 10, expires)
+        
+        self.assertEqual(memory.get("en", "a"), 1)
+        self.assertIsNone(memory.get("en", "b"))
+        self.assertEqual(memory.get("en", "c"), 3)
+    
+    def test_eviction_by_bytes(self):
+        """Test that the byte budget is enforced."""
+        memory = MemoryCache(max_entries=100, max_bytes=25)
+        expires = time.time() + 60
+        for key in ("a", "b", "c"):
+            memory.put("en", key, key, 10, expires)
+        
+        self.assertEqual(len(memory), 2)
+        self.assertLessEqual(memory.size, 25)
+        self.assertIsNone(memory.get("en", "a"))
+    
+    def test_hit_miss_counters(self):
+        """Test that hits and misses are counted."""
+        memory = MemoryCache()
+        memory.put("en", "a", 1, 1, time.time() + 60)
+        memory.get("en", "a")
+        memory.get("en", "missing")
+        
+        stats = memory.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+    
+    def test_backend_hit_is_promoted(self):
+        """Test that a disk hit is served from memory afterwards."""
+        Cache(cache_dir=Path(self.temp_dir)).set("hello", "en", {"word": "hello"})
+        
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        self.assertEqual(cache.get("hello", "en"), {"word": "hello"})
+        self.assertEqual(cache.memory.stats()["misses"], 1)
+        
+        cache.backend.delete("en", "hello")
+        self.assertEqual(cache.get("hello", "en"), {"word": "hello"})
+        self.assertEqual(cache.memory.stats()["hits"], 1)
+    
+    def test_set_writes_through(self):
+        """Test that set updates both tiers."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        cache.set("hello", "en", {"word": "hello"})
+        
+        self.assertEqual(cache.memory.get("en", "hello"), {"word": "hello"})
+        self.assertIsNotNone(cache.backend.get("en", "hello"))
+    
+    def test_clear_empties_memory(self):
+        """Test that clear drops the memory tier too."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        cache.set("hello", "en", {"word": "hello"})
+        cache.clear()
+        
+        self.assertEqual(len(cache.memory), 0)
+        self.assertIsNone(cache.get("hello", "en"))
+
+
+class TestCacheCodecs(unittest.TestCase):
+    """Test payload compression codecs."""
+    
+    DATA = {
+        "word": "run",
+        "meanings": [{"partOfSpeech": "verb", "definitions": [
+            {"definition": f"to move quickly ({i})"} for i in range(20)
+        ]}]
+    }
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_codecs_round_trip(self):
+        """Test that every codec reads back what it wrote."""
+        for codec in ("json", "zlib", "lzma"):
+            with self.subTest(codec=codec):
+                cache = Cache(cache_dir=Path(self.temp_dir), codec=codec)
+                cache.set("run", "en", self.DATA)
+                payload = cache.backend.get("en", "run")[0]
+                
+                self.assertEqual(payload_codec(payload), codec)
+                self.assertEqual(decode_payload(payload), self.DATA)
+                cache.memory.clear()
+                self.assertEqual(cache.get("run", "en"), self.DATA)
+    
+    def test_compression_shrinks_payload(self):
+        """Test that compressed payloads are smaller than compact JSON."""
+        cache = Cache(cache_dir=Path(self.temp_dir), codec="json")
+        cache.set("run", "en", self.DATA)
+        plain = len(cache.backend.get("en", "run")[0])
+        
+        cache = Cache(cache_dir=Path(self.temp_dir), codec="zlib")
+        cache.set("run", "en", self.DATA)
+        self.assertLess(len(cache.backend.get("en", "run")[0]), plain)
+    
+    def test_legacy_payload_readable(self):
+        """Test that headerless pretty-printed JSON still decodes."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        legacy = json.dumps(self.DATA, ensure_ascii=False, indent=2).encode("utf-8")
+        cache.backend.set("en", "run", legacy, time.time() + 60)
+        
+        self.assertEqual(payload_codec(legacy), "legacy")
+        self.assertEqual(cache.get("run", "en"), self.DATA)
+    
+    def test_unknown_codec_rejected(self):
+        """Test that an unknown codec name raises."""
+        with self.assertRaises(ValueError):
+            Cache(cache_dir=Path(self.temp_dir), codec="brotli")
+    
+    def test_stats(self):
+        """Test storage statistics over a mixed-format cache."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        cache.set("run", "en", self.DATA)
+        cache.backend.set("en", "old", b'{"word": "old"}', time.time() + 60)
+        
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["codecs"], {"zlib": 1, "legacy": 1})
+        self.assertLess(stats["stored_bytes"], stats["raw_bytes"])
+
+
+class TestCacheEviction(unittest.TestCase):
+    """Test size bounds, eviction policies and the sweeper."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def make_backend(self):
+        return SQLiteBackend(Path(self.temp_dir) / "cache.db")
+    
+    def test_totals_track_writes(self):
+        """Test that running totals follow inserts, updates and deletes."""
+        backend = self.make_backend()
+        expires = time.time() + 60
+        backend.set("en", "a", b"x" * 10, expires)
+        backend.set("en", "b", b"x" * 20, expires)
+        backend.set("en", "a", b"x" * 5, expires)   # overwrite
+        self.assertEqual(backend.totals(), (2, 25))
+        
+        backend.delete("en", "b")
+        self.assertEqual(backend.totals(), (1, 5))
+        backend.clear()
+        self.assertEqual(backend.totals(), (0, 0))
+    
+    def test_sweep_removes_expired(self):
+        """Test that expired entries are purged."""
+        backend = self.make_backend()
+        backend.set("en", "old", b"x", time.time() - 1)
+        backend.set("en", "new", b"x", time.time() + 60)
+        
+        self.assertEqual(backend.sweep(), (1, 0))
+        self.assertIsNone(backend.get("en", "old"))
+        self.assertIsNotNone(backend.get("en", "new"))
+    
+    def test_lru_eviction(self):
+        """Test that least recently used entries are evicted first."""
+        backend = self.make_backend()
+        expires = time.time() + 60
+        for key in ("a", "b", "c"):
+            backend.set("en", key, b"x", expires)
+            time.sleep(0.01)
+        backend.get("en", "a")
+        
+        self.assertEqual(backend.sweep(max_entries=2, policy="lru"), (0, 1))
+        self.assertIsNone(backend.get("en", "b"))
+        self.assertIsNotNone(backend.get("en", "a"))
+    
+    def test_lfu_eviction(self):
+        """Test that least frequently used entries are evicted first."""
+        backend = self.make_backend()
+        expires = time.time() + 60
+        for key in ("a", "b", "c"):
+            backend.set("en", key, b"x", expires)
+        for _ in range(3):
+            backend.get("en", "a")
+            backend.get("en", "c")
+        
+        backend.sweep(max_entries=2, policy="lfu")
+        self.assertIsNone(backend.get("en", "b"))
+    
+    def test_byte_bound(self):
+        """Test eviction by stored size."""
+        backend = self.make_backend()
+        expires = time.time() + 60
+        for i in range(10):
+            backend.set("en", f"w{i}", b"x" * 100, expires)
+        
+        backend.sweep(max_bytes=450)
+        self.assertLessEqual(backend.totals()[1], 450)
+    
+    def test_sweep_limit(self):
+        """Test that a limited sweep deletes at most the batch size."""
+        backend = self.make_backend()
+        for i in range(10):
+            backend.set("en", f"w{i}", b"x", time.time() - 1)
+        
+        self.assertEqual(backend.sweep(limit=4), (4, 0))
+        self.assertEqual(backend.totals()[0], 6)
+    
+    def test_cache_enforces_bounds_on_set(self):
+        """Test that writes past the bound trigger a sweep."""
+        cache = Cache(cache_dir=Path(self.temp_dir), max_entries=10, max_bytes=None)
+        for i in range(25):
+            cache.set(f"w{i}", "en", {"word": f"w{i}"})
+        
+        self.assertLessEqual(cache.backend.totals()[0], 10)
+    
+    def test_reads_while_another_writer_holds_the_lock(self):
+        """Test lookups succeed during another connection's write and accesses are kept."""
+        import sqlite3
+        cache = Cache(cache_dir=Path(self.temp_dir), memory_entries=0)
+        cache.set("hello", "en", {"word": "hello"})
+        
+        writer = sqlite3.connect(str(Path(self.temp_dir) / "cache.db"), isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            self.assertEqual(cache.get("hello", "en"), {"word": "hello"})
+            self.assertFalse(cache.backend.flush_access())
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        
+        self.assertTrue(cache.backend.flush_access())
+        hits = cache.backend._conn.execute("SELECT hits FROM entries").fetchone()[0]
+        self.assertEqual(hits, 1)
+    
+    def test_unreadable_backend_is_a_miss(self):
+        """Test a failing backend read is treated as a cache miss."""
+        import sqlite3
+        cache = Cache(cache_dir=Path(self.temp_dir), memory_entries=0)
+        cache.set("hello", "en", {"word": "hello"})
+        
+        def locked(lang, key):
+            raise sqlite3.OperationalError("database is locked")
+        cache.backend.get = locked
+        self.assertIsNone(cache.get("hello", "en"))
+    
+    def test_upgrade_from_version_1(self):
+        """Test that a database without access tracking is upgraded."""
+        import sqlite3
+        db = Path(self.temp_dir) / "cache.db"
+        conn = sqlite3.connect(str(db))
+        conn.execute(
+            "CREATE TABLE entries (lang TEXT NOT NULL, key TEXT NOT NULL, "
+            "data BLOB NOT NULL, created_at REAL NOT NULL, expires_at REAL NOT NULL, "
+            "PRIMARY KEY (lang, key)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "INSERT INTO entries VALUES ('en', 'old', ?, ?, ?)",
+            (b'{"word": "old"}', time.time(), time.time() + 60)
+        )
+        conn.commit()
+        conn.close()
+        
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        self.assertEqual(cache.get("old", "en"), {"word": "old"})
+        self.assertEqual(cache.backend.totals(), (1, 15))
+    
+    def test_upgrade_from_version_2_flags_markers(self):
+        """Test negative markers written before the negative column are flagged."""
+        import sqlite3
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        cache.set("run", "en", {"word": "run"})
+        cache.set_negative("runn", "en", NOT_FOUND)
+        cache.set_negative("wlak", "en", ERROR)
+        cache.backend.close()
+        
+        # Turn the database back into version 2
+        conn = sqlite3.connect(str(Path(self.temp_dir) / "cache.db"))
+        conn.execute("ALTER TABLE entries DROP COLUMN negative")
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+        conn.close()
+        
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        self.assertEqual(cache.keys("en"), ["run"])
+        self.assertEqual(cache.get_negative("runn", "en"), NOT_FOUND)
+        cache.backend.close()
+
+
+class TestNegativeCache(unittest.TestCase):
+    """Test negative entries for not-found and failed lookups."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = Cache(cache_dir=Path(self.temp_dir))
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_negative_entry_hidden_from_get(self):
+        """Test that get() never returns a negative marker."""
+        self.cache.set_negative("xyzzy", "en", NOT_FOUND)
+        
+        self.assertIsNone(self.cache.get("xyzzy", "en"))
+        self.assertEqual(self.cache.get_negative("xyzzy", "en"), NOT_FOUND)
+    
+    def test_positive_entry_is_not_negative(self):
+        """Test that ordinary entries are not reported as negative."""
+        self.cache.set("hello", "en", {"word": "hello"})
+        self.assertIsNone(self.cache.get_negative("hello", "en"))
+    
+    def test_negative_ttls(self):
+        """Test that not-found and error entries get their own TTLs."""
+        cache = Cache(cache_dir=Path(self.temp_dir), negative_ttl=3600, error_ttl=10)
+        cache.set_negative("missing", "en", NOT_FOUND)
+        cache.set_negative("offline", "en", ERROR)
+        
+        now = time.time()
+        self.assertAlmostEqual(cache.backend.get("en", "missing")[2], now + 3600, delta=5)
+        self.assertAlmostEqual(cache.backend.get("en", "offline")[2], now + 10, delta=5)
+    
+    def test_error_backoff_grows(self):
+        """Test that repeated failures back off exponentially."""
+        cache = Cache(cache_dir=Path(self.temp_dir), error_ttl=10)
+        for _ in range(3):
+            cache.set_negative("offline", "en", ERROR)
+        
+        now = time.time()
+        self.assertAlmostEqual(cache.backend.get("en", "offline")[2], now + 40, delta=5)
+    
+    def test_set_replaces_negative(self):
+        """Test that a real result overrides a negative entry."""
+        self.cache.set_negative("word", "en", ERROR)
+        self.cache.set("word", "en", {"word": "word"})
+        
+        self.assertEqual(self.cache.get("word", "en"), {"word": "word"})
+        self.assertIsNone(self.cache.get_negative("word", "en"))
+
+
+class TestStaleEntries(unittest.TestCase):
+    """Test soft (stale) and hard TTLs."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_fresh_entry(self):
+        """Test that a new entry is not stale."""
+        cache = Cache(cache_dir=Path(self.temp_dir), ttl_days=1)
+        cache.set("hello", "en", {"word": "hello"})
+        
+        self.assertEqual(cache.get_entry("hello", "en"), ({"word": "hello"}, False))
+    
+    def test_stale_entry_kept_until_hard_ttl(self):
+        """Test that entries past the soft TTL are flagged, not dropped."""
+        cache = Cache(cache_dir=Path(self.temp_dir), ttl_days=0, hard_ttl_days=1)
+        cache.set("hello", "en", {"word": "hello"})
+        time.sleep(0.01)
+        
+        self.assertEqual(cache.get_entry("hello", "en"), ({"word": "hello"}, True))
+        self.assertIsNone(cache.get("hello", "en"))
+        self.assertEqual(cache.get("hello", "en", allow_stale=True), {"word": "hello"})
+    
+    def test_staleness_survives_reopen(self):
+        """Test that staleness is derived from the stored creation time."""
+        cache = Cache(cache_dir=Path(self.temp_dir))
+        created = time.time() - 40 * 86400
+        cache.backend.set_many([("en", "old", b'{"word": "old"}', created, time.time() + 60)])
+        
+        reopened = Cache(cache_dir=Path(self.temp_dir), ttl_days=30)
+        self.assertEqual(reopened.get_entry("old", "en"), ({"word": "old"}, True))
 
 
 class TestCacheExpiration(unittest.TestCase):
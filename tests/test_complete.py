@@ -0,0 +1,99 @@
+"""
+Tests for prefix completion and the shell completion scripts.
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cli
+from languages import complete
+from languages.complete import PrefixIndex
+from languages.english import English
+from languages.russian import Russian
+from tests.helpers import temp_cache_home
+
+setUpModule, tearDownModule = temp_cache_home()
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test prefix search and word-at-a-time completion."""
+    
+    def setUp(self):
+        self.index = PrefixIndex([
+            "how are you", "How  are things", "however", "hello",
+            "как дела", "kak dela", "привет", "privet", "",
+        ])
+    
+    def complete(self, text):
+        return complete.complete(text, index=self.index)
+    
+    def test_iter_prefix(self):
+        """Test terms are normalized, deduplicated and found by prefix."""
+        self.assertEqual(len(self.index), 8)
+        self.assertEqual(list(self.index.iter_prefix("how ")),
+                         ["how are things", "how are you"])
+        self.assertEqual(list(self.index.iter_prefix("zzz")), [])
+    
+    def test_first_word(self):
+        """Test the first word completes from every term."""
+        self.assertEqual(self.complete("ho"), ["how", "however"])
+        self.assertEqual(self.complete("H"), ["hello", "how", "however"])
+    
+    def test_next_words(self):
+        """Test phrases complete one word at a time."""
+        self.assertEqual(self.complete("how ar"), ["are"])
+        self.assertEqual(self.complete("how are "), ["things", "you"])
+        self.assertEqual(self.complete("how  are t"), ["things"])
+    
+    def test_both_scripts(self):
+        """Test Cyrillic and transliterated input."""
+        self.assertEqual(self.complete("пр"), ["привет"])
+        self.assertEqual(self.complete("kak d"), ["dela"])
+    
+    def test_empty_and_limit(self):
+        """Test empty input lists first words, up to the limit."""
+        self.assertEqual(len(self.complete("")), 7)
+        self.assertEqual(complete.complete("", limit=2, index=self.index), ["hello", "how"])
+
+
+class TestCompletionIndex(unittest.TestCase):
+    """Test the index built from the language data."""
+    
+    def test_sources_match_languages(self):
+        """Test SOURCES covers the languages' SUGGEST_SOURCES."""
+        self.assertEqual(complete.SOURCES, English.SUGGEST_SOURCES + Russian.SUGGEST_SOURCES)
+    
+    def test_local_data(self):
+        """Test headwords of both languages and translit spellings complete."""
+        index = complete.load_index()
+        self.assertIn("привет", complete.complete("прив", index=index))
+        self.assertIn("privet", complete.complete("priv", index=index))
+        self.assertIn("dela", complete.complete("kak d", index=index))
+        self.assertIn("definitely", complete.complete("defin", index=index))
+    
+    def test_no_transliteration_aliases(self):
+        """Test only canonical Latin spellings complete, not the yo/ye lookup aliases."""
+        completions = complete.complete("pri", index=complete.load_index())
+        self.assertIn("prigotovit", completions)
+        for alias in ("prigyotyovit", "priryoda", "priyatnyogyo"):
+            self.assertNotIn(alias, completions)
+
+
+class TestCompletionScripts(unittest.TestCase):
+    """Test the generated bash and zsh scripts."""
+    
+    def test_scripts(self):
+        """Test both scripts call --complete and list the options."""
+        for shell in ("bash", "zsh"):
+            script = cli.completion_script(shell)
+            self.assertIn("--complete", script)
+            self.assertIn("--stats", script)
+            self.assertIn("словарь", script)
+            self.assertNotIn("--refresh", script)
+
+
+if __name__ == "__main__":
+    unittest.main()
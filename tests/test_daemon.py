@@ -0,0 +1,212 @@
+"""
+Tests for the lookup daemon protocol and the CLI's request handler.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cli
+from core import daemon
+from core.cache import Cache
+from core.dictionary import Dictionary
+from core.vocabulary import Vocabulary
+from languages.base import LookupFailed
+from tests.helpers import temp_cache_home
+from tests.test_dictionary import StubLanguage
+
+setUpModule, tearDownModule = temp_cache_home()
+
+
+class TestDaemonProtocol(unittest.TestCase):
+    """Test the client against a server running in a thread."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "daemon.sock")
+        self.requests = []
+        self.release = threading.Event()
+        self.server = daemon.make_server(self.handle, self.path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def tearDown(self):
+        import shutil
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def handle(self, request):
+        self.requests.append(request)
+        if request["argv"] == ["--fallback"]:
+            return None
+        if request["argv"] == ["slow"]:
+            self.release.wait(5)
+        return {"code": 3, "stdout": "привет\n", "stderr": ""}
+    
+    def test_request_reply(self):
+        """Test a request reaches the handler and its reply comes back."""
+        reply = daemon.request(["privet"], self.path)
+        
+        self.assertEqual(reply["code"], 3)
+        self.assertEqual(reply["stdout"], "привет\n")
+        self.assertEqual(self.requests[0]["argv"], ["privet"])
+        self.assertEqual(self.requests[0]["cwd"], os.getcwd())
+    
+    def test_slow_request_does_not_block_others(self):
+        """Test a request waiting on the network does not hold up completions."""
+        slow = threading.Thread(target=daemon.request, args=(["slow"], self.path))
+        slow.start()
+        try:
+            reply = daemon.request(["--complete", "pri"], self.path)
+            self.assertEqual(reply["code"], 3)
+            self.assertTrue(slow.is_alive())
+        finally:
+            self.release.set()
+            slow.join()
+    
+    def test_handler_fallback(self):
+        """Test a handler returning None tells the client to run locally."""
+        self.assertIsNone(daemon.request(["--fallback"], self.path))
+        self.assertIsNone(daemon.forward(["--fallback"], self.path))
+    
+    def test_no_daemon(self):
+        """Test a missing socket falls back instead of failing."""
+        missing = os.path.join(self.temp_dir, "missing.sock")
+        self.assertIsNone(daemon.forward(["hello"], missing))
+    
+    def test_version_mismatch_falls_back(self):
+        """Test requests from another protocol version are not handled."""
+        import marshal
+        import socket
+        
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(marshal.dumps({"version": 0, "argv": ["hello"]}))
+            sock.shutdown(socket.SHUT_WR)
+            reply = marshal.loads(sock.makefile("rb").read())
+        
+        self.assertEqual(reply, {"fallback": True})
+        self.assertEqual(self.requests, [])
+    
+    def test_alive(self):
+        """Test detection of a running daemon versus a stale socket."""
+        self.assertTrue(daemon._alive(self.path))
+        self.assertFalse(daemon._alive(os.path.join(self.temp_dir, "missing.sock")))
+
+
+class TestServeRequest(unittest.TestCase):
+    """Test running forwarded command lines inside the daemon."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        cache = Cache(cache_dir=Path(self.temp_dir) / "cache")
+        self.components = SimpleNamespace(
+            cache=cache,
+            vocabulary=Vocabulary(Path(self.temp_dir) / "vocab.json"),
+            audio=None,
+            languages=[],
+            dictionary=Dictionary([], cache),
+        )
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def serve(self, *argv):
+        return cli.serve_request({"argv": list(argv), "cwd": self.temp_dir, "tty": False},
+                                 self.components)
+    
+    def test_output_captured(self):
+        """Test command output is returned rather than printed."""
+        reply = self.serve("--stats")
+        
+        self.assertEqual(reply["code"], 0)
+        self.assertIn("Total words", reply["stdout"])
+    
+    def test_cwd_restored(self):
+        """Test the client's working directory is used and then restored."""
+        cwd = os.getcwd()
+        self.serve("--stats")
+        self.assertEqual(os.getcwd(), cwd)
+    
+    def test_relative_export_path_uses_client_cwd(self):
+        """Test --export-anki FILE lands in the client's directory."""
+        self.components.vocabulary.save({"word": "hello"})
+        reply = self.serve("--export-anki", "out.csv")
+        
+        self.assertEqual(reply["code"], 0)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "out.csv")))
+    
+    def test_vocabulary_commands_see_json_changes(self):
+        """Test cards the Bash version adds while the daemon runs are picked up."""
+        self.assertIn("Total words:    0", self.serve("--stats")["stdout"])
+        (Path(self.temp_dir) / "vocab.json").write_text('[{"word": "hello"}]', encoding="utf-8")
+        self.assertIn("Total words:    1", self.serve("--stats")["stdout"])
+    
+    def test_concurrent_output_kept_apart(self):
+        """Test each request thread captures only its own output."""
+        import io
+        import sys
+        saved = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = cli._ThreadOutput(sys.stdout), cli._ThreadOutput(sys.stderr)
+        barrier = threading.Barrier(2)
+        captured = {}
+        
+        def speak(name):
+            out = io.StringIO()
+            with cli._captured(out, io.StringIO()):
+                barrier.wait()
+                for _ in range(50):
+                    print(name)
+            captured[name] = out.getvalue()
+        
+        try:
+            threads = [threading.Thread(target=speak, args=(name,)) for name in ("a", "b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.stdout, sys.stderr = saved
+        
+        self.assertEqual(captured, {"a": "a\n" * 50, "b": "b\n" * 50})
+    
+    def test_lookup_failure_reported_once(self):
+        """Test an upstream failure is reported once, by the CLI, with the TLS hint."""
+        class Untrusted(StubLanguage):
+            def lookup(self, word, translate=False):
+                raise LookupFailed("[SSL: CERTIFICATE_VERIFY_FAILED] certificate verify failed")
+        
+        self.components.dictionary = Dictionary([Untrusted()], self.components.cache)
+        reply = self.serve("hello")
+        self.assertEqual(reply["code"], 1)
+        self.assertEqual(reply["stderr"].count("Network error"), 1)
+        self.assertEqual(reply["stderr"].count("Install\\ Certificates"), 1)
+        
+        # Within the error TTL the cached failure is reported, without the hint
+        reply = self.serve("hello")
+        self.assertIn("failed recently", reply["stderr"])
+        self.assertNotIn("Certificates", reply["stderr"])
+    
+    def test_interactive_commands_fall_back(self):
+        """Test commands needing the terminal are handed back to the client."""
+        for flag in ("--review", "--quiz", "--study", "--daemon"):
+            self.assertIsNone(self.serve(flag), flag)
+    
+    def test_argument_errors_fall_back(self):
+        """Test argparse errors and --help are left to the client."""
+        self.assertIsNone(self.serve("--no-such-flag"))
+        self.assertIsNone(self.serve("--help"))
+
+
+if __name__ == "__main__":
+    unittest.main()
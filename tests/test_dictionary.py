@@ -2,17 +2,72 @@
 Tests for the Dictionary orchestrator.
 """
 
+import asyncio
 import tempfile
+import time
 import unittest
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.cache import Cache
-from core.dictionary import Dictionary
+from core.cache import Cache, NOT_FOUND, ERROR
+from core.dictionary import AsyncDictionary, Dictionary
+from languages.base import Language, LookupFailed
 from languages.english import English
 from languages.russian import Russian
+from tests.helpers import temp_cache_home
+
+setUpModule, tearDownModule = temp_cache_home()
+
+
+class StubLanguage(Language):
+    """Language double that counts upstream calls."""
+    
+    code = "en"
+    name = "Stub"
+    native_name = "Stub"
+    
+    def __init__(self, results=None, fail=False, delays=None):
+        self.results = results or {}
+        self.fail = fail
+        self.delays = delays or {}
+        self.calls = 0
+    
+    def detect(self, text: str) -> bool:
+        return True
+    
+    def normalize(self, text: str) -> str:
+        return text.lower()
+    
+    def lookup(self, word: str, translate: bool = False):
+        self.calls += 1
+        if word in self.delays:
+            time.sleep(self.delays[word])
+        if self.fail is True or word == self.fail:
+            raise LookupFailed("offline")
+        result = self.results.get(word)
+        return dict(result) if result else None
+
+
+class AsyncStubLanguage(StubLanguage):
+    """Native-async language double; its sync lookup must not be used."""
+    
+    code = "ru"
+    
+    def detect(self, text: str) -> bool:
+        return any("\u0400" <= c <= "\u04ff" for c in text)
+    
+    def lookup(self, word: str, translate: bool = False):
+        raise AssertionError("sync lookup called on a native-async plugin")
+    
+    async def alookup(self, word: str, translate: bool = False):
+        self.calls += 1
+        await asyncio.sleep(self.delays.get(word, 0))
+        if self.fail is True or word == self.fail:
+            raise LookupFailed("offline")
+        result = self.results.get(word)
+        return dict(result) if result else None
 
 
 class TestDictionary(unittest.TestCase):
@@ -117,6 +172,42 @@ class TestDictionaryLookup(TestDictionary):
             self.assertEqual(result1.get("word"), result2.get("word"))
 
 
+class TestSuggest(TestDictionary):
+    """Test "did you mean" suggestions."""
+    
+    def test_english_misspelling(self):
+        """Test a misspelled English word suggests the correct spelling."""
+        self.assertEqual(self.dictionary.suggest("definately")[0], "definitely")
+    
+    def test_cyrillic(self):
+        """Test a misspelled Cyrillic word."""
+        self.assertEqual(self.dictionary.suggest("спосибо")[0], "спасибо")
+    
+    def test_transliterated_latin(self):
+        """Test Latin input is matched against Russian headwords."""
+        self.assertIn("привет", self.dictionary.suggest("privat"))
+        self.assertIn("как дела", self.dictionary.suggest("kak dila"))
+    
+    def test_cached_words(self):
+        """Test previously looked-up words are suggested, failed ones not."""
+        self.cache.set("serendipity", "en", {"word": "serendipity"})
+        self.cache.set_negative("serendipitty", "en", NOT_FOUND)
+        
+        suggestions = self.dictionary.suggest("serendipty")
+        
+        self.assertIn("serendipity", suggestions)
+        self.assertNotIn("serendipitty", suggestions)
+    
+    def test_input_not_suggested(self):
+        """Test the input itself is never suggested back."""
+        self.assertNotIn("definitely", self.dictionary.suggest("definitely"))
+    
+    def test_forced_language(self):
+        """Test force_lang restricts suggestions to one language."""
+        for term in self.dictionary.suggest("privat", force_lang="en"):
+            self.assertFalse(any("\u0400" <= c <= "\u04ff" for c in term))
+
+
 class TestRandomWord(TestDictionary):
     """Test random word feature."""
     
@@ -162,5 +253,273 @@ class TestDictionaryIntegration(TestDictionary):
             self.assertEqual(result.get("language"), "ru")
 
 
+class TestNegativeCaching(unittest.TestCase):
+    """Test that misses and failures are cached and short-circuited."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = Cache(cache_dir=Path(self.temp_dir), ttl_days=1)
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_not_found_is_cached(self):
+        """Test that a second lookup of a missing word skips the upstream."""
+        stub = StubLanguage()
+        dictionary = Dictionary([stub], self.cache)
+        
+        self.assertIsNone(dictionary.lookup("xyzzy"))
+        self.assertIsNone(dictionary.lookup("xyzzy"))
+        self.assertEqual(stub.calls, 1)
+        self.assertEqual(self.cache.get_negative("xyzzy", "en"), NOT_FOUND)
+    
+    def test_failure_is_cached_as_error(self):
+        """Test that upstream failures get a separate negative entry."""
+        stub = StubLanguage(fail=True)
+        dictionary = Dictionary([stub], self.cache)
+        
+        self.assertIsNone(dictionary.lookup("hello"))
+        self.assertIsNone(dictionary.lookup("hello"))
+        self.assertEqual(stub.calls, 1)
+        self.assertEqual(self.cache.get_negative("hello", "en"), ERROR)
+    
+    def test_raise_errors(self):
+        """Test raise_errors surfaces fresh and recently cached failures."""
+        dictionary = Dictionary([StubLanguage(fail="hello")], self.cache)
+        
+        with self.assertRaises(LookupFailed):
+            dictionary.lookup("hello", raise_errors=True)
+        with self.assertRaisesRegex(LookupFailed, "recently"):
+            dictionary.lookup("hello", raise_errors=True)
+        self.assertIsNone(dictionary.lookup("missing", raise_errors=True))
+    
+    def test_found_word_not_negative(self):
+        """Test that successful lookups are cached normally."""
+        stub = StubLanguage(results={"hello": {"word": "hello", "meanings": []}})
+        dictionary = Dictionary([stub], self.cache)
+        
+        self.assertIsNotNone(dictionary.lookup("hello"))
+        self.assertIsNone(self.cache.get_negative("hello", "en"))
+    
+    def test_cached_word_index_built_once(self):
+        """Test suggest() lists cached keys once and learns new lookups."""
+        stub = StubLanguage(results={"serendipity": {"word": "serendipity", "meanings": []}})
+        dictionary = Dictionary([stub], self.cache)
+        self.cache.set("colour", "en", {"word": "colour"})
+        
+        self.assertEqual(dictionary.suggest("colur"), ["colour"])
+        self.cache.keys = lambda *args: self.fail("cached keys listed again")
+        dictionary.lookup("serendipity")
+        self.assertEqual(dictionary.suggest("serendipty"), ["serendipity"])
+    
+    def test_cache_keys_limit(self):
+        """Test keys(limit=n) returns the most recently used keys."""
+        for word in ("a", "b", "c"):
+            self.cache.set(word, "en", {"word": word})
+            time.sleep(0.01)
+        
+        self.assertEqual(self.cache.keys("en", limit=2), ["c", "b"])
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """Test that stale entries are served while being refreshed."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = Cache(cache_dir=Path(self.temp_dir), ttl_days=0, hard_ttl_days=1)
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def wait_for_refresh(self, dictionary):
+        import time
+        for _ in range(200):
+            if not dictionary._refreshing:
+                return
+            time.sleep(0.01)
+        self.fail("background refresh did not finish")
+    
+    def test_stale_served_and_refreshed(self):
+        """Test that a stale hit returns at once and is refreshed in background."""
+        stub = StubLanguage(results={"hello": {"word": "hello", "version": 2}})
+        self.cache.set("hello", "en", {"word": "hello", "version": 1})
+        dictionary = Dictionary([stub], self.cache)
+        
+        result = dictionary.lookup("hello")
+        self.assertEqual(result["version"], 1)
+        
+        self.wait_for_refresh(dictionary)
+        self.assertEqual(stub.calls, 1)
+        self.assertEqual(self.cache.get("hello", "en", allow_stale=True)["version"], 2)
+    
+    def test_failed_refresh_keeps_stale(self):
+        """Test that a failing refresh does not drop the stale copy."""
+        stub = StubLanguage(fail=True)
+        self.cache.set("hello", "en", {"word": "hello"})
+        dictionary = Dictionary([stub], self.cache)
+        
+        self.assertIsNotNone(dictionary.lookup("hello"))
+        self.wait_for_refresh(dictionary)
+        
+        self.assertEqual(stub.calls, 1)
+        self.assertIsNotNone(dictionary.lookup("hello"))
+        self.wait_for_refresh(dictionary)
+        self.assertIsNone(self.cache.get_negative("hello", "en"))
+    
+    def test_offline_serves_stale_without_refresh(self):
+        """Test that offline mode returns stale entries without a refresh."""
+        stub = StubLanguage()
+        self.cache.set("hello", "en", {"word": "hello"})
+        dictionary = Dictionary([stub], self.cache)
+        
+        self.assertIsNotNone(dictionary.lookup("hello", offline=True))
+        self.assertEqual(stub.calls, 0)
+
+
+class TestLookupMany(unittest.TestCase):
+    """Test concurrent batch lookups."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = Cache(cache_dir=Path(self.temp_dir), ttl_days=1)
+        self.stub = StubLanguage(results={
+            word: {"word": word} for word in ("alpha", "beta", "gamma", "delta")
+        })
+        self.dictionary = Dictionary([self.stub], self.cache)
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_results_in_input_order(self):
+        """Test that ordered mode yields one result per input, in order."""
+        self.stub.delays = {"alpha": 0.05}
+        words = ["alpha", "beta", "missing", "gamma"]
+        
+        results = list(self.dictionary.lookup_many(words, concurrency=4))
+        
+        self.assertEqual([r[0] for r in results], words)
+        self.assertEqual(results[0][1]["word"], "alpha")
+        self.assertEqual(results[2], ("missing", None, None))
+    
+    def test_duplicates_fetched_once(self):
+        """Test that inputs with the same normalized key share one fetch."""
+        results = list(self.dictionary.lookup_many(["Alpha", "alpha", " ALPHA "]))
+        
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r[1]["word"] == "alpha" for r in results))
+        self.assertEqual(self.stub.calls, 1)
+    
+    def test_cache_hits_not_fetched(self):
+        """Test that cached words are served without an upstream call."""
+        self.dictionary.lookup("alpha")
+        calls = self.stub.calls
+        
+        results = list(self.dictionary.lookup_many(["alpha", "beta"]))
+        
+        self.assertEqual(self.stub.calls, calls + 1)
+        self.assertEqual(results[0][1]["word"], "alpha")
+    
+    def test_unordered_yields_cache_hits_first(self):
+        """Test that unordered mode streams hits before fetched words."""
+        self.dictionary.lookup("delta")
+        self.stub.delays = {"alpha": 0.1}
+        
+        results = list(self.dictionary.lookup_many(
+            ["alpha", "beta", "delta"], concurrency=2, ordered=False
+        ))
+        
+        self.assertEqual([r[0] for r in results], ["delta", "beta", "alpha"])
+    
+    def test_errors_reported_per_word(self):
+        """Test that a failing word is reported without aborting the batch."""
+        self.stub.fail = "beta"
+        
+        results = list(self.dictionary.lookup_many(["alpha", "beta", "gamma"]))
+        
+        self.assertIsNotNone(results[0][1])
+        self.assertIsNone(results[1][1])
+        self.assertIn("offline", results[1][2])
+        self.assertIsNotNone(results[2][1])
+        self.assertEqual(self.cache.get_negative("beta", "en"), ERROR)
+    
+    def test_offline_only_uses_cache(self):
+        """Test that offline batches never reach the upstream."""
+        results = list(self.dictionary.lookup_many(["alpha"], offline=True))
+        
+        self.assertEqual(results, [("alpha", None, None)])
+        self.assertEqual(self.stub.calls, 0)
+
+
+class TestAsyncDictionary(unittest.TestCase):
+    """Test the asyncio lookup path."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = Cache(cache_dir=Path(self.temp_dir), ttl_days=1)
+        self.en = StubLanguage(results={"hello": {"word": "hello"}},
+                               delays={"hello": 0.2})
+        self.ru = AsyncStubLanguage(results={"мир": {"word": "мир"}},
+                                    delays={"мир": 0.2})
+        self.dictionary = AsyncDictionary([self.en, self.ru], self.cache)
+    
+    def tearDown(self):
+        import shutil
+        self.dictionary.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_native_plugin_awaited(self):
+        """Test that native-async plugins are awaited, sync ones adapted."""
+        self.assertTrue(AsyncStubLanguage.is_async_native())
+        self.assertFalse(StubLanguage.is_async_native())
+        
+        result = asyncio.run(self.dictionary.alookup("мир", force_lang="ru"))
+        
+        self.assertEqual(result["word"], "мир")
+        self.assertEqual(self.ru.calls, 1)
+    
+    def test_languages_looked_up_concurrently(self):
+        """Test that sync and async plugins run side by side on one loop."""
+        async def both():
+            return await asyncio.gather(
+                self.dictionary.alookup("hello", force_lang="en"),
+                self.dictionary.alookup("мир", force_lang="ru"),
+            )
+        
+        start = time.monotonic()
+        en, ru = asyncio.run(both())
+        
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(en["word"], "hello")
+        self.assertEqual(ru["word"], "мир")
+    
+    def test_result_cached(self):
+        """Test that async lookups share the cache with sync ones."""
+        asyncio.run(self.dictionary.alookup("hello", force_lang="en"))
+        
+        self.assertIsNotNone(self.dictionary.lookup("hello", force_lang="en"))
+        self.assertEqual(self.en.calls, 1)
+    
+    def test_alookup_many(self):
+        """Test batch lookups with per-word errors, in input order."""
+        self.ru.fail = "плохо"
+        words = ["hello", "плохо", "hello"]
+        
+        results = asyncio.run(self.dictionary.alookup_many(words))
+        
+        self.assertEqual([r[0] for r in results], words)
+        self.assertEqual(results[0][1]["word"], "hello")
+        self.assertIsNone(results[1][1])
+        self.assertIn("offline", results[1][2])
+        self.assertEqual(self.en.calls, 1)
+    
+    def test_default_alookup_uses_executor(self):
+        """Test that the base class adapts sync plugins."""
+        result = asyncio.run(self.en.alookup("hello"))
+        self.assertEqual(result["word"], "hello")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for the batch SM-2 review forecast.
+"""
+
+import contextlib
+import io
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from array import array
+
+import cli
+from core.forecast import (ARRAY_MAX_DAYS, Deck, advance, advance_numpy, forecast, max_days,
+                           parse_qualities, _numpy)
+from core.vocabulary import SM2, Vocabulary
+from ui.formatter import Formatter
+
+
+def sample_deck(cards: int, seed: int = 1) -> Deck:
+    """Cards in every SM-2 state, due over the next 30 days."""
+    rng = random.Random(seed)
+    deck = Deck()
+    for _ in range(cards):
+        deck.repetitions.append(rng.randint(0, 6))
+        deck.easiness.append(rng.uniform(1.3, 2.8))
+        deck.interval.append(rng.choice((0, 1, 6, 15, 40)))
+        deck.due.append(rng.randint(0, 30))
+    return deck
+
+
+def reference_forecast(deck: Deck, days: int, qualities: dict, seed: int) -> list:
+    """
+    One card at a time through SM2.calculate, in the array backend's order
+    (cards due from the start by index, then in the order rescheduled).
+    """
+    grades, weights = list(qualities), list(qualities.values())
+    rng = random.Random(seed)
+    state = list(zip(deck.repetitions, deck.easiness, deck.interval))
+    calendar = [[card for card, due in enumerate(deck.due) if due == day] for day in range(days)]
+    counts = []
+    for day in range(days):
+        counts.append(len(calendar[day]))
+        for card, quality in zip(calendar[day], rng.choices(grades, weights, k=len(calendar[day]))):
+            state[card] = SM2.calculate(quality, *state[card])
+            if day + state[card][2] < days:
+                calendar[day + state[card][2]].append(card)
+    return counts
+
+
+class TestForecast(unittest.TestCase):
+    """Test the batch SM-2 engine and the simulation."""
+    
+    QUALITIES = {5: 25, 4: 35, 3: 20, 2: 10, 1: 7, 0: 3}
+    
+    STATES = [(reps, ease, interval) for reps in (0, 1, 2, 5)
+              for ease in (1.3, 1.42, 1.7, 2.5, 2.9) for interval in (0, 1, 6, 23)]
+    
+    def test_advance_matches_sm2(self):
+        """Test the batch step equals SM2.calculate card by card."""
+        cards = list(range(len(self.STATES)))
+        for quality in range(6):
+            reps, ease, interval = (array(t, c) for t, c in zip("ldl", zip(*self.STATES)))
+            intervals = advance(cards, [quality] * len(cards), reps, ease, interval)
+            expected = [SM2.calculate(quality, *state) for state in self.STATES]
+            self.assertEqual(list(zip(reps, ease, interval)), expected)
+            self.assertEqual(intervals, [state[2] for state in expected])
+    
+    @unittest.skipIf(_numpy() is None, "NumPy is not installed")
+    def test_advance_numpy_matches_sm2(self):
+        """Test the NumPy step equals SM2.calculate card by card."""
+        np = _numpy()
+        cards = np.arange(len(self.STATES))
+        for quality in range(6):
+            reps, ease, interval = (np.array(c) for c in zip(*self.STATES))
+            advance_numpy(np, cards, np.full(len(cards), quality), reps, ease, interval)
+            expected = [SM2.calculate(quality, *state) for state in self.STATES]
+            self.assertEqual(list(zip(reps.tolist(), ease.tolist(), interval.tolist())),
+                             expected)
+    
+    def test_forecast_matches_reference(self):
+        """Test the simulation equals rating each card with SM2.calculate."""
+        deck = sample_deck(500)
+        self.assertEqual(forecast(deck, 60, self.QUALITIES, seed=7, backend="array"),
+                         reference_forecast(deck, 60, self.QUALITIES, seed=7))
+    
+    @unittest.skipIf(_numpy() is None, "NumPy is not installed")
+    def test_numpy_agrees_with_array(self):
+        """Test the backends agree on total load and on a deterministic run."""
+        deck = sample_deck(5000)
+        numpy_counts = forecast(deck, 90, seed=3, backend="numpy")
+        array_counts = forecast(deck, 90, seed=3, backend="array")
+        self.assertEqual(numpy_counts, forecast(deck, 90, seed=3, backend="numpy"))
+        self.assertAlmostEqual(sum(numpy_counts) / sum(array_counts), 1, delta=0.05)
+        self.assertEqual(forecast(deck, 90, {4: 1}, backend="numpy"),
+                         forecast(deck, 90, {4: 1}, backend="array"))
+    
+    def test_deck_from_schedule(self):
+        """Test overdue cards are due today and later ones on their day."""
+        today = date(2026, 3, 10)
+        deck = Deck.from_schedule([
+            (0, 2.5, 0, "2026-01-01T08:00:00"),
+            (1, 2.5, 1, "2026-03-10T23:00:00"),
+            (2, 2.1, 6, "2026-03-16T07:30:00.123456"),
+        ], today=today)
+        self.assertEqual(list(deck.due), [0, 0, 6])
+        self.assertEqual(list(deck.easiness), [2.5, 2.5, 2.1])
+    
+    def test_parse_qualities(self):
+        """Test quality distributions parse and bad ones raise ValueError."""
+        self.assertEqual(parse_qualities("5:1, 3:2,3:1"), {5: 1.0, 3: 3.0})
+        for spec in ("5", "6:1", "x:1", "5:-1", "5:0,4:0"):
+            with self.assertRaises(ValueError):
+                parse_qualities(spec)
+    
+    def test_array_days_capped(self):
+        """Test the CLI caps the horizon without NumPy and says so, as its help does."""
+        self.assertIsNone(max_days("numpy"))
+        self.assertEqual(max_days("array"), ARRAY_MAX_DAYS)
+        self.assertIn(f"at most {ARRAY_MAX_DAYS} days without NumPy",
+                      " ".join(cli.build_parser().format_help().split()))
+        
+        vocabulary = mock.Mock(forecast=lambda days, qualities: [1] * days)
+        output = io.StringIO()
+        with mock.patch("core.forecast._numpy", return_value=None), \
+                contextlib.redirect_stdout(output):
+            self.assertEqual(cli.show_forecast(vocabulary, 365, None, Formatter(no_color=True)), 0)
+        self.assertIn(f"first {ARRAY_MAX_DAYS} days only", output.getvalue())
+        self.assertIn(f"Total reviews:  {ARRAY_MAX_DAYS} ", output.getvalue())
+    
+    def test_vocabulary_forecast(self):
+        """Test saved words are due today, and always-perfect recall spaces them out."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            vocabulary = Vocabulary(vocab_file=Path(temp_dir) / "vocabulary.json")
+            for word in ("a", "b", "c"):
+                vocabulary.save({"word": word})
+            tomorrow = (date.today() + timedelta(days=1)).isoformat()
+            vocabulary.store.modify("c", None, lambda e: e.update(nextReview=tomorrow))
+            
+            counts = vocabulary.forecast(10, {5: 1})
+            self.assertEqual(counts, [2, 3, 1, 0, 0, 0, 0, 2, 1, 0])
+            vocabulary.store.close()
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
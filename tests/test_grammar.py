@@ -5,8 +5,10 @@ Tests verb conjugation (all tenses, imperative, participles)
 and noun declension (singular and plural cases).
 """
 
+import gc
 import unittest
 import json
+import weakref
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -17,6 +19,9 @@ from core.grammar import (
     StressMarker, VerbConjugator, NounDecliner, GrammarEngine
 )
 from languages.russian import Russian
+from tests.helpers import temp_cache_home
+
+setUpModule, tearDownModule = temp_cache_home()
 
 
 class TestStressMarker(unittest.TestCase):
@@ -56,6 +61,26 @@ class TestStressMarker(unittest.TestCase):
     def test_get_stress_position_none(self):
         """No stress mark returns None."""
         self.assertIsNone(StressMarker.get_stress_position("дома"))
+    
+    def test_mark_stress_out_of_range(self):
+        """Positions past the last vowel leave the word unchanged."""
+        self.assertEqual(StressMarker.mark_stress("дом", 2), "дом")
+        self.assertEqual(StressMarker.mark_stress("дом", 0), "дом")
+        self.assertEqual(StressMarker.mark_stress("ёлка", 1), "ёлка")
+    
+    def test_get_stress_position_later_vowel(self):
+        """Stress counts the vowels before it, across words."""
+        self.assertEqual(StressMarker.get_stress_position("бу́ду"), 1)
+        self.assertEqual(StressMarker.get_stress_position("бу́ду чита́ть"), 1)
+        self.assertEqual(StressMarker.get_stress_position("преподава́тель"), 4)
+    
+    def test_remove_stress_many(self):
+        """Batch removal matches removing stress word by word."""
+        words = ["до́ма", "дома", "", "пи́шешь", "бу́ду\nчита́ть"]
+        self.assertEqual(StressMarker.remove_stress_many(words),
+                         [StressMarker.remove_stress(w) for w in words])
+        self.assertEqual(StressMarker.remove_stress_many(iter(["кни́га"])), ["книга"])
+        self.assertEqual(StressMarker.remove_stress_many([]), [])
 
 
 class TestVerbConjugator(unittest.TestCase):
@@ -326,6 +351,56 @@ class TestGrammarEngine(unittest.TestCase):
         result = self.engine.get_full_noun_declension(noun_data)
         self.assertIn("singular", result)
         self.assertIn("plural", result)
+    
+    def test_memoized(self):
+        """Repeated paradigms come from the memo, keyed on the grammar fields only."""
+        verb_data = {"word": "читать", "aspect": "imperfective",
+                     "conjugation": {"ты": "читаешь", "они": "читают"}}
+        first = self.engine.get_full_verb_conjugation(verb_data)
+        second = self.engine.get_full_verb_conjugation(dict(verb_data, definition="to read"))
+        self.assertEqual(first, second)
+        info = self.engine.cache_info()["verbs"]
+        self.assertEqual((info.hits, info.misses), (1, 1))
+    
+    def test_memo_returns_copies(self):
+        """Modifying a returned paradigm does not change the memoized one."""
+        noun_data = {"gender": "masculine", "cases": {"nominative": "стол"}}
+        self.engine.get_full_noun_declension(noun_data)["plural"]["nominative"] = "x"
+        self.assertEqual(self.engine.get_full_noun_declension(noun_data)["plural"]["nominative"],
+                         "столы")
+    
+    def test_memo_bounded(self):
+        """The memo keeps at most cache_size paradigms per part of speech."""
+        engine = GrammarEngine(cache_size=2)
+        for word in ("читать", "делать", "знать"):
+            engine.get_full_verb_conjugation({"word": word})
+        self.assertEqual(engine.cache_info()["verbs"].currsize, 2)
+        engine.cache_clear()
+        self.assertEqual(engine.cache_info()["verbs"].currsize, 0)
+    
+    def test_memo_not_a_cycle(self):
+        """A used engine is freed by reference counting alone."""
+        engine = GrammarEngine()
+        engine.get_full_verb_conjugation({"word": "читать"})
+        ref = weakref.ref(engine)
+        gc.disable()
+        try:
+            del engine
+            self.assertIsNone(ref())
+        finally:
+            gc.enable()
+    
+    def test_precompute_all(self):
+        """Every shipped verb and noun gets a paradigm in one pass."""
+        grammar = Russian().grammar_data
+        result = self.engine.precompute_all(grammar)
+        self.assertEqual(set(result["verbs"]), set(grammar["verbs"]))
+        self.assertEqual(set(result["nouns"]), set(grammar["nouns"]))
+        self.assertEqual(result["verbs"]["сделать"]["future"]["я"], "сде́лаю")
+        self.assertIn("plural", result["nouns"]["книга"])
+        self.assertEqual(self.engine.cache_info()["verbs"].hits, 0)
+        self.engine.precompute_all(grammar)
+        self.assertEqual(self.engine.cache_info()["verbs"].hits, len(grammar["verbs"]))
 
 
 if __name__ == "__main__":
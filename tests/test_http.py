@@ -0,0 +1,192 @@
+"""
+Tests for the pooled HTTP client.
+"""
+
+import gzip
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.http import HTTPClient, HTTPError, NetworkError, RateLimiter
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Test server: the path selects the behaviour."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.client_address, dict(self.headers)))
+        
+        if self.path == "/json":
+            self._reply(200, json.dumps({"word": "привет"}).encode("utf-8"))
+        elif self.path == "/gzip":
+            body = gzip.compress(b'{"compressed": true}')
+            self._reply(200, body, {"Content-Encoding": "gzip"})
+        elif self.path == "/missing":
+            self._reply(404, b"not found")
+        elif self.path == "/flaky":
+            server.flaky_calls += 1
+            if server.flaky_calls < 3:
+                self._reply(503, b"busy")
+            else:
+                self._reply(200, b'{"ok": true}')
+        else:
+            self._reply(500, b"error")
+
+
+class TestHTTPClient(unittest.TestCase):
+    """Test the client against a local keep-alive server."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.server.requests = []
+        self.server.flaky_calls = 0
+        self.client = HTTPClient(timeout=5, retries=2, backoff=0.01)
+    
+    def tearDown(self):
+        self.client.close()
+    
+    def test_get_json(self):
+        """Test JSON bodies are parsed and headers are sent."""
+        self.assertEqual(self.client.get_json(f"{self.base}/json"), {"word": "привет"})
+        
+        headers = self.server.requests[0][2]
+        self.assertEqual(headers["User-Agent"], "define/2.0")
+        self.assertIn("gzip", headers["Accept-Encoding"])
+    
+    def test_gzip_body_decoded(self):
+        """Test gzip-encoded responses are decompressed."""
+        self.assertEqual(self.client.get_json(f"{self.base}/gzip"), {"compressed": True})
+    
+    def test_connection_reused(self):
+        """Test sequential requests share one keep-alive connection."""
+        for _ in range(5):
+            self.client.get_json(f"{self.base}/json")
+        
+        client_ports = {address for _, address, _ in self.server.requests}
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(client_ports), 1)
+    
+    def test_404_not_retried(self):
+        """Test a 404 raises HTTPError on the first attempt."""
+        with self.assertRaises(HTTPError) as ctx:
+            self.client.get(f"{self.base}/missing")
+        
+        self.assertEqual(ctx.exception.status, 404)
+        self.assertEqual(len(self.server.requests), 1)
+    
+    def test_retry_on_server_error(self):
+        """Test 5xx responses are retried with backoff."""
+        self.assertEqual(self.client.get_json(f"{self.base}/flaky"), {"ok": True})
+        self.assertEqual(self.server.flaky_calls, 3)
+    
+    def test_retries_exhausted(self):
+        """Test the final error status is raised after the last retry."""
+        with self.assertRaises(HTTPError) as ctx:
+            self.client.get(f"{self.base}/broken")
+        
+        self.assertEqual(ctx.exception.status, 500)
+        self.assertEqual(len(self.server.requests), 3)
+    
+    def test_network_error(self):
+        """Test connection failures raise NetworkError."""
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()  # Nothing listens on this port now
+        
+        with self.assertRaises(NetworkError):
+            self.client.get(f"http://127.0.0.1:{port}/json")
+    
+    def test_deadline_caps_timeouts(self):
+        """Test timed-out attempts are retried only within the request deadline."""
+        silent = socket.socket()
+        silent.bind(("127.0.0.1", 0))
+        silent.listen(8)  # Accepts connections, never answers
+        client = HTTPClient(timeout=0.3, retries=5, backoff=0.01, deadline=0.5)
+        start = time.monotonic()
+        try:
+            with self.assertRaises(NetworkError):
+                client.get(f"http://127.0.0.1:{silent.getsockname()[1]}/json")
+        finally:
+            client.close()
+            silent.close()
+        
+        self.assertLess(time.monotonic() - start, 0.9)
+    
+    def test_threaded_requests(self):
+        """Test the pool is safe to share between threads."""
+        results = []
+        
+        def fetch():
+            results.append(self.client.get_json(f"{self.base}/json"))
+        
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        self.assertEqual(results, [{"word": "привет"}] * 8)
+    
+    def test_rate_limit_per_host(self):
+        """Test requests to a limited host are spaced out past the burst."""
+        client = HTTPClient(rate_limits={"127.0.0.1": 4})
+        start = time.monotonic()
+        for _ in range(6):
+            client.get(f"{self.base}/json")
+        client.close()
+        
+        # Burst of 4, then two more at 250 ms intervals
+        self.assertGreaterEqual(time.monotonic() - start, 0.45)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the per-host request spacing."""
+    
+    def test_spacing(self):
+        """Test calls beyond the burst wait for their slot."""
+        limiter = RateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        
+        # Two free slots, then four more at 20 ms intervals
+        self.assertGreaterEqual(time.monotonic() - start, 0.07)
+
+
+if __name__ == "__main__":
+    unittest.main()
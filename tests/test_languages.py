@@ -9,7 +9,12 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from languages.english import English
-from languages.russian import Russian
+from languages.forms import FormIndex
+from languages.idioms import IdiomIndex
+from languages.russian import Russian, Transliterator
+from tests.helpers import temp_cache_home
+
+setUpModule, tearDownModule = temp_cache_home()
 
 
 class TestEnglishDetection(unittest.TestCase):
@@ -104,6 +109,34 @@ class TestRussianTransliteration(unittest.TestCase):
         normalized = self.russian.normalize("PRIVET")
         # May or may not transliterate uppercase - depends on implementation
         self.assertIn(normalized.lower(), ["привет", "privet"])
+    
+    def test_rules_longest_first(self):
+        """Test multi-letter rules win over the letters they contain."""
+        self.assertEqual(self.russian._transliterate_word("shchuka"), "щука")
+        self.assertEqual(self.russian._transliterate_word("krasnaya"), "красная")
+        self.assertEqual(self.russian._transliterate_word("tsh"), "тш")
+    
+    def test_compiled_rules_match_sequential_replace(self):
+        """Test the compiled transliterator against plain ordered replaces."""
+        rules = self.russian.translit_rules["rules"]
+        ordered = sorted(rules.items(), key=lambda x: -len(x[0]))
+        transliterate = Transliterator(rules)
+        
+        words = list(self.russian.word_lookup) + ["ayya", "iyyu", "tsch", "vyshchiy"]
+        for word in words:
+            expected = word
+            for latin, cyrillic in ordered:
+                expected = expected.replace(latin, cyrillic)
+            self.assertEqual(transliterate(word), expected, word)
+    
+    def test_transliterate_many(self):
+        """Test batch normalization matches normalize() item by item."""
+        texts = ["privet", "krasnaya", "Moskva", "любовь", "kak dela", "", "zdravstvuyte"]
+        
+        self.assertEqual(
+            self.russian.transliterate_many(texts),
+            [self.russian.normalize(text) for text in texts]
+        )
 
 
 class TestEnglishPhrases(unittest.TestCase):
@@ -202,6 +235,124 @@ class TestIdioms(unittest.TestCase):
         """Test that Russian idioms database is loaded."""
         self.assertIsNotNone(self.russian.idioms)
         self.assertGreater(len(self.russian.idioms), 0)
+    
+    def test_english_get_idioms(self):
+        """Test idioms listed under a word come first, capped at 10."""
+        idioms = self.english._get_idioms("break")
+        
+        self.assertEqual(idioms[0]["phrase"], "break a leg")
+        self.assertLessEqual(len(idioms), 10)
+    
+    def test_russian_get_idioms(self):
+        """Test Russian idioms are found by whole word in other entries."""
+        phrases = [i["phrase"] for i in self.russian._get_idioms("душу")]
+        self.assertIn("душа в душу", phrases)
+
+
+class TestIdiomIndex(unittest.TestCase):
+    """Test the token index behind _get_idioms."""
+    
+    def setUp(self):
+        self.index = IdiomIndex({
+            "ice": {"idioms": [{"phrase": "break the ice"}]},
+            "break": {"idioms": [{"phrase": "break a leg"}, {"phrase": "break the ice"}]},
+            "nice": {"idioms": [{"phrase": "nice try"}]},
+            "кот": {"idioms": [{"phrase": "кот наплакал"}]},
+            "кошка": {"idioms": [{"phrase": "как кошка с собакой"}, {"phrase": "котёл"}]},
+        })
+    
+    def phrases(self, word, **kwargs):
+        return [i["phrase"] for i in self.index.search(word, **kwargs)]
+    
+    def test_own_entries_first(self):
+        """Test idioms listed under the word come before other matches."""
+        self.assertEqual(self.phrases("ice"), ["break the ice"])
+        self.assertEqual(self.phrases("break"), ["break a leg", "break the ice"])
+    
+    def test_whole_words_only(self):
+        """Test a word does not match inside another word, in either script."""
+        self.assertNotIn("nice try", self.phrases("ice"))
+        self.assertEqual(self.phrases("кот"), ["кот наплакал"])
+    
+    def test_case_insensitive(self):
+        """Test lookups ignore case."""
+        self.assertEqual(self.phrases("Break"), self.phrases("break"))
+    
+    def test_multiword_query(self):
+        """Test a phrase matches only as a contiguous run of words."""
+        self.assertEqual(self.phrases("the ice"), ["break the ice"])
+        self.assertEqual(self.phrases("break ice"), [])
+    
+    def test_short_words_not_searched(self):
+        """Test words under 3 characters only get their own entries."""
+        self.assertEqual(self.phrases("a"), [])
+        self.assertEqual(self.phrases("с"), [])
+    
+    def test_limit(self):
+        """Test results are capped."""
+        index = IdiomIndex({"go": {"idioms": [{"phrase": f"go {i}"} for i in range(15)]},
+                            "x": {"idioms": [{"phrase": "let it go"}]}})
+        self.assertEqual(len(index.search("go")), 10)
+        self.assertEqual(len(index.search("go", limit=3)), 3)
+
+
+
+class TestFormIndex(unittest.TestCase):
+    """Test the inflected form -> lemma index."""
+    
+    def setUp(self):
+        self.index = FormIndex(
+            definitions={
+                "писать": {"pos": "verb", "aspect": "imperfective",
+                           "conjugation": {"я": "пишу́", "ты": "пи́шешь", "они": "пи́шут"}},
+                "стол": {"pos": "noun", "gender": "masculine",
+                         "cases": {"nom": "стол", "gen": "стола́", "dat": "столу́"}},
+                "я": {"pos": "pronoun", "cases": {"gen": "меня́", "ins": "мной/мно́ю"}},
+                "кошка": {"pos": "noun"},
+            },
+            grammar={
+                "nouns": {"книга": {
+                    "singular": {"nominative": "кни́га", "genitive": "кни́ги"},
+                    "plural": {"nominative": "кни́ги", "genitive": "книг"},
+                }},
+                "verbs": {"идти": {"past": {"masc": "шёл", "fem": "шла"},
+                                   "future": {"я": "бу́ду идти́"}}},
+            },
+        )
+    
+    def test_curated_forms(self):
+        """Test forms listed in the data resolve with their tags."""
+        self.assertEqual(self.index.lemmatize("книги"),
+                         {"книга": ["genitive singular", "nominative plural"]})
+        self.assertEqual(self.index.lookup("пишу"), [("писать", "present 1st person singular")])
+        self.assertEqual(self.index.lookup("мною"), [("я", "instrumental")])
+    
+    def test_generated_forms(self):
+        """Test the grammar engine fills in past tense and plurals."""
+        self.assertEqual(self.index.lookup("писал"), [("писать", "past masculine")])
+        self.assertEqual(self.index.lemmatize("столы"),
+                         {"стол": ["nominative plural", "accusative plural"]})
+    
+    def test_normalization(self):
+        """Test stress marks, case and ё do not matter."""
+        self.assertIn("КНИ́ГИ", self.index)
+        self.assertEqual(self.index.lookup("шел"), [("идти", "past masculine")])
+    
+    def test_skipped(self):
+        """Test lemmas, compound forms and words without paradigms are not indexed."""
+        self.assertNotIn("книга", self.index)
+        self.assertNotIn("буду идти", self.index)
+        self.assertEqual(self.index.lookup("кошки"), [])
+    
+    def test_russian_lookup(self):
+        """Test Russian.lookup resolves an inflected form locally."""
+        russian = Russian()
+        result = russian.lookup("книгами")
+        self.assertEqual(result["word"], "книга")
+        self.assertEqual(result["source"], "local dictionary")
+        self.assertEqual(result["form_of"]["lemma"], "книга")
+        self.assertEqual(result["form_of"]["tags"], ["instrumental plural"])
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+Tests for the precompiled language data snapshots.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from languages import snapshot
+from languages.russian import Russian
+from tests.helpers import temp_cache_home
+
+setUpModule, tearDownModule = temp_cache_home()
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test building, loading and invalidating snapshots."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_dir = Path(self.temp_dir) / "data"
+        self.snap_dir = Path(self.temp_dir) / "snapshots"
+        self.data_dir.mkdir()
+        self.write_source("words", {"privet": "привет", "_meta": {}})
+        self.derive_calls = 0
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def write_source(self, name, data):
+        path = self.data_dir / f"{name}.json"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        return path
+    
+    def derive(self, data):
+        self.derive_calls += 1
+        data["words"].pop("_meta", None)
+        return {"reverse": {v: k for k, v in data["words"].items()}}
+    
+    def load(self):
+        return snapshot.load("test", ["words"], self.derive,
+                             data_dir=self.data_dir, directory=self.snap_dir)
+    
+    def test_built_then_reused(self):
+        """Test the first load builds the snapshot and later loads reuse it."""
+        first = self.load()
+        second = self.load()
+        
+        self.assertEqual(first, second)
+        self.assertEqual(second["reverse"], {"привет": "privet"})
+        self.assertNotIn("_meta", second["words"])
+        self.assertEqual(self.derive_calls, 1)
+        self.assertTrue((self.snap_dir / "test.pickle").exists())
+    
+    def test_source_change_invalidates(self):
+        """Test a modified source file triggers a rebuild."""
+        self.load()
+        path = self.write_source("words", {"poka": "пока"})
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        
+        data = self.load()
+        
+        self.assertEqual(data["words"], {"poka": "пока"})
+        self.assertEqual(self.derive_calls, 2)
+    
+    def test_corrupt_snapshot_rebuilt(self):
+        """Test an unreadable snapshot is replaced instead of failing."""
+        self.load()
+        path = self.snap_dir / "test.pickle"
+        blob = path.read_bytes()
+        path.write_bytes(blob[:len(blob) // 2])
+        
+        self.assertEqual(self.load()["reverse"], {"привет": "privet"})
+        self.assertEqual(self.derive_calls, 2)
+    
+    def test_missing_source_is_empty(self):
+        """Test a missing data file loads as an empty dict."""
+        data = snapshot.load("test", ["absent"], data_dir=self.data_dir,
+                             directory=self.snap_dir)
+        self.assertEqual(data, {"absent": {}})
+    
+    def test_disabled(self):
+        """Test that disabling snapshots parses the sources directly."""
+        snapshot.ENABLED = False
+        try:
+            data = self.load()
+        finally:
+            snapshot.ENABLED = True
+        
+        self.assertEqual(data["reverse"], {"привет": "privet"})
+        self.assertFalse((self.snap_dir / "test.pickle").exists())
+
+
+class TestLanguageSnapshot(unittest.TestCase):
+    """Test that languages get the same data from the snapshot as from JSON."""
+    
+    def test_russian_matches_sources(self):
+        """Test Russian data loaded via snapshot equals freshly parsed data."""
+        russian = Russian()
+        fresh = snapshot.read_sources(Russian.DATA_SOURCES)
+        derived = Russian.derive_data(fresh)
+        
+        self.assertEqual(russian.phrases, fresh["ru_phrases"])
+        self.assertEqual(russian.grammar_data, fresh["ru_grammar"])
+        self.assertEqual(russian._phrase_translit_map, derived["phrase_translit_map"])
+        self.assertEqual(russian.normalize("krasnaya"), derived["transliterator"]("krasnaya"))
+
+
+if __name__ == "__main__":
+    unittest.main()
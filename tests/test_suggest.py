@@ -0,0 +1,89 @@
+"""
+Tests for the "did you mean" suggestion index.
+"""
+
+import pickle
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from languages.suggest import SuggestionIndex, edit_distance
+
+
+class TestEditDistance(unittest.TestCase):
+    """Test the bounded edit distance."""
+    
+    def test_edits(self):
+        """Test insertions, deletions, substitutions and transpositions."""
+        self.assertEqual(edit_distance("color", "color", 2), 0)
+        self.assertEqual(edit_distance("colr", "color", 2), 1)
+        self.assertEqual(edit_distance("colour", "color", 2), 1)
+        self.assertEqual(edit_distance("cilor", "color", 2), 1)
+        self.assertEqual(edit_distance("clolr", "color", 2), 2)
+        self.assertEqual(edit_distance("teh", "the", 2), 1)
+    
+    def test_cyrillic(self):
+        """Test Cyrillic strings compare by character."""
+        self.assertEqual(edit_distance("спосибо", "спасибо", 2), 1)
+    
+    def test_limit(self):
+        """Test distances past the limit are reported as limit + 1."""
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
+        self.assertEqual(edit_distance("a", "abcdef", 2), 3)
+
+
+class TestSuggestionIndex(unittest.TestCase):
+    """Test symmetric-delete lookups."""
+    
+    def setUp(self):
+        self.index = SuggestionIndex([
+            "definitely", "color", "cold", "four", "how are you",
+            "привет", "спасибо", "как дела",
+        ])
+    
+    def terms(self, word, **kwargs):
+        return [term for term, _ in self.index.lookup(word, **kwargs)]
+    
+    def test_nearest_first(self):
+        """Test results are ranked by distance."""
+        self.assertEqual(self.index.lookup("definately"), [("definitely", 1)])
+        self.assertEqual(self.terms("colr"), ["cold", "color"])
+    
+    def test_short_words_allow_one_edit(self):
+        """Test short words do not match two edits away."""
+        self.assertNotIn("four", self.terms("colr"))
+    
+    def test_cyrillic_and_phrases(self):
+        """Test Cyrillic words and multi-word phrases."""
+        self.assertEqual(self.terms("привте"), ["привет"])
+        self.assertEqual(self.terms("как дила"), ["как дела"])
+        self.assertEqual(self.terms("how ar you"), ["how are you"])
+    
+    def test_errors_past_prefix(self):
+        """Test edits after the indexed prefix are still verified."""
+        self.assertEqual(self.terms("how are yuo"), ["how are you"])
+        self.assertEqual(self.terms("how are they"), [])
+    
+    def test_case_and_duplicates(self):
+        """Test terms are case-insensitive and indexed once."""
+        self.index.add("Color")
+        self.assertEqual(len(self.index), 8)
+        self.assertIn("COLOR", self.index)
+        self.assertEqual(self.terms("COLR"), ["cold", "color"])
+    
+    def test_limit_and_empty(self):
+        """Test the result limit and empty queries."""
+        self.assertEqual(len(self.index.lookup("colr", limit=1)), 1)
+        self.assertEqual(self.index.lookup(""), [])
+        self.assertEqual(self.index.lookup("zzzzzz"), [])
+    
+    def test_picklable(self):
+        """Test the index survives the snapshot round trip."""
+        restored = pickle.loads(pickle.dumps(self.index))
+        self.assertEqual(restored.lookup("colr"), self.index.lookup("colr"))
+
+
+if __name__ == "__main__":
+    unittest.main()
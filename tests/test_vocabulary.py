@@ -3,8 +3,10 @@ Tests for the Vocabulary and SM-2 Spaced Repetition system.
 """
 
 import json
+import os
 import tempfile
 import unittest
+from unittest import mock
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
@@ -216,8 +218,9 @@ class TestVocabulary(unittest.TestCase):
         # Save directly to file (bypassing save method)
         self.vocab_file.write_text(json.dumps([old_entry]), encoding="utf-8")
         
-        # Load and migrate
-        vocab = self.vocabulary._load()
+        # Load and migrate (with the JSON store; the SQLite store imports
+        # the file on first use, see TestSQLiteStore)
+        vocab = Vocabulary(vocab_file=self.vocab_file, backend="json")._load()
         migrated = self.vocabulary._migrate_entry(vocab[0])
         
         # Check SM-2 fields were added
@@ -228,6 +231,383 @@ class TestVocabulary(unittest.TestCase):
         self.assertIn("nextReview", migrated)
 
 
+class TestJSONVocabulary(TestVocabulary):
+    """Run the Vocabulary tests against the legacy JSON store."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.vocab_file = Path(self.temp_dir) / "vocabulary.json"
+        self.vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="json")
+
+
+class TestJournalVocabulary(TestVocabulary):
+    """Run the Vocabulary tests against the journaled JSON store."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.vocab_file = Path(self.temp_dir) / "vocabulary.json"
+        self.vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+
+
+class TestJournalStore(unittest.TestCase):
+    """Test the journal: replay, compaction, crash recovery."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.vocab_file = Path(self.temp_dir) / "vocabulary.json"
+        self.journal_file = Path(self.temp_dir) / "vocabulary.journal"
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_ratings_append_to_journal(self):
+        """Test saves and ratings leave vocabulary.json alone and replay on load."""
+        self.vocab_file.write_text(json.dumps([{"word": "old"}]), encoding="utf-8")
+        base = self.vocab_file.read_text(encoding="utf-8")
+        
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        vocabulary.save({"word": "new"})
+        vocabulary.update_sm2("old", 5)
+        vocabulary.update_sm2("old", 5)
+        
+        self.assertEqual(self.vocab_file.read_text(encoding="utf-8"), base)
+        records = [json.loads(line) for line in self.journal_file.read_text().splitlines()]
+        self.assertEqual([r[0] for r in records], ["add", "review", "review"])
+        
+        reloaded = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        self.assertEqual([e["word"] for e in reloaded._load()], ["old", "new"])
+        self.assertEqual(reloaded.store.get("old")["sm2_interval"], 6)
+        self.assertEqual(reloaded.store.get("old")["timesReviewed"], 2)
+    
+    def test_compaction(self):
+        """Test the journal is folded into vocabulary.json past the threshold."""
+        from core.vocabulary import JournalStore
+        store = JournalStore(self.vocab_file, compact_bytes=1000)
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend=store)
+        for i in range(10):
+            vocabulary.save({"word": f"word{i}"})
+        self.assertLess(store.journal_size(), 1000)
+        
+        saved = json.loads(self.vocab_file.read_text(encoding="utf-8"))
+        journal = [json.loads(line) for line in self.journal_file.read_text().splitlines()]
+        self.assertEqual(len(saved) + len(journal), 10)
+        self.assertGreater(len(saved), 0)
+        
+        store.compact()
+        self.assertEqual(store.journal_size(), 0)
+        self.assertEqual(len(json.loads(self.vocab_file.read_text(encoding="utf-8"))), 10)
+    
+    def test_replay_is_idempotent(self):
+        """Test a journal replayed over an already compacted file changes nothing."""
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        vocabulary.save({"word": "word"})
+        vocabulary.update_sm2("word", 5)
+        vocabulary.update_sm2("word", 5)
+        journal = self.journal_file.read_text(encoding="utf-8")
+        expected = vocabulary._load()
+        
+        # Crash after the rename, before the journal was emptied
+        vocabulary.store.compact()
+        self.journal_file.write_text(journal, encoding="utf-8")
+        self.assertEqual(Vocabulary(vocab_file=self.vocab_file, backend="journal")._load(),
+                         expected)
+    
+    def test_torn_record_is_dropped(self):
+        """Test a half-written last record is ignored, not merged with the next one."""
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        vocabulary.save({"word": "word"})
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write('["review", "word", "en", 1, 1')
+        
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        self.assertEqual(vocabulary.store.get("word")["timesReviewed"], 0)
+        self.assertTrue(self.journal_file.read_text(encoding="utf-8").endswith("1, 1"))
+        vocabulary.update_sm2("word", 5)
+        reloaded = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        self.assertEqual(reloaded.store.get("word")["timesReviewed"], 1)
+    
+    def test_append_in_progress_is_kept(self):
+        """Test opening the journal never cuts off another process's partial append."""
+        first = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        first.save({"word": "word"})
+        record = json.dumps(["add", {**first.store.get("word"), "word": "next"}])
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(record[:10])
+            f.flush()
+            Vocabulary(vocab_file=self.vocab_file, backend="journal")
+            f.write(record[10:] + "\n")
+        
+        self.assertEqual([e["word"] for e in first._load()], ["word", "next"])
+    
+    def test_corrupt_record_is_skipped(self):
+        """Test a bad line in the middle loses only itself."""
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        vocabulary.save({"word": "one"})
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write('["review", "one", \n')
+        vocabulary.save({"word": "two"})
+        vocabulary.update_sm2("one", 5)
+        
+        reloaded = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        self.assertEqual([e["word"] for e in reloaded._load()], ["one", "two"])
+        self.assertEqual(reloaded.store.get("one")["timesReviewed"], 1)
+    
+    def test_backend_from_environment(self):
+        """Test DEFINE_VOCAB_BACKEND selects the store when none is given."""
+        from core.vocabulary import JournalStore, SQLiteStore
+        with mock.patch.dict(os.environ, {Vocabulary.BACKEND_ENV: "journal"}):
+            self.assertIsInstance(Vocabulary(vocab_file=self.vocab_file).store, JournalStore)
+            store = Vocabulary(vocab_file=self.vocab_file, backend="sqlite").store
+            self.assertIsInstance(store, SQLiteStore)
+            store.close()
+        with mock.patch.dict(os.environ, {Vocabulary.BACKEND_ENV: "redis"}):
+            with self.assertRaises(ValueError):
+                Vocabulary(vocab_file=self.vocab_file)
+    
+    def test_sees_other_writers(self):
+        """Test records appended by another instance are picked up."""
+        first = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        second = Vocabulary(vocab_file=self.vocab_file, backend="journal")
+        first.save({"word": "word"})
+        second.update_sm2("word", 5)
+        self.assertEqual(first.store.get("word")["sm2_interval"], 1)
+        
+        second.store.compact()
+        first.update_sm2("word", 5)
+        self.assertEqual(second.store.get("word")["sm2_interval"], 6)
+
+
+class TestSQLiteStore(unittest.TestCase):
+    """Test the SQLite store: JSON import, keys, due order and stats."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.vocab_file = Path(self.temp_dir) / "vocabulary.json"
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_json_migration(self):
+        """Test vocabulary.json is imported, keeping unknown fields."""
+        old = [
+            {"word": "old", "definition": "ancient", "language": "en", "tag": "x"},
+            {"word": "old", "definition": "duplicate", "language": "en"},
+            {"word": "дом", "definition": "house", "language": "ru",
+             "sm2_easiness": 2.1, "sm2_interval": 30, "sm2_repetitions": 4,
+             "nextReview": "2999-01-01T00:00:00"},
+        ]
+        self.vocab_file.write_text(json.dumps(old), encoding="utf-8")
+        
+        vocab = Vocabulary(vocab_file=self.vocab_file)._load()
+        self.assertEqual([e["word"] for e in vocab], ["old", "дом"])
+        self.assertEqual(vocab[0]["definition"], "ancient")
+        self.assertEqual(vocab[0]["tag"], "x")
+        self.assertEqual(vocab[0]["sm2_easiness"], 2.5)
+        self.assertEqual(vocab[1]["sm2_interval"], 30)
+        self.assertTrue(self.vocab_file.exists())
+        
+        # Cards added to the file later (by the Bash version) are imported too
+        self.vocab_file.write_text(json.dumps(old + [{"word": "new"}]), encoding="utf-8")
+        vocab = Vocabulary(vocab_file=self.vocab_file)._load()
+        self.assertEqual([e["word"] for e in vocab], ["old", "дом", "new"])
+        self.assertEqual(vocab[0]["definition"], "ancient")
+    
+    def test_saves_shared_with_json(self):
+        """Test sqlite+json appends new cards to vocabulary.json for the Bash version."""
+        self.vocab_file.write_text(json.dumps([{"word": "old", "tag": "x"}]), encoding="utf-8")
+        vocabulary = Vocabulary(vocab_file=self.vocab_file, backend="sqlite+json")
+        vocabulary.save({"word": "дом", "language": "ru"})
+        vocabulary.save({"word": "old", "language": "en"})
+        vocabulary.update_sm2("дом", 5, "ru")
+        
+        shared = json.loads(self.vocab_file.read_text(encoding="utf-8"))
+        self.assertEqual([e["word"] for e in shared], ["old", "дом"])
+        self.assertEqual(shared[0], {"word": "old", "tag": "x"})
+        self.assertEqual(shared[1]["timesReviewed"], 0)
+        self.assertEqual(len(Vocabulary(vocab_file=self.vocab_file)._load()), 2)
+    
+    def test_save_independent_of_deck_size(self):
+        """Test the default store saves without reading or rewriting vocabulary.json."""
+        deck = [{"word": f"word{i}"} for i in range(5000)]
+        self.vocab_file.write_text(json.dumps(deck), encoding="utf-8")
+        before = self.vocab_file.read_bytes()
+        vocabulary = Vocabulary(vocab_file=self.vocab_file)
+        
+        with mock.patch("core.vocabulary.read_json_vocabulary", side_effect=AssertionError), \
+                mock.patch("core.vocabulary.write_atomic", side_effect=AssertionError):
+            vocabulary.save({"word": "new"})
+            vocabulary.update_sm2("new", 5)
+            vocabulary.refresh()
+        
+        self.assertEqual(self.vocab_file.read_bytes(), before)
+        self.assertEqual(vocabulary.store.count(), 5001)
+        vocabulary.store.close()
+    
+    def test_same_word_in_two_languages(self):
+        """Test entries are unique per (word, language)."""
+        vocabulary = Vocabulary(vocab_file=self.vocab_file)
+        vocabulary.save({"word": "da", "language": "en"})
+        vocabulary.save({"word": "da", "language": "ru"})
+        vocabulary.save({"word": "da", "language": "ru"})
+        self.assertEqual(len(vocabulary._load()), 2)
+        
+        updated = vocabulary.update_sm2("da", 5, language="ru")
+        self.assertEqual(updated["language"], "ru")
+        self.assertEqual(vocabulary.store.get("da", "en")["timesReviewed"], 0)
+        self.assertIsNone(vocabulary.update_sm2("missing", 5))
+    
+    def test_due_order_and_stats(self):
+        """Test due cards come oldest first and stats match the entries."""
+        vocabulary = Vocabulary(vocab_file=self.vocab_file)
+        for word in ("a", "b", "c", "d"):
+            vocabulary.save({"word": word})
+        vocabulary.update_sm2("b", 5)
+        for _ in range(4):
+            vocabulary.update_sm2("c", 5)
+        
+        due = vocabulary.get_due_words()
+        self.assertEqual([e["word"] for e in due], ["a", "d"])
+        self.assertEqual(vocabulary.get_stats(),
+                         {"total": 4, "due": 2, "mastered": 1, "learning": 1, "new": 2})
+    
+    def test_stats_counters_match_a_full_scan(self):
+        """Test the trigger-maintained counters agree with a scan of every card."""
+        from core.vocabulary import VocabularyStore
+        vocabulary = Vocabulary(vocab_file=self.vocab_file)
+        for word in ("a", "b", "c", "d", "e"):
+            vocabulary.save({"word": word})
+        vocabulary.update_sm2("a", 5)
+        for _ in range(4):
+            vocabulary.update_sm2("b", 5)
+        vocabulary.update_sm2("b", 0)
+        for _ in range(5):
+            vocabulary.update_sm2("c", 5)
+        yesterday = (datetime.now() - timedelta(days=1)).isoformat()
+        vocabulary.store.modify("d", None, lambda e: e.update(nextReview=yesterday))
+        
+        now = datetime.now().isoformat()
+        store = vocabulary.store
+        self.assertEqual(store.stats(now), VocabularyStore._tally(store.entries(), now))
+        self.assertTrue(vocabulary.verify_stats())
+    
+    def test_verify_rebuilds_counters(self):
+        """Test recount() repairs counters and version 1 databases get them."""
+        import sqlite3
+        vocabulary = Vocabulary(vocab_file=self.vocab_file)
+        for word in ("a", "b", "c"):
+            vocabulary.save({"word": word})
+        expected = vocabulary.get_stats()
+        
+        vocabulary.store._conn.execute("UPDATE totals SET cards = 99")
+        self.assertFalse(vocabulary.verify_stats())
+        self.assertEqual(vocabulary.get_stats(), expected)
+        vocabulary.store.close()
+        
+        conn = sqlite3.connect(self.vocab_file.with_name("vocabulary.db"))
+        conn.executescript("DROP TABLE totals; DROP TABLE due_days; "
+                           "DROP TRIGGER cards_insert; PRAGMA user_version = 1;")
+        conn.close()
+        self.assertEqual(Vocabulary(vocab_file=self.vocab_file).get_stats(), expected)
+    
+    def test_failed_update_rolls_back(self):
+        """Test an exception inside an update leaves the card unchanged."""
+        vocabulary = Vocabulary(vocab_file=self.vocab_file)
+        vocabulary.save({"word": "word"})
+        
+        def change(entry):
+            entry["sm2_interval"] = 99
+            raise RuntimeError
+        
+        with self.assertRaises(RuntimeError):
+            vocabulary.store.modify("word", None, change)
+        self.assertEqual(vocabulary.store.get("word")["sm2_interval"], 0)
+        vocabulary.update_sm2("word", 5)
+        self.assertEqual(vocabulary.store.get("word")["sm2_interval"], 1)
+
+
+class TestStudyQueue(unittest.TestCase):
+    """Test the study session queue: due order, learning steps, batched writes."""
+    
+    backend = "sqlite"
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.vocabulary = Vocabulary(vocab_file=Path(self.temp_dir) / "vocabulary.json",
+                                     backend=self.backend)
+        self.now = datetime.now().timestamp()
+        for i, word in enumerate(("c", "a", "b")):
+            self.vocabulary.save({"word": word})
+            due = datetime.fromtimestamp(self.now - 3600 * (i + 1)).isoformat()
+            self.vocabulary.store.modify(word, None, lambda e: e.update(nextReview=due))
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def queue(self, **kwargs):
+        from core.vocabulary import StudyQueue
+        return StudyQueue(self.vocabulary.store, clock=lambda: self.now, **kwargs)
+    
+    def test_due_order(self):
+        """Test cards come out oldest due first and the session then ends."""
+        queue = self.queue()
+        self.assertEqual(len(queue), 3)
+        self.assertEqual([queue.pop()["word"] for _ in range(3)], ["b", "a", "c"])
+        self.assertIsNone(queue.pop())
+    
+    def test_failed_cards_return_through_learning_steps(self):
+        """Test a failed card comes back after each step, once SM-2 has run."""
+        queue = self.queue(learning_steps=(60, 600), learn_ahead=0)
+        card = queue.pop()
+        self.assertEqual(queue.rate(card, 1), 60)
+        self.assertEqual(card["sm2_interval"], 1)
+        self.assertEqual([queue.pop()["word"], queue.pop()["word"]], ["a", "c"])
+        self.assertIsNone(queue.pop())
+        
+        self.now += 60
+        self.assertIs(queue.pop(), card)
+        self.assertEqual(queue.rate(card, 4), 600)
+        self.now += 600
+        self.assertEqual(queue.rate(queue.pop(), 0), 60)
+        self.now += 60
+        self.assertEqual(queue.rate(queue.pop(), 5), 600)
+        self.now += 600
+        self.assertIsNone(queue.rate(queue.pop(), 5))
+        self.assertIsNone(queue.pop())
+        
+        # Re-reviews do not count as SM-2 reviews
+        self.assertEqual(card["timesReviewed"], 1)
+        self.assertEqual(card["sm2_repetitions"], 0)
+    
+    def test_batched_flush(self):
+        """Test ratings are written back every flush_every cards and on flush()."""
+        queue = self.queue(flush_every=2)
+        queue.rate(queue.pop(), 5)
+        self.assertEqual(self.vocabulary.store.get("b")["timesReviewed"], 0)
+        queue.rate(queue.pop(), 5)
+        self.assertEqual(self.vocabulary.store.get("b")["timesReviewed"], 1)
+        self.assertEqual(self.vocabulary.store.get("a")["sm2_interval"], 1)
+        
+        queue.rate(queue.pop(), 4)
+        self.assertEqual(queue.flush(), 1)
+        self.assertEqual(queue.flush(), 0)
+        self.assertEqual(self.vocabulary.get_due_words(), [])
+
+
+class TestJSONStudyQueue(TestStudyQueue):
+    """Run the study queue tests against the JSON store."""
+    
+    backend = "json"
+
+
+class TestJournalStudyQueue(TestStudyQueue):
+    """Run the study queue tests against the journaled JSON store."""
+    
+    backend = "journal"
+
+
 class TestVocabularyExport(unittest.TestCase):
     """Test vocabulary export functionality."""
     
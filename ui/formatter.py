@@ -66,9 +66,12 @@ class Formatter:
         """Print saved confirmation."""
         print(f"\n{self.c.GREEN}Saved '{word}' to vocabulary{self.c.NC}")
     
-    def not_found(self, word: str) -> None:
-        """Print not found message."""
+    def not_found(self, word: str, suggestions: Optional[list] = None) -> None:
+        """Print not found message, with spelling suggestions if any."""
         print(f"{self.c.YELLOW}No definition found for '{word}'{self.c.NC}")
+        if suggestions:
+            print(f"Did you mean / Возможно, вы имели в виду: "
+                  f"{self.c.BOLD}{', '.join(suggestions)}{self.c.NC}?")
         print(f"{self.c.DIM}Hint: Check your internet connection, or use --offline for cached words{self.c.NC}")
     
     def display_result(
@@ -104,6 +107,12 @@ class Formatter:
         
         print()
         
+        # Inflected input resolved to its lemma (Russian)
+        form_of = result.get("form_of")
+        if form_of:
+            tags = ", ".join(form_of.get("tags", []))
+            print(f"{self.c.DIM}{form_of['form']}: form of {form_of['lemma']} ({tags}){self.c.NC}")
+        
         # Phonetic
         if phonetic and not short_mode:
             print(f"{self.c.DIM}{phonetic}{self.c.NC}")